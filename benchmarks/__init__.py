@@ -0,0 +1 @@
+"""Micro-benchmarks. Run one with ``python -m benchmarks.<name>``."""
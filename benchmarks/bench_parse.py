@@ -0,0 +1,37 @@
+"""Character-level ``parse`` vs the old regex-based parser.
+
+python -m benchmarks.bench_parse
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from sirrmizan.dice_parser import parse
+
+from .reference import regex_parse
+
+CASES = ("1d20", "1d20+5", "2d6+3", "1d20+2d6+4-1d4+3", "+".join(["1d6"] * 20))
+
+
+def main() -> None:
+    print(f"{'expression':<24}{'regex µs':>10}{'scan µs':>10}{'speedup':>9}")
+    for expression in CASES:
+        assert parse(expression) == regex_parse(expression)
+        number = 20000
+        old = min(
+            timeit.repeat(
+                lambda expression=expression: regex_parse(expression), number=number, repeat=5
+            )
+        )
+        new = min(
+            timeit.repeat(lambda expression=expression: parse(expression), number=number, repeat=5)
+        )
+        old_us = old / number * 1e6
+        new_us = new / number * 1e6
+        label = expression if len(expression) <= 22 else expression[:19] + "..."
+        print(f"{label:<24}{old_us:>10.2f}{new_us:>10.2f}{old_us / new_us:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
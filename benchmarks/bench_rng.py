@@ -0,0 +1,31 @@
+"""Dice per second for each RNG backend.
+
+python -m benchmarks.bench_rng
+"""
+
+from __future__ import annotations
+
+import time
+
+from sirrmizan.rng import RNG_BACKENDS, make_rng
+
+TERMS = ((1, 20), (4, 6), (50, 6), (50, 99999))
+ROLLS = 20000
+
+
+def main() -> None:
+    print(f"{'term':<10}" + "".join(f"{name + ' dice/s':>18}" for name in RNG_BACKENDS))
+    for count, faces in TERMS:
+        row = f"{count}d{faces:<7}"
+        for name in RNG_BACKENDS:
+            rng = make_rng(name)
+            start = time.perf_counter()
+            for _ in range(ROLLS):
+                rng.roll(count, faces)
+            elapsed = time.perf_counter() - start
+            row += f"{count * ROLLS / elapsed:>18,.0f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Single-pass ``parse_roll_input`` vs the old quadratic prefix loop.
+
+python -m benchmarks.bench_roll_input
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from sirrmizan.dice_parser import parse_roll_input
+
+from .reference import quadratic_parse_roll_input
+
+CASES = {
+    "short": "1d20+5 Goblin",
+    "spaced": "1d20 + 2d6 + 4 + 1d4 + 3 Goblin",
+    "many tokens": " ".join(["1"] * 50),
+    "long target": "1d20 " + " ".join(f"word{i}" for i in range(40)),
+}
+
+
+def main() -> None:
+    print(f"{'case':<14}{'chars':>6}{'old µs':>10}{'new µs':>10}{'speedup':>9}")
+    for name, raw in CASES.items():
+        assert parse_roll_input(raw) == quadratic_parse_roll_input(raw)
+        number = 2000
+        old = min(
+            timeit.repeat(lambda raw=raw: quadratic_parse_roll_input(raw), number=number, repeat=5)
+        )
+        new = min(timeit.repeat(lambda raw=raw: parse_roll_input(raw), number=number, repeat=5))
+        old_us = old / number * 1e6
+        new_us = new / number * 1e6
+        print(f"{name:<14}{len(raw):>6}{old_us:>10.1f}{new_us:>10.1f}{old_us / new_us:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
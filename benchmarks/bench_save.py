@@ -0,0 +1,85 @@
+"""Command latency while saves run back to back: lock held vs snapshot saves.
+
+    python -m benchmarks.bench_save
+
+A save's disk time is simulated with a sleep in the worker thread, as on
+a slow or busy disk; each command is a ``set_user_color`` issued every
+millisecond while the saver loops.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from pathlib import Path
+from typing import Any
+
+from sirrmizan.decks import Deck
+from sirrmizan.state import State
+from sirrmizan.storage import ChangeSet, JsonStorage, SaveMetrics
+
+from .reference import locked_save
+
+USERS = 5000
+COMMANDS = 500
+DISK_SECONDS = 0.02
+
+
+class SlowDiskStorage(JsonStorage):
+    def save(
+        self,
+        users: Mapping[str, Any],
+        stats: Mapping[str, Any],
+        servers: Mapping[str, Any],
+        decks: Mapping[str, Deck],
+        changes: ChangeSet,
+    ) -> SaveMetrics:
+        time.sleep(DISK_SECONDS)
+        return super().save(users, stats, servers, decks, changes)
+
+
+async def _latencies(
+    data_dir: Path, save: Callable[[State], Awaitable[SaveMetrics]]
+) -> list[float]:
+    state = State(data_dir, SlowDiskStorage(data_dir))
+    state.load()
+    for user_id in range(USERS):
+        await state.set_user_color(user_id, "red")
+    await state.save()
+
+    done = False
+
+    async def saver() -> None:
+        while not done:
+            await save(state)
+            await asyncio.sleep(0)
+
+    task = asyncio.create_task(saver())
+    latencies = []
+    for i in range(COMMANDS):
+        start = time.perf_counter()
+        await state.set_user_color(i % USERS, "blue" if i % 2 else "green")
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.001)
+    done = True
+    await task
+    return latencies
+
+
+def main() -> None:
+    print(f"{USERS} users, {DISK_SECONDS * 1000:.0f} ms per save, {COMMANDS} commands")
+    print(f"{'save':<10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, save in (("locked", locked_save), ("snapshot", State.save)):
+        with tempfile.TemporaryDirectory() as tmp:
+            latencies = asyncio.run(_latencies(Path(tmp), save))
+        ms = sorted(value * 1000 for value in latencies)
+        p50 = statistics.median(ms)
+        p99 = ms[int(len(ms) * 0.99) - 1]
+        print(f"{name:<10}{p50:>10.3f}{p99:>10.3f}{ms[-1]:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Frozen copies of superseded implementations.
+
+Benchmarks time the current code against these, and the test suite uses
+them as an oracle: the optimized versions must return identical results.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+
+from sirrmizan.dice_parser import (
+    MAX_EXPRESSION_LENGTH,
+    MAX_FACES,
+    MAX_ROLLS_PER_TERM,
+    DiceParseError,
+    DicePart,
+    ParsedExpression,
+    _normalize_tokens,
+    parse,
+)
+from sirrmizan.state import State
+from sirrmizan.storage import ChangeSet, SaveMetrics
+
+_PIECE_RE = re.compile(r"(?P<dice>[+-]?\d+[dD]\d+)|(?P<mod>[+-]?\d+)")
+
+
+def regex_parse(expression: str) -> ParsedExpression:
+    """``parse`` as of 1.1.1: one ``_PIECE_RE`` match plus string splits per token."""
+    if expression is None:
+        raise DiceParseError("expression is empty")
+    if not isinstance(expression, str):
+        raise DiceParseError("expression must be a string")
+
+    expression = expression.strip()
+    if not expression:
+        raise DiceParseError("expression is empty")
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise DiceParseError(f"expression too long (limit: {MAX_EXPRESSION_LENGTH} characters)")
+
+    dice: list[DicePart] = []
+    modifiers: list[int] = []
+    pos = 0
+    first_token = True
+
+    while pos < len(expression):
+        match = _PIECE_RE.match(expression, pos)
+        if match is None or match.start() != pos:
+            raise DiceParseError(f"unexpected character {expression[pos]!r} at position {pos}")
+
+        token_text = match.group(0)
+        if not first_token and token_text[0] not in "+-":
+            raise DiceParseError(f"missing sign before token {token_text!r} at position {pos}")
+        first_token = False
+
+        dice_token = match.group("dice")
+        mod_token = match.group("mod")
+
+        if dice_token is not None:
+            sign = -1 if dice_token.startswith("-") else 1
+            unsigned = dice_token.lstrip("+-").lower()
+            rolls_str, faces_str = unsigned.split("d")
+            rolls = int(rolls_str)
+            faces = int(faces_str)
+            if not 1 <= rolls <= MAX_ROLLS_PER_TERM:
+                raise DiceParseError(
+                    f"invalid number of rolls in {dice_token!r} (must be 1-{MAX_ROLLS_PER_TERM})"
+                )
+            if not 1 <= faces <= MAX_FACES:
+                raise DiceParseError(
+                    f"invalid number of faces in {dice_token!r} (must be 1-{MAX_FACES})"
+                )
+            dice.append(DicePart(rolls=rolls, faces=faces, sign=sign))
+        else:
+            assert mod_token is not None
+            modifiers.append(int(mod_token))
+
+        pos = match.end()
+
+    if pos != len(expression):
+        raise DiceParseError(f"trailing characters: {expression[pos:]!r}")
+
+    return ParsedExpression(dice=tuple(dice), modifiers=tuple(modifiers))
+
+
+def _join_expression_tokens(tokens: list[str]) -> str:
+    if not tokens:
+        return ""
+    out = tokens[0]
+    for tok in tokens[1:]:
+        if tok and tok[0] not in "+-":
+            out += "+"
+        out += tok
+    return out
+
+
+def quadratic_parse_roll_input(
+    raw: str,
+) -> tuple[ParsedExpression | None, str, str | None]:
+    """``parse_roll_input`` as of 1.1.1: re-joins and re-parses every prefix."""
+    raw = (raw or "").strip()
+    if not raw:
+        return None, "", None
+
+    tokens = _normalize_tokens(raw.split())
+    if not tokens:
+        return None, "", None
+
+    longest_k = 0
+    longest_expr: ParsedExpression | None = None
+    longest_str = ""
+
+    for k in range(1, len(tokens) + 1):
+        candidate = _join_expression_tokens(tokens[:k])
+        try:
+            parsed = parse(candidate)
+        except DiceParseError:
+            continue
+        longest_k = k
+        longest_expr = parsed
+        longest_str = candidate
+
+    target_words = list(tokens[longest_k:])
+    while target_words and target_words[0] in ("+", "-"):
+        target_words.pop(0)
+    while target_words and target_words[-1] in ("+", "-"):
+        target_words.pop()
+
+    target = " ".join(target_words) if target_words else None
+    return longest_expr, longest_str, target
+
+
+async def locked_save(state: State) -> SaveMetrics:
+    """``State.save`` before snapshot saves: the lock is held for the whole write."""
+    async with state.lock:
+        state._drain_rolls()
+        if not state._changes:
+            return SaveMetrics()
+        changes, state._changes = state._changes, ChangeSet()
+        return await asyncio.get_running_loop().run_in_executor(
+            None, state._write, state._snapshot(), changes
+        )
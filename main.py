@@ -3,6 +3,7 @@
 Prefer ``python -m sirrmizan``. This wrapper exists so existing deployment
 scripts that invoke ``python main.py`` keep working.
 """
+
 from __future__ import annotations
 
 import sys
@@ -13,6 +13,7 @@ from .bot import SirrMizan
 from .config import ConfigError, load_config
 from .logging_setup import configure_logging
 from .state import State
+from .storage import make_storage
 
 logger = logging.getLogger(__name__)
 
@@ -67,7 +68,7 @@ def main() -> int:
     configure_logging(config.log_dir, config.log_level)
     logger.info("Starting SirrMizan")
 
-    state = State(config.data_dir)
+    state = State(config.data_dir, make_storage(config.storage_backend, config.data_dir))
     state.load()
 
     bot = SirrMizan(config=config, state=state)
@@ -0,0 +1,118 @@
+"""Cost-based admission control for rolls.
+
+Every compiled plan carries an estimated cost (``dice_parser.RollCost``).
+``Admission`` keeps one token bucket per user and one per guild, each
+holding up to ``budget`` cost units and refilling at ``budget`` units per
+``window`` seconds. A roll is admitted only if both buckets can pay for it,
+so a user can't monopolize the bot and a busy server can't starve others,
+while ordinary rolls never come near either limit.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+DEFAULT_WINDOW = 60.0
+# Idle buckets (back at full capacity) are dropped once this many are held.
+_PRUNE_THRESHOLD = 4096
+
+
+@dataclass(slots=True)
+class _Bucket:
+    tokens: float
+    updated: float
+
+
+class TokenBuckets:
+    """Token buckets keyed by id, created full on first use.
+
+    ``budget=0`` disables the limit: every charge succeeds.
+    """
+
+    def __init__(
+        self,
+        budget: int,
+        window: float = DEFAULT_WINDOW,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if budget < 0:
+            raise ValueError(f"budget must be >= 0, got {budget}")
+        if window <= 0:
+            raise ValueError(f"window must be positive, got {window}")
+        self._capacity = float(budget)
+        self._rate = budget / window
+        self._clock = clock
+        self._buckets: dict[int, _Bucket] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._capacity > 0
+
+    def _refill(self, key: int, now: float) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= _PRUNE_THRESHOLD:
+                self._prune(now)
+            bucket = self._buckets[key] = _Bucket(self._capacity, now)
+        else:
+            bucket.tokens = min(self._capacity, bucket.tokens + (now - bucket.updated) * self._rate)
+            bucket.updated = now
+        return bucket
+
+    def _prune(self, now: float) -> None:
+        idle = [
+            key
+            for key, bucket in self._buckets.items()
+            if bucket.tokens + (now - bucket.updated) * self._rate >= self._capacity
+        ]
+        for key in idle:
+            del self._buckets[key]
+
+    def wait_time(self, key: int, cost: int) -> float:
+        """Seconds until ``key`` can pay ``cost``: 0 if now, inf if never."""
+        if not self.enabled:
+            return 0.0
+        if cost > self._capacity:
+            return math.inf
+        bucket = self._refill(key, self._clock())
+        missing = cost - bucket.tokens
+        return missing / self._rate if missing > 0 else 0.0
+
+    def charge(self, key: int, cost: int) -> None:
+        """Take ``cost`` tokens from ``key``'s bucket (call after ``wait_time``)."""
+        if self.enabled:
+            self._refill(key, self._clock()).tokens -= cost
+
+
+class Admission:
+    """Per-user and per-guild cost budgets for rolls."""
+
+    def __init__(
+        self,
+        user_budget: int,
+        guild_budget: int,
+        window: float = DEFAULT_WINDOW,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._users = TokenBuckets(user_budget, window, clock)
+        self._guilds = TokenBuckets(guild_budget, window, clock)
+
+    def admit(self, user_id: int, guild_id: int | None, cost: int) -> float:
+        """Charge ``cost`` if both budgets allow it.
+
+        Returns 0.0 when admitted (and charged). Otherwise nothing is
+        charged and the return value is the number of seconds to wait, or
+        ``math.inf`` if the cost exceeds a budget outright.
+        """
+        wait = self._users.wait_time(user_id, cost)
+        if guild_id is not None:
+            wait = max(wait, self._guilds.wait_time(guild_id, cost))
+        if wait > 0:
+            return wait
+        self._users.charge(user_id, cost)
+        if guild_id is not None:
+            self._guilds.charge(guild_id, cost)
+        return 0.0
@@ -11,9 +11,19 @@ import discord
 from discord.ext import commands
 
 from . import cogs as _cogs_pkg
+from .admission import Admission
 from .config import Config
+from .dice_parser import ParseCache
+from .distribution import DistributionCache
+from .initiative import InitiativeTracker
+from .macros import MacroCache
+from .rng import make_rng
+from .roll_plan import PlanCache
+from .simulate import Simulator
 from .state import State
+from .tables import TableCache
 from .translations import t
+from .variables import UserPlanCache
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +57,16 @@ class SirrMizan(commands.Bot):
         )
         self.config = config
         self.state = state
+        self.parse_cache = ParseCache(config.parse_cache_size)
+        self.plan_cache = PlanCache(config.parse_cache_size)
+        self.distribution_cache = DistributionCache()
+        self.table_cache = TableCache()
+        self.macro_cache = MacroCache()
+        self.user_plan_cache = UserPlanCache()
+        self.rng = make_rng(config.rng_backend)
+        self.admission = Admission(config.user_roll_budget, config.guild_roll_budget)
+        self.simulator = Simulator()
+        self.initiative = InitiativeTracker()
         self._save_task: asyncio.Task[None] | None = None
         self._heartbeat_task: asyncio.Task[None] | None = None
 
@@ -145,12 +165,45 @@ class SirrMizan(commands.Bot):
                 except asyncio.CancelledError:
                     pass
                 setattr(self, task_attr, None)
+        self.simulator.shutdown()
         try:
             await self.state.save()
         except Exception:
             logger.exception("Final save failed")
+        self.state.close()
+        self._log_stats(logging.INFO)
         await super().close()
 
+    def _log_stats(self, level: int) -> None:
+        for name, stats in (
+            ("parse", self.parse_cache.stats),
+            ("plan", self.plan_cache.stats),
+            ("distribution", self.distribution_cache.stats),
+            ("table", self.table_cache.stats),
+            ("macro", self.macro_cache.stats),
+            ("user plan", self.user_plan_cache.stats),
+        ):
+            logger.log(
+                level,
+                "%s cache: hits=%d misses=%d evictions=%d size=%d/%d hit_rate=%.1f%%",
+                name,
+                stats.hits,
+                stats.misses,
+                stats.evictions,
+                stats.size,
+                stats.maxsize,
+                stats.hit_rate * 100,
+            )
+        saves = self.state.save_stats
+        logger.log(
+            level,
+            "state saves: count=%d records=%d bytes=%d time=%.3fs",
+            saves.saves,
+            saves.records,
+            saves.bytes_written,
+            saves.seconds,
+        )
+
     async def _save_loop(self) -> None:
         interval = self.config.save_interval
         while True:
@@ -158,6 +211,7 @@ class SirrMizan(commands.Bot):
                 await asyncio.sleep(interval)
             except asyncio.CancelledError:
                 return
+            self._log_stats(logging.DEBUG)
             if self.state.is_dirty:
                 try:
                     await self.state.save()
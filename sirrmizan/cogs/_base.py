@@ -7,6 +7,7 @@ from typing import TYPE_CHECKING
 import discord
 from discord.ext import commands
 
+from ..dice_parser import MAX_EXPRESSION_LENGTH, DiceParseError, ParsedExpression, parse
 from ..translations import t
 
 if TYPE_CHECKING:
@@ -26,6 +27,26 @@ class BaseCog(commands.Cog):
     def _prefix(self, ctx: commands.Context) -> str:
         return (ctx.clean_prefix or self.bot.config.default_prefix).strip()
 
+    def _resolve_expression(
+        self, expression: str, *, lang: str
+    ) -> tuple[ParsedExpression | None, str, str | None]:
+        """Parse a bare expression (no target name, no default roll).
+
+        Returns ``(expr, expression_str, error_message)``.
+        """
+        if len(expression.strip()) > MAX_EXPRESSION_LENGTH:
+            return None, "", t(lang, "roll_input_too_long", limit=MAX_EXPRESSION_LENGTH)
+        expr, expression_str, target_name = self.bot.parse_cache.parse_roll_input(expression)
+        if expr is None or target_name is not None:
+            try:
+                parse(expression.strip())
+            except DiceParseError as exc:
+                return None, "", t(lang, "roll_invalid", error=str(exc))
+            return None, "", t(lang, "roll_invalid", error="no dice or modifier")
+        if expr.is_empty:
+            return None, "", t(lang, "roll_invalid", error="no dice or modifier")
+        return expr, expression_str, None
+
     async def _slash_cooldown(
         self,
         ctx: discord.ApplicationContext,
@@ -0,0 +1,152 @@
+"""Per-channel card decks: !deck new / draw / shuffle."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import discord
+from discord.ext import commands
+
+from ..decks import DECK_KINDS, DEFAULT_DECK_KIND, MAX_DECK_DRAWS, Deck, DeckError
+from ..translations import t
+from ._base import BaseCog
+
+if TYPE_CHECKING:
+    from ..bot import SirrMizan
+
+
+class DeckCog(BaseCog):
+    @staticmethod
+    def _deck_status(deck: Deck, *, lang: str) -> str:
+        return t(lang, "deck_status", kind=deck.kind, remaining=deck.remaining, size=deck.size)
+
+    async def _deck_new(self, channel_id: int, kind: str, *, lang: str) -> str:
+        try:
+            deck = await self.bot.state.new_channel_deck(channel_id, kind.lower(), self.bot.rng)
+        except DeckError:
+            return t(lang, "deck_unknown", kinds=", ".join(DECK_KINDS))
+        return t(lang, "deck_new", kind=deck.kind, size=deck.size)
+
+    async def _deck_shuffle(self, channel_id: int, *, lang: str, prefix: str) -> str:
+        deck = await self.bot.state.shuffle_channel_deck(channel_id, self.bot.rng)
+        if deck is None:
+            return t(lang, "deck_none", prefix=prefix)
+        return t(lang, "deck_shuffled", size=deck.size)
+
+    async def _deck_draw(
+        self, channel_id: int, count: int, *, lang: str, prefix: str
+    ) -> tuple[discord.Embed | None, str | None]:
+        """Draw ``count`` cards into one embed. Returns ``(embed, error_message)``."""
+        if not 1 <= count <= MAX_DECK_DRAWS:
+            return None, t(lang, "deck_draws_invalid", max=MAX_DECK_DRAWS)
+        try:
+            cards = await self.bot.state.draw_from_channel_deck(channel_id, count)
+        except DeckError:
+            deck = self.bot.state.get_channel_deck(channel_id)
+            remaining = deck.remaining if deck is not None else 0
+            return None, t(lang, "deck_too_few", remaining=remaining, prefix=prefix)
+        if cards is None:
+            return None, t(lang, "deck_none", prefix=prefix)
+        deck = self.bot.state.get_channel_deck(channel_id)
+        assert deck is not None  # the draw just succeeded
+        names = [deck.card_name(card) for card in cards]
+        embed = discord.Embed(
+            title="🃏" + (f" ({count})" if count > 1 else ""),
+            description=(
+                f"**{names[0]}**"
+                if count == 1
+                else "\n".join(f"{i}. **{name}**" for i, name in enumerate(names, start=1))
+            ),
+            color=discord.Color.dark_green(),
+        )
+        embed.set_footer(text=self._deck_status(deck, lang=lang))
+        return embed, None
+
+    @commands.group(name="deck", invoke_without_command=True)
+    @commands.cooldown(1, 3, commands.BucketType.user)
+    async def deck(self, ctx: commands.Context) -> None:
+        """Show the channel's deck, or how to start one."""
+        lang = self._lang(ctx)
+        deck = self.bot.state.get_channel_deck(ctx.channel.id)
+        if deck is None:
+            await ctx.send(t(lang, "deck_usage", prefix=self._prefix(ctx)))
+            return
+        await ctx.send(self._deck_status(deck, lang=lang))
+
+    @deck.command(name="new")
+    @commands.cooldown(1, 3, commands.BucketType.channel)
+    async def deck_new(self, ctx: commands.Context, kind: str = DEFAULT_DECK_KIND) -> None:
+        """Start a shuffled deck in this channel: ``!deck new tarot``."""
+        await ctx.send(await self._deck_new(ctx.channel.id, kind, lang=self._lang(ctx)))
+
+    @deck.command(name="shuffle")
+    @commands.cooldown(1, 3, commands.BucketType.channel)
+    async def deck_shuffle(self, ctx: commands.Context) -> None:
+        """Put every drawn card back and shuffle."""
+        await ctx.send(
+            await self._deck_shuffle(ctx.channel.id, lang=self._lang(ctx), prefix=self._prefix(ctx))
+        )
+
+    @deck.command(name="draw", aliases=["d"])
+    @commands.cooldown(3, 5, commands.BucketType.user)
+    async def deck_draw(self, ctx: commands.Context, count: int = 1) -> None:
+        """Draw cards from this channel's deck: ``!deck draw 3``."""
+        embed, error = await self._deck_draw(
+            ctx.channel.id, count, lang=self._lang(ctx), prefix=self._prefix(ctx)
+        )
+        if error is not None:
+            await ctx.send(error)
+            return
+        await ctx.send(embed=embed)
+
+    deck_slash = discord.SlashCommandGroup("deck", "Card decks for this channel")
+
+    @deck_slash.command(name="new", description="Start a shuffled deck in this channel")
+    async def deck_new_slash(
+        self,
+        ctx: discord.ApplicationContext,
+        kind: discord.Option(  # type: ignore[valid-type]
+            str, description="Deck", choices=list(DECK_KINDS), default=DEFAULT_DECK_KIND
+        ),
+    ) -> None:
+        if not await self._slash_cooldown(ctx, "deck"):
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id if ctx.guild_id else None)
+        await ctx.respond(await self._deck_new(ctx.channel_id, kind, lang=lang))
+
+    @deck_slash.command(name="draw", description="Draw cards from this channel's deck")
+    async def deck_draw_slash(
+        self,
+        ctx: discord.ApplicationContext,
+        count: discord.Option(  # type: ignore[valid-type]
+            int,
+            description=f"Number of cards (max {MAX_DECK_DRAWS})",
+            required=False,
+            default=1,
+        ),
+    ) -> None:
+        if not await self._slash_cooldown(ctx, "deck", 1.0):
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id if ctx.guild_id else None)
+        embed, error = await self._deck_draw(
+            ctx.channel_id, count, lang=lang, prefix=self.bot.config.default_prefix
+        )
+        if error is not None:
+            await ctx.respond(error, ephemeral=True)
+            return
+        await ctx.respond(embed=embed)
+
+    @deck_slash.command(name="shuffle", description="Put every card back and shuffle")
+    async def deck_shuffle_slash(self, ctx: discord.ApplicationContext) -> None:
+        if not await self._slash_cooldown(ctx, "deck"):
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id if ctx.guild_id else None)
+        await ctx.respond(
+            await self._deck_shuffle(
+                ctx.channel_id, lang=lang, prefix=self.bot.config.default_prefix
+            )
+        )
+
+
+def setup(bot: SirrMizan) -> None:
+    bot.add_cog(DeckCog(bot))
@@ -3,15 +3,26 @@
 from __future__ import annotations
 
 import logging
+import math
 import re
-import secrets
+from collections.abc import Sequence
 from typing import TYPE_CHECKING
 
 import discord
 from discord.ext import commands
 
-from .. import colors
-from ..dice_parser import DiceParseError, ParsedExpression, parse, parse_roll_input
+from .. import colors, engine
+from ..dice_parser import (
+    MAX_EXPRESSION_LENGTH,
+    DiceParseError,
+    ParsedExpression,
+    find_inline_rolls,
+    parse,
+    parse_roll_input,
+    split_roll_batch,
+)
+from ..macros import MACRO_REF_RE, MacroError
+from ..roll_plan import RollPlan
 from ..translations import t
 from ._base import BaseCog
 
@@ -21,38 +32,70 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 audit_logger = logging.getLogger("sirrmizan.audit")
 
-_RNG = secrets.SystemRandom()
-
-_HIGH_ROLL_THRESHOLD = 999
+# A total is audited as a high roll when it is both in the top
+# ``_HIGH_ROLL_TOP_SHARE`` of the expression's range and at least
+# ``_HIGH_ROLL_SIGMAS`` standard deviations above its mean: a natural 20 on
+# 1d20 is routine, every die of 10d6 landing near 6 is not.
+_HIGH_ROLL_TOP_SHARE = 0.05
+_HIGH_ROLL_SIGMAS = 3.0
 _LOOKS_LIKE_DICE_ATTEMPT = re.compile(r"^[+-]?\d")
+# ``@name`` as a whole token or right after a sign; ``<@123>`` is a mention.
+_USER_REF = re.compile(r"(?:^|[\s+-])@")
+_MESSAGE_LIMIT = 2000
+_EMBED_LIMIT = 6000  # characters across title, description, fields and footer
+_EMBED_FIELDS = 25
+_FIELD_LIMIT = 1024
+_HISTOGRAM_BAR_WIDTH = 16
+
+# (plan, expression_str, target) — one entry per roll in a batch.
+_ResolvedRoll = tuple[RollPlan, str, str | None]
 
 
 class DiceCog(BaseCog):
+    def __init__(self, bot: SirrMizan) -> None:
+        super().__init__(bot)
+        # !roll's per-user cooldown, for the inline-roll listener.
+        self._inline_cooldown: commands.CooldownMapping[discord.Message] = (
+            commands.CooldownMapping.from_cooldown(1, 1, commands.BucketType.user)
+        )
+
     def _author_color(self, user_id: int) -> discord.Color:
         return discord.Color(self.bot.state.get_user_color_hex(user_id))
 
-    def _roll_dice(self, expr: ParsedExpression) -> tuple[int, list[tuple[str, list[int]]]]:
-        """Roll ``expr`` and return (total, [(label, signed_results), ...])."""
-        dice_total = 0
-        terms: list[tuple[str, list[int]]] = []
-        for part in expr.dice:
-            results = [_RNG.randint(1, part.faces) for _ in range(part.rolls)]
-            signed = [part.sign * r for r in results]
-            dice_total += sum(signed)
-            sign_prefix = "" if part.sign > 0 else "-"
-            label = f"{sign_prefix}{part.rolls}d{part.faces}"
-            terms.append((label, signed))
-        return dice_total + expr.modifier_total, terms
+    def _roll_dice(self, plans: Sequence[RollPlan]) -> list[engine.RollResult]:
+        """Roll ``plans`` as one batch."""
+        return engine.roll_many(plans, self.bot.rng)
 
     @staticmethod
-    def _format_dice_term(label: str, signed_results: list[int]) -> str:
-        """Render one dice term: bold individual values, sum if more than one."""
+    def _format_dice_term(
+        label: str, signed_results: Sequence[int], dropped: Sequence[int] = ()
+    ) -> str:
+        """Render one dice term: bold individual values, sum if more than one.
+
+        ``dropped`` values (kept out of the total) follow, struck through.
+        """
+        struck = "".join(f" ~~{value}~~" for value in dropped)
         if len(signed_results) == 1:
-            return f"`{label}` → **{abs(signed_results[0])}**"
+            return f"`{label}` → **{abs(signed_results[0])}**{struck}"
         # Multiple dice in one term: show each result and the sum.
         rendered = " + ".join(f"**{abs(r)}**" for r in signed_results).replace(" + -", " - ")
         term_total = abs(sum(signed_results))
-        return f"`{label}` → {rendered} = **{term_total}**"
+        return f"`{label}` → {rendered} = **{term_total}**{struck}"
+
+    @staticmethod
+    def _format_histogram(counts: Sequence[int]) -> str:
+        """Code-block bar chart of how often each face came up."""
+        peak = max(counts) or 1
+        width = len(str(len(counts)))
+        lines = [
+            f"{face:>{width}} {'█' * round(n * _HISTOGRAM_BAR_WIDTH / peak):<{_HISTOGRAM_BAR_WIDTH}} {n}"
+            for face, n in enumerate(counts, start=1)
+        ]
+        return "```\n" + "\n".join(lines) + "\n```"
+
+    @staticmethod
+    def _clip(text: str, limit: int) -> str:
+        return text if len(text) <= limit else text[: limit - 1] + "…"
 
     @staticmethod
     def _format_modifiers(modifiers: tuple[int, ...]) -> str:
@@ -66,15 +109,19 @@ class DiceCog(BaseCog):
         *,
         total: int,
         expression_str: str,
-        terms: list[tuple[str, list[int]]],
+        terms: Sequence[tuple[str, Sequence[int]]],
         modifiers: tuple[int, ...],
         target_name: str | None,
         lang: str,
+        histograms: Sequence[tuple[int, Sequence[int]]] = (),
+        dropped: Sequence[tuple[int, Sequence[int]]] = (),
+        counted: Sequence[int] = (),
     ) -> discord.Embed:
         embed = discord.Embed(
             title=f"🎲 {total}",
             color=self._author_color(author.id),
         )
+        self._set_rolled_by_footer(embed, author, lang)
 
         # Description: original expression + optional target.
         desc_parts = [f"`{expression_str}`"] if expression_str else []
@@ -84,23 +131,52 @@ class DiceCog(BaseCog):
             embed.description = " ".join(desc_parts)
 
         # Skip the breakdown for a plain "1d20" — the title already shows it.
-        single_die_no_mod = len(terms) == 1 and len(terms[0][1]) == 1 and not modifiers
+        single_die_no_mod = (
+            len(terms) == 1
+            and len(terms[0][1]) == 1
+            and not modifiers
+            and not dropped
+            and not counted
+        )
         if terms and not single_die_no_mod:
-            lines = [self._format_dice_term(label, signed) for label, signed in terms]
+            dropped_by_term = dict(dropped)
+            lines = [
+                f"`{label}` → **{abs(signed[0])}** {t(lang, 'embed_successes')}"
+                if index in counted
+                else self._format_dice_term(label, signed, dropped_by_term.get(index, ()))
+                for index, (label, signed) in enumerate(terms)
+            ]
             embed.add_field(
                 name=t(lang, "embed_dice"),
-                value="\n".join(lines),
+                value=self._clip("\n".join(lines), _FIELD_LIMIT),
                 inline=False,
             )
 
+        modifiers_name = t(lang, "embed_modifiers")
+        modifiers_value = self._clip(self._format_modifiers(modifiers), _FIELD_LIMIT)
+        reserved = len(modifiers_name) + len(modifiers_value) if modifiers else 0
+
+        # Aggregated pools: face counts instead of per-die values. Histograms
+        # that would overflow the embed are left out; the Dice field still
+        # shows those terms' totals.
+        for index, counts in histograms:
+            name = f"{t(lang, 'embed_histogram')} `{terms[index][0]}`"
+            value = self._format_histogram(counts)
+            if (
+                len(embed.fields) + 1 + bool(modifiers) > _EMBED_FIELDS
+                or len(embed) + len(name) + len(value) + reserved > _EMBED_LIMIT
+            ):
+                break
+            embed.add_field(name=name, value=value, inline=False)
+
         if modifiers:
-            embed.add_field(
-                name=t(lang, "embed_modifiers"),
-                value=self._format_modifiers(modifiers),
-                inline=False,
-            )
+            embed.add_field(name=modifiers_name, value=modifiers_value, inline=False)
 
-        # Footer: author + their avatar.
+        return embed
+
+    @staticmethod
+    def _set_rolled_by_footer(embed: discord.Embed, author: discord.abc.User, lang: str) -> None:
+        """Footer: author + their avatar."""
         avatar_url: str | None = None
         guild_avatar = getattr(author, "guild_avatar", None)
         if guild_avatar is not None:
@@ -111,6 +187,39 @@ class DiceCog(BaseCog):
             text=f"{t(lang, 'embed_rolled_by')} {author.display_name}",
             icon_url=avatar_url,
         )
+
+    def _build_batch_embed(
+        self,
+        author: discord.abc.User,
+        *,
+        rolls: Sequence[tuple[str, str | None, engine.RollResult]],
+        lang: str,
+    ) -> discord.Embed:
+        """One embed for a multi-roll: every total in the title, a field per roll.
+
+        The breakdowns are dropped if they'd overflow the embed.
+        """
+        title = "🎲 " + " · ".join(str(result.total) for _, _, result in rolls)
+        for with_breakdown in (True, False):
+            embed = discord.Embed(title=title[:256], color=self._author_color(author.id))
+            for index, (expression_str, target_name, result) in enumerate(rolls, start=1):
+                name = f"{index}. {expression_str}"
+                if target_name:
+                    name += f" {t(lang, 'embed_for')} {target_name}"
+                value = f"**{result.total}**"
+                breakdown = (
+                    self._format_breakdown(
+                        result.terms, result.modifiers, result.dropped, result.counted
+                    )
+                    if with_breakdown
+                    else ""
+                )
+                if breakdown:
+                    value += f"  ({breakdown})"
+                embed.add_field(name=name[:256], value=value[:1024], inline=False)
+            self._set_rolled_by_footer(embed, author, lang)
+            if len(embed) <= _EMBED_LIMIT:
+                break
         return embed
 
     @staticmethod
@@ -118,10 +227,13 @@ class DiceCog(BaseCog):
         *,
         total: int,
         expression_str: str,
-        terms: list[tuple[str, list[int]]],
+        terms: Sequence[tuple[str, Sequence[int]]],
         modifiers: tuple[int, ...],
         target_name: str | None,
         lang: str,
+        with_breakdown: bool = True,
+        dropped: Sequence[tuple[int, Sequence[int]]] = (),
+        counted: Sequence[int] = (),
     ) -> str:
         """Render the result as a single message line (no embed)."""
         head = f"🎲 **{total}**"
@@ -131,19 +243,63 @@ class DiceCog(BaseCog):
             head += f" {t(lang, 'embed_for')} **{target_name}**"
 
         # Per-term breakdown in parentheses.
+        breakdown = (
+            DiceCog._format_breakdown(terms, modifiers, dropped, counted) if with_breakdown else ""
+        )
+        if breakdown:
+            return f"{head}  ({breakdown})"
+        return head
+
+    @staticmethod
+    def _format_breakdown(
+        terms: Sequence[tuple[str, Sequence[int]]],
+        modifiers: tuple[int, ...],
+        dropped: Sequence[tuple[int, Sequence[int]]] = (),
+        counted: Sequence[int] = (),
+    ) -> str:
+        """Single-line breakdown: ``2d6=3+4, -1d4=2, +3``, ``4d6kh3=6+5+4 ~~2~~``.
+
+        Success counts read ``10d10>=7 → 4``.
+        """
+        dropped_by_term = dict(dropped)
         breakdown_parts: list[str] = []
-        for label, signed in terms:
-            if len(signed) == 1:
-                breakdown_parts.append(f"{label}={abs(signed[0])}")
+        for index, (label, signed) in enumerate(terms):
+            if index in counted:
+                part = f"{label} → {abs(signed[0])}"
+            elif len(signed) == 1:
+                part = f"{label}={abs(signed[0])}"
             else:
-                joined = "+".join(str(abs(r)) for r in signed)
-                breakdown_parts.append(f"{label}={joined}")
+                part = f"{label}=" + "+".join(str(abs(r)) for r in signed)
+            breakdown_parts.append(
+                part + "".join(f" ~~{value}~~" for value in dropped_by_term.get(index, ()))
+            )
         for m in modifiers:
             breakdown_parts.append(f"{m:+d}")
+        return ", ".join(breakdown_parts)
 
-        if breakdown_parts:
-            return f"{head}  ({', '.join(breakdown_parts)})"
-        return head
+    @staticmethod
+    def _build_batch_compact(
+        *, rolls: Sequence[tuple[str, str | None, engine.RollResult]], lang: str
+    ) -> str:
+        """One line per roll; drop the breakdowns if they'd overflow a message."""
+        for with_breakdown in (True, False):
+            text = "\n".join(
+                DiceCog._build_compact(
+                    total=result.total,
+                    expression_str=expression_str,
+                    terms=result.terms,
+                    modifiers=result.modifiers,
+                    target_name=target_name,
+                    lang=lang,
+                    with_breakdown=with_breakdown,
+                    dropped=result.dropped,
+                    counted=result.counted,
+                )
+                for expression_str, target_name, result in rolls
+            )
+            if len(text) <= _MESSAGE_LIMIT:
+                break
+        return text
 
     async def _resolve_roll(
         self,
@@ -152,13 +308,18 @@ class DiceCog(BaseCog):
         lang: str,
         prefix: str,
         guild_id: int | None,
-    ) -> tuple[ParsedExpression | None, str, str | None, str | None]:
-        """Resolve a roll input into a parsed expression and target.
+        user_id: int | None = None,
+    ) -> tuple[RollPlan | None, str, str | None, str | None]:
+        """Resolve a roll input into a compiled plan and target.
 
-        Returns ``(expr, expression_str, target, error_message)``. If
+        Returns ``(plan, expression_str, target, error_message)``. If
         ``error_message`` is non-None, the caller should send it to the user
-        and abort. Otherwise ``expr`` is guaranteed to be a non-empty
-        ``ParsedExpression``.
+        and abort. Otherwise ``plan`` is guaranteed to roll a non-empty
+        expression.
+
+        ``@name`` (optionally followed by a target) rolls one of
+        ``user_id``'s macros from its precompiled plan, without parsing; any
+        other ``@name`` in the input is one of their variables.
         """
         default_roll = self.bot.state.get_server_default_roll(guild_id)
         raw = (raw or "").strip()
@@ -168,16 +329,20 @@ class DiceCog(BaseCog):
                 return None, "", None, t(lang, "defaultroll_missing", prefix=prefix)
             raw = default_roll
 
-        if len(raw) > 100:
-            return None, "", None, t(lang, "roll_input_too_long")
+        if len(raw) > MAX_EXPRESSION_LENGTH:
+            return None, "", None, t(lang, "roll_input_too_long", limit=MAX_EXPRESSION_LENGTH)
 
-        expr, expression_str, target_name = parse_roll_input(raw)
+        if user_id is not None and _USER_REF.search(raw):
+            return self._resolve_user_input(raw, user_id=user_id, lang=lang, prefix=prefix)
+
+        cache = self.bot.parse_cache
+        expr, expression_str, target_name = cache.parse_roll_input(raw)
 
         if expr is None:
             looks_like_dice = bool(target_name and _LOOKS_LIKE_DICE_ATTEMPT.match(target_name))
             if default_roll is not None and target_name is not None and not looks_like_dice:
                 try:
-                    expr = parse(default_roll)
+                    expr = cache.parse(default_roll)
                     expression_str = default_roll
                 except DiceParseError as exc:
                     return None, "", None, t(lang, "roll_invalid", error=str(exc))
@@ -190,43 +355,184 @@ class DiceCog(BaseCog):
 
         if expr.is_empty:
             return None, "", None, t(lang, "roll_invalid", error="no dice or modifier")
-        return expr, expression_str, target_name, None
+        return self.bot.plan_cache.plan(expr), expression_str, target_name, None
+
+    def _resolve_user_input(
+        self, raw: str, *, user_id: int, lang: str, prefix: str
+    ) -> tuple[RollPlan | None, str, str | None, str | None]:
+        """Input naming a macro or variables; same return as ``_resolve_roll``.
+
+        ``@name`` that is not one of the user's macros is parsed as a roll
+        instead, since ``@str-2`` (a variable minus 2) also matches the macro
+        pattern. It is reported as a missing macro only if that fails too.
+        """
+        state = self.bot.state
+        variables = state.get_user_variables(user_id)
+        missing_macro: str | None = None
+        match = MACRO_REF_RE.match(raw)
+        if match is not None:
+            name, target_name = match.group(1).lower(), match.group(2)
+            macros = state.get_user_macros(user_id)
+            try:
+                macro = self.bot.macro_cache.lookup(user_id, name, macros, variables)
+            except MacroError as exc:
+                return None, "", None, t(lang, "roll_invalid", error=f"@{name}: {exc}")
+            if macro is not None:
+                return macro.plan, macro.expression_str, target_name or macro.target, None
+            missing_macro = name
+
+        resolved = self.bot.user_plan_cache.get(user_id, raw)
+        if resolved is None:
+            expr, expression_str, target_name = parse_roll_input(raw, variables)
+            if expr is None or expr.is_empty:
+                if missing_macro is not None:
+                    return (
+                        None,
+                        "",
+                        None,
+                        t(lang, "macro_not_found", name=missing_macro, prefix=prefix),
+                    )
+                try:
+                    parse(raw, variables)
+                except DiceParseError as exc:
+                    return None, "", None, t(lang, "roll_invalid", error=str(exc))
+                return None, "", None, t(lang, "roll_invalid", error="no dice or modifier")
+            resolved = (self.bot.plan_cache.plan(expr), expression_str, target_name)
+            self.bot.user_plan_cache.put(user_id, raw, resolved)
+        return (*resolved, None)
+
+    async def _resolve_batch(
+        self,
+        raw: str,
+        *,
+        lang: str,
+        prefix: str,
+        guild_id: int | None,
+        user_id: int | None = None,
+    ) -> tuple[list[_ResolvedRoll], str | None]:
+        """Resolve possibly multi-roll input (``6x 4d6``, ``a; b``).
+
+        Returns ``(rolls, error_message)`` with one entry per roll to make;
+        plain single-roll input yields exactly one entry.
+        """
+        try:
+            items = split_roll_batch(raw)
+        except DiceParseError as exc:
+            return [], t(lang, "roll_invalid", error=str(exc))
+
+        rolls: list[_ResolvedRoll] = []
+        for repeat, segment in items:
+            plan, expression_str, target_name, error = await self._resolve_roll(
+                segment, lang=lang, prefix=prefix, guild_id=guild_id, user_id=user_id
+            )
+            if error is not None:
+                return [], error
+            assert plan is not None  # narrowed by error check
+            rolls.extend([(plan, expression_str, target_name)] * repeat)
+        return rolls, None
+
+    def _admit(
+        self,
+        rolls: Sequence[_ResolvedRoll],
+        *,
+        author_id: int,
+        guild_id: int | None,
+        lang: str,
+    ) -> str | None:
+        """Charge the batch's estimated cost to the user and guild budgets.
 
-    async def _send_result(
+        Returns an error message if either budget can't cover it, or if a
+        roll's output wouldn't fit in an embed; nothing has been rolled or
+        charged in that case.
+        """
+        if any(
+            plan.cost.chars > _EMBED_LIMIT or plan.cost.fields > _EMBED_FIELDS
+            for plan, _, _ in rolls
+        ):
+            return t(lang, "roll_output_too_large")
+        cost = sum(plan.cost.units for plan, _, _ in rolls)
+        wait = self.bot.admission.admit(author_id, guild_id, cost)
+        if wait == 0:
+            return None
+        logger.info(
+            "roll_rejected user=%s guild=%s cost=%d wait=%.1f", author_id, guild_id, cost, wait
+        )
+        if math.isinf(wait):
+            return t(lang, "roll_too_expensive")
+        return t(lang, "roll_over_budget", seconds=max(wait, 1.0))
+
+    @staticmethod
+    def _is_high_roll(expr: ParsedExpression, total: int) -> bool:
+        """Whether ``total`` is unusually close to ``expr``'s maximum."""
+        if not expr.has_dice:
+            return False
+        top_share = expr.maximum - (expr.maximum - expr.minimum) * _HIGH_ROLL_TOP_SHARE
+        unlikely = expr.mean + _HIGH_ROLL_SIGMAS * math.sqrt(expr.variance)
+        return total >= max(top_share, unlikely)
+
+    async def _roll_and_send(
         self,
         *,
         author: discord.abc.User,
+        guild_id: int | None,
+        rolls: Sequence[_ResolvedRoll],
+        lang: str,
         send_text,
         send_embed,
-        compact: bool,
-        total: int,
-        expression_str: str,
-        terms: list[tuple[str, list[int]]],
-        modifiers: tuple[int, ...],
-        target_name: str | None,
-        lang: str,
     ) -> None:
+        """Roll a batch and reply with one message; shared by prefix and slash."""
+        results = self._roll_dice([plan for plan, _, _ in rolls])
+        await self.bot.state.increment_dice_rolls(author.id, len(results))
+
+        for (plan, expression_str, _), result in zip(rolls, results, strict=True):
+            if self._is_high_roll(plan.expression, result.total):
+                audit_logger.info(
+                    "high_roll user=%s guild=%s total=%d expression=%r",
+                    author.id,
+                    guild_id,
+                    result.total,
+                    expression_str,
+                )
+
+        compact = self.bot.state.get_user_compact(author.id)
+        if len(rolls) > 1:
+            rendered = [
+                (expression_str, target_name, result)
+                for (_, expression_str, target_name), result in zip(rolls, results, strict=True)
+            ]
+            if compact:
+                await send_text(self._build_batch_compact(rolls=rendered, lang=lang))
+            else:
+                await send_embed(self._build_batch_embed(author, rolls=rendered, lang=lang))
+            return
+
+        (_, expression_str, target_name), result = rolls[0], results[0]
         if compact:
             await send_text(
                 self._build_compact(
-                    total=total,
+                    total=result.total,
                     expression_str=expression_str,
-                    terms=terms,
-                    modifiers=modifiers,
+                    terms=result.terms,
+                    modifiers=result.modifiers,
                     target_name=target_name,
                     lang=lang,
+                    dropped=result.dropped,
+                    counted=result.counted,
                 )
             )
         else:
             await send_embed(
                 self._build_embed(
                     author,
-                    total=total,
+                    total=result.total,
                     expression_str=expression_str,
-                    terms=terms,
-                    modifiers=modifiers,
+                    terms=result.terms,
+                    modifiers=result.modifiers,
                     target_name=target_name,
                     lang=lang,
+                    histograms=result.histograms,
+                    dropped=result.dropped,
+                    counted=result.counted,
                 )
             )
 
@@ -234,43 +540,28 @@ class DiceCog(BaseCog):
     @commands.cooldown(1, 1, commands.BucketType.user)
     @commands.max_concurrency(1, per=commands.BucketType.user, wait=False)
     async def roll(self, ctx: commands.Context, *, args: str | None = None) -> None:
-        """Roll dice. Example: ``!roll 2d6+3 Goblin``."""
+        """Roll dice. Examples: ``!roll 2d6+3 Goblin``, ``!roll 6x 4d6``,
+        ``!roll 1d20+5 Sword; 2d6+3 Damage``."""
         lang = self._lang(ctx)
         prefix = self._prefix(ctx)
         guild_id = ctx.guild.id if ctx.guild else None
 
-        expr, expression_str, target_name, error = await self._resolve_roll(
-            args or "", lang=lang, prefix=prefix, guild_id=guild_id
+        rolls, error = await self._resolve_batch(
+            args or "", lang=lang, prefix=prefix, guild_id=guild_id, user_id=ctx.author.id
         )
+        if error is None:
+            error = self._admit(rolls, author_id=ctx.author.id, guild_id=guild_id, lang=lang)
         if error is not None:
             await ctx.send(error)
             return
-        assert expr is not None  # narrowed by error check
-
-        total, terms = self._roll_dice(expr)
-        await self.bot.state.increment_dice_rolls(ctx.author.id)
-
-        if total > _HIGH_ROLL_THRESHOLD:
-            audit_logger.info(
-                "high_roll user=%s guild=%s total=%d expression=%r",
-                ctx.author.id,
-                guild_id,
-                total,
-                expression_str,
-            )
 
-        compact = self.bot.state.get_user_compact(ctx.author.id)
-        await self._send_result(
+        await self._roll_and_send(
             author=ctx.author,
+            guild_id=guild_id,
+            rolls=rolls,
+            lang=lang,
             send_text=lambda content: ctx.send(content=content),
             send_embed=lambda embed: ctx.send(embed=embed),
-            compact=compact,
-            total=total,
-            expression_str=expression_str,
-            terms=terms,
-            modifiers=expr.modifiers,
-            target_name=target_name,
-            lang=lang,
         )
 
         # Try to delete the invocation message; ignore if no permission.
@@ -280,6 +571,50 @@ class DiceCog(BaseCog):
             except (discord.Forbidden, discord.HTTPException, discord.NotFound):
                 pass
 
+    @commands.Cog.listener("on_message")
+    async def inline_rolls(self, message: discord.Message) -> None:
+        """Roll every ``[[1d20+5]]`` in a chat message, answered with one reply.
+
+        Spans that don't parse are ignored rather than reported, so chat that
+        merely contains brackets gets no answer. Messages sent while the
+        author is on cooldown are ignored too.
+        """
+        spans = find_inline_rolls(message.content)
+        if not spans or message.author.bot:
+            return
+        guild_id = message.guild.id if message.guild else None
+        prefix = self.bot.config.default_prefix
+        if guild_id is not None:
+            prefix = self.bot.state.get_server_prefix(guild_id, prefix)
+        if message.content.startswith(prefix):
+            return  # a command; its own handler takes care of it
+        if self._inline_cooldown.update_rate_limit(message):
+            return
+        lang = self.bot.state.get_server_language(guild_id)
+
+        rolls: list[_ResolvedRoll] = []
+        for span in spans:
+            plan, expression_str, target_name, error = await self._resolve_roll(
+                span, lang=lang, prefix=prefix, guild_id=None, user_id=message.author.id
+            )
+            if error is None and plan is not None:
+                rolls.append((plan, expression_str, target_name))
+        if not rolls:
+            return
+        error = self._admit(rolls, author_id=message.author.id, guild_id=guild_id, lang=lang)
+        if error is not None:
+            await message.reply(error)
+            return
+
+        await self._roll_and_send(
+            author=message.author,
+            guild_id=guild_id,
+            rolls=rolls,
+            lang=lang,
+            send_text=lambda content: message.reply(content),
+            send_embed=lambda embed: message.reply(embed=embed),
+        )
+
     @commands.command(name="setcolor")
     @commands.cooldown(1, 3, commands.BucketType.user)
     async def set_color(self, ctx: commands.Context, color: str) -> None:
@@ -354,61 +689,36 @@ class DiceCog(BaseCog):
         prefix = self.bot.config.default_prefix
         guild_id = ctx.guild_id
 
-        # Combine the two arguments into a single raw string. parse_roll_input
-        # is forgiving about both formats.
-        raw = (expression or "").strip()
-        if target:
-            raw = f"{raw} {target}".strip() if raw else target
+        # Only a lone target option is rolled as input (it may trigger the
+        # server default roll); otherwise the expression is resolved alone
+        # and the explicit target applies to every roll in it.
+        raw = (expression or "").strip() or (target or "").strip()
 
-        expr, expression_str, target_name, error = await self._resolve_roll(
-            raw, lang=lang, prefix=prefix, guild_id=guild_id
+        rolls, error = await self._resolve_batch(
+            raw, lang=lang, prefix=prefix, guild_id=guild_id, user_id=ctx.author.id
         )
         if error is not None:
             await ctx.respond(error, ephemeral=True)
             return
-        assert expr is not None
 
         # If the user supplied target as a separate option AND parse_roll_input
         # also pulled one from the expression, the explicit option wins.
         if target:
-            target_name = target
-
-        total, terms = self._roll_dice(expr)
-        await self.bot.state.increment_dice_rolls(ctx.author.id)
-
-        if total > _HIGH_ROLL_THRESHOLD:
-            audit_logger.info(
-                "high_roll user=%s guild=%s total=%d expression=%r",
-                ctx.author.id,
-                guild_id,
-                total,
-                expression_str,
-            )
+            rolls = [(plan, expression_str, target) for plan, expression_str, _ in rolls]
 
-        compact = self.bot.state.get_user_compact(ctx.author.id)
-        if compact:
-            await ctx.respond(
-                self._build_compact(
-                    total=total,
-                    expression_str=expression_str,
-                    terms=terms,
-                    modifiers=expr.modifiers,
-                    target_name=target_name,
-                    lang=lang,
-                )
-            )
-        else:
-            await ctx.respond(
-                embed=self._build_embed(
-                    ctx.author,
-                    total=total,
-                    expression_str=expression_str,
-                    terms=terms,
-                    modifiers=expr.modifiers,
-                    target_name=target_name,
-                    lang=lang,
-                )
-            )
+        error = self._admit(rolls, author_id=ctx.author.id, guild_id=guild_id, lang=lang)
+        if error is not None:
+            await ctx.respond(error, ephemeral=True)
+            return
+
+        await self._roll_and_send(
+            author=ctx.author,
+            guild_id=guild_id,
+            rolls=rolls,
+            lang=lang,
+            send_text=lambda content: ctx.respond(content),
+            send_embed=lambda embed: ctx.respond(embed=embed),
+        )
 
     @discord.slash_command(name="setcolor", description="Set your preferred embed color")
     async def set_color_slash(
@@ -27,6 +27,55 @@ class HelpCog(BaseCog):
             value=f"{t(lang, 'roll_desc')}\n```\n{prefix}roll 2d6+3 Goblin\n```",
             inline=False,
         )
+        embed.add_field(
+            name=f"📊 `{prefix}odds` — {t(lang, 'odds_title')}",
+            value=f"{t(lang, 'odds_desc')}\n```\n{prefix}odds 2d6+3 >= 10\n```",
+            inline=False,
+        )
+        embed.add_field(
+            name=f"📈 `{prefix}simulate` — {t(lang, 'simulate_title')}",
+            value=f"{t(lang, 'simulate_desc')}\n```\n{prefix}simulate 100000 4d6+2\n```",
+            inline=False,
+        )
+        embed.add_field(
+            name=f"💾 `{prefix}macro` — {t(lang, 'macro_title')}",
+            value=(
+                f"{t(lang, 'macro_desc')}\n"
+                f"```\n{prefix}macro save atk 1d20+7 Goblin\n{prefix}roll @atk\n```"
+            ),
+            inline=False,
+        )
+        embed.add_field(
+            name=f"🔢 `{prefix}var` — {t(lang, 'var_title')}",
+            value=(
+                f"{t(lang, 'var_desc')}\n```\n{prefix}var set str 3\n{prefix}roll 1d20+@str\n```"
+            ),
+            inline=False,
+        )
+        embed.add_field(
+            name=f"⚔️ `{prefix}init` — {t(lang, 'init_title')}",
+            value=(
+                f"{t(lang, 'init_desc')}\n"
+                f"```\n{prefix}init Goblin:+2 Orc:+1 Alice:+5\n{prefix}init next\n```"
+            ),
+            inline=False,
+        )
+        embed.add_field(
+            name=f"📜 `{prefix}table` — {t(lang, 'table_title')}",
+            value=(
+                f"{t(lang, 'table_desc')}\n"
+                f"```\n{prefix}table add loot 50 Copper | 10 Silver | 1 Gem\n"
+                f"{prefix}table roll loot 3\n```"
+            ),
+            inline=False,
+        )
+        embed.add_field(
+            name=f"🃏 `{prefix}deck` — {t(lang, 'deck_title')}",
+            value=(
+                f"{t(lang, 'deck_desc')}\n```\n{prefix}deck new tarot\n{prefix}deck draw 3\n```"
+            ),
+            inline=False,
+        )
         color_options = ", ".join(sorted(colors.CANONICAL_COLORS))
         embed.add_field(
             name=f"🎨 `{prefix}setcolor` — {t(lang, 'setcolor_title')}",
@@ -0,0 +1,160 @@
+"""Initiative tracking per channel: !init / next / show / end."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import discord
+from discord.ext import commands
+
+from ..initiative import Initiative, InitiativeError, parse_combatants, roll_initiative
+from ..translations import t
+from ._base import BaseCog
+
+if TYPE_CHECKING:
+    from ..bot import SirrMizan
+
+
+class InitiativeCog(BaseCog):
+    @staticmethod
+    def _init_embed(initiative: Initiative, *, lang: str) -> discord.Embed:
+        lines = []
+        for i, entry in enumerate(initiative.entries):
+            marker = "▶" if i == initiative.turn else f"`{i + 1}.`"
+            lines.append(
+                f"{marker} **{entry.name}** — {entry.total} (`{entry.roll}` {entry.modifier:+d})"
+            )
+        embed = discord.Embed(
+            title=f"⚔️ {t(lang, 'init_title')}",
+            description="\n".join(lines),
+            color=discord.Color.dark_red(),
+        )
+        embed.set_footer(text=t(lang, "init_round", round=initiative.round))
+        return embed
+
+    async def _init_roll(
+        self, channel_id: int, author_id: int, text: str, *, lang: str
+    ) -> tuple[discord.Embed | None, str | None]:
+        """Roll everyone and start the channel's order. Returns ``(embed, error_message)``."""
+        try:
+            combatants = parse_combatants(text)
+        except InitiativeError as exc:
+            return None, t(lang, "init_invalid", error=str(exc))
+        entries = roll_initiative(combatants, self.bot.rng)
+        await self.bot.state.increment_dice_rolls(author_id, len(entries))
+        initiative = self.bot.initiative.start(channel_id, entries)
+        return self._init_embed(initiative, lang=lang), None
+
+    def _init_next(self, channel_id: int, *, lang: str, prefix: str) -> str:
+        initiative = self.bot.initiative.get(channel_id)
+        if initiative is None:
+            return t(lang, "init_none", prefix=prefix)
+        entry = initiative.advance()
+        return t(lang, "init_turn", round=initiative.round, name=entry.name, total=entry.total)
+
+    def _init_show(
+        self, channel_id: int, *, lang: str, prefix: str
+    ) -> tuple[discord.Embed | None, str | None]:
+        initiative = self.bot.initiative.get(channel_id)
+        if initiative is None:
+            return None, t(lang, "init_none", prefix=prefix)
+        return self._init_embed(initiative, lang=lang), None
+
+    def _init_end(self, channel_id: int, *, lang: str, prefix: str) -> str:
+        if not self.bot.initiative.end(channel_id):
+            return t(lang, "init_none", prefix=prefix)
+        return t(lang, "init_ended")
+
+    @commands.group(name="init", aliases=["initiative"], invoke_without_command=True)
+    @commands.cooldown(1, 3, commands.BucketType.channel)
+    async def init(self, ctx: commands.Context, *, combatants: str = "") -> None:
+        """Roll initiative for everyone at once: ``!init Goblin:+2 Orc:+1 Alice:+5``."""
+        lang = self._lang(ctx)
+        if not combatants.strip():
+            await ctx.send(t(lang, "init_usage", prefix=self._prefix(ctx)))
+            return
+        embed, error = await self._init_roll(ctx.channel.id, ctx.author.id, combatants, lang=lang)
+        if error is not None:
+            await ctx.send(error)
+            return
+        await ctx.send(embed=embed)
+
+    @init.command(name="next", aliases=["n"])
+    @commands.cooldown(1, 1, commands.BucketType.channel)
+    async def init_next(self, ctx: commands.Context) -> None:
+        """Pass the turn to the next combatant."""
+        await ctx.send(
+            self._init_next(ctx.channel.id, lang=self._lang(ctx), prefix=self._prefix(ctx))
+        )
+
+    @init.command(name="show")
+    @commands.cooldown(1, 3, commands.BucketType.user)
+    async def init_show(self, ctx: commands.Context) -> None:
+        embed, error = self._init_show(
+            ctx.channel.id, lang=self._lang(ctx), prefix=self._prefix(ctx)
+        )
+        if error is not None:
+            await ctx.send(error)
+            return
+        await ctx.send(embed=embed)
+
+    @init.command(name="end", aliases=["clear"])
+    @commands.cooldown(1, 3, commands.BucketType.channel)
+    async def init_end(self, ctx: commands.Context) -> None:
+        await ctx.send(
+            self._init_end(ctx.channel.id, lang=self._lang(ctx), prefix=self._prefix(ctx))
+        )
+
+    init_slash = discord.SlashCommandGroup("init", "Initiative order for this channel")
+
+    @init_slash.command(name="roll", description="Roll initiative for every combatant")
+    async def init_roll_slash(
+        self,
+        ctx: discord.ApplicationContext,
+        combatants: discord.Option(  # type: ignore[valid-type]
+            str, description="Names with modifiers, e.g. Goblin:+2 Orc:+1 Alice:+5"
+        ),
+    ) -> None:
+        if not await self._slash_cooldown(ctx, "init"):
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id if ctx.guild_id else None)
+        embed, error = await self._init_roll(ctx.channel_id, ctx.author.id, combatants, lang=lang)
+        if error is not None:
+            await ctx.respond(error, ephemeral=True)
+            return
+        await ctx.respond(embed=embed)
+
+    @init_slash.command(name="next", description="Pass the turn to the next combatant")
+    async def init_next_slash(self, ctx: discord.ApplicationContext) -> None:
+        if not await self._slash_cooldown(ctx, "init", 1.0):
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id if ctx.guild_id else None)
+        await ctx.respond(
+            self._init_next(ctx.channel_id, lang=lang, prefix=self.bot.config.default_prefix)
+        )
+
+    @init_slash.command(name="show", description="Show this channel's initiative order")
+    async def init_show_slash(self, ctx: discord.ApplicationContext) -> None:
+        if not await self._slash_cooldown(ctx, "init"):
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id if ctx.guild_id else None)
+        embed, error = self._init_show(
+            ctx.channel_id, lang=lang, prefix=self.bot.config.default_prefix
+        )
+        if error is not None:
+            await ctx.respond(error, ephemeral=True)
+            return
+        await ctx.respond(embed=embed)
+
+    @init_slash.command(name="end", description="End this channel's initiative order")
+    async def init_end_slash(self, ctx: discord.ApplicationContext) -> None:
+        if not await self._slash_cooldown(ctx, "init"):
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id if ctx.guild_id else None)
+        await ctx.respond(
+            self._init_end(ctx.channel_id, lang=lang, prefix=self.bot.config.default_prefix)
+        )
+
+
+def setup(bot: SirrMizan) -> None:
+    bot.add_cog(InitiativeCog(bot))
@@ -0,0 +1,122 @@
+"""User macros: !macro save / delete / list, rolled with ``!roll @name``."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import discord
+from discord.ext import commands
+
+from ..macros import MacroError, compile_macro, is_valid_macro_name
+from ..translations import t
+from ._base import BaseCog
+
+if TYPE_CHECKING:
+    from ..bot import SirrMizan
+
+
+class MacroCog(BaseCog):
+    async def _macro_save(self, user_id: int, name: str, raw: str, *, lang: str) -> str:
+        name = name.lower()
+        if not is_valid_macro_name(name):
+            return t(lang, "macro_invalid_name")
+        try:
+            macro = compile_macro(raw, self.bot.state.get_user_variables(user_id))
+            await self.bot.state.set_user_macro(user_id, name, raw.strip())
+        except MacroError as exc:
+            return t(lang, "macro_invalid", error=str(exc))
+        self.bot.macro_cache.invalidate(user_id)
+        await self.bot.state.save()
+        return t(lang, "macro_saved", name=name, expression=macro.expression_str)
+
+    async def _macro_delete(self, user_id: int, name: str, *, lang: str, prefix: str) -> str:
+        name = name.lower()
+        if not await self.bot.state.delete_user_macro(user_id, name):
+            return t(lang, "macro_not_found", name=name, prefix=prefix)
+        self.bot.macro_cache.invalidate(user_id)
+        await self.bot.state.save()
+        return t(lang, "macro_deleted", name=name)
+
+    def _macro_list(self, user_id: int, *, lang: str, prefix: str) -> str:
+        macros = self.bot.state.get_user_macros(user_id)
+        if not macros:
+            return t(lang, "macro_none", prefix=prefix)
+        lines = [f"`@{name}` → `{macros[name]}`" for name in sorted(macros)]
+        return "\n".join([t(lang, "macro_list"), *lines])
+
+    @commands.group(name="macro", invoke_without_command=True)
+    @commands.cooldown(1, 3, commands.BucketType.user)
+    async def macro(self, ctx: commands.Context) -> None:
+        """Saved rolls. Example: ``!macro save atk 1d20+7 Goblin``, then ``!roll @atk``."""
+        await ctx.send(t(self._lang(ctx), "macro_usage", prefix=self._prefix(ctx)))
+
+    @macro.command(name="save", aliases=["set"])
+    @commands.cooldown(1, 3, commands.BucketType.user)
+    async def macro_save(self, ctx: commands.Context, name: str, *, expression: str) -> None:
+        await ctx.send(
+            await self._macro_save(ctx.author.id, name, expression, lang=self._lang(ctx))
+        )
+
+    @macro.command(name="delete", aliases=["remove"])
+    @commands.cooldown(1, 3, commands.BucketType.user)
+    async def macro_delete(self, ctx: commands.Context, name: str) -> None:
+        await ctx.send(
+            await self._macro_delete(
+                ctx.author.id, name, lang=self._lang(ctx), prefix=self._prefix(ctx)
+            )
+        )
+
+    @macro.command(name="list")
+    @commands.cooldown(1, 3, commands.BucketType.user)
+    async def macro_list(self, ctx: commands.Context) -> None:
+        await ctx.send(
+            self._macro_list(ctx.author.id, lang=self._lang(ctx), prefix=self._prefix(ctx))
+        )
+
+    macro_slash = discord.SlashCommandGroup("macro", "Saved rolls, used as @name in /roll")
+
+    @macro_slash.command(name="save", description="Save a roll as a macro")
+    async def macro_save_slash(
+        self,
+        ctx: discord.ApplicationContext,
+        name: discord.Option(str, description="Macro name"),  # type: ignore[valid-type]
+        expression: discord.Option(  # type: ignore[valid-type]
+            str, description="Roll input (e.g. 1d20+7 Goblin)"
+        ),
+    ) -> None:
+        if not await self._slash_cooldown(ctx, "macro"):
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id if ctx.guild_id else None)
+        await ctx.respond(
+            await self._macro_save(ctx.author.id, name, expression, lang=lang), ephemeral=True
+        )
+
+    @macro_slash.command(name="delete", description="Delete one of your macros")
+    async def macro_delete_slash(
+        self,
+        ctx: discord.ApplicationContext,
+        name: discord.Option(str, description="Macro name"),  # type: ignore[valid-type]
+    ) -> None:
+        if not await self._slash_cooldown(ctx, "macro"):
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id if ctx.guild_id else None)
+        await ctx.respond(
+            await self._macro_delete(
+                ctx.author.id, name, lang=lang, prefix=self.bot.config.default_prefix
+            ),
+            ephemeral=True,
+        )
+
+    @macro_slash.command(name="list", description="List your macros")
+    async def macro_list_slash(self, ctx: discord.ApplicationContext) -> None:
+        if not await self._slash_cooldown(ctx, "macro"):
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id if ctx.guild_id else None)
+        await ctx.respond(
+            self._macro_list(ctx.author.id, lang=lang, prefix=self.bot.config.default_prefix),
+            ephemeral=True,
+        )
+
+
+def setup(bot: SirrMizan) -> None:
+    bot.add_cog(MacroCog(bot))
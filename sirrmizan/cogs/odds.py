@@ -0,0 +1,155 @@
+"""Exact roll statistics: /odds."""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+import discord
+from discord.ext import commands
+
+from ..dice_parser import ParsedExpression
+from ..distribution import Distribution, DistributionTooLarge
+from ..translations import t
+from ._base import BaseCog
+
+if TYPE_CHECKING:
+    from ..bot import SirrMizan
+
+_PERCENTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+# Last term of an expression, to tell ``1d20+5>=15`` (a threshold) from
+# ``10d10>=7`` (a success-counting pool).
+_LAST_TERM_RE = re.compile(r"[^+\-]*$")
+
+
+def _split_threshold(args: str) -> tuple[str, str | None]:
+    """Split ``!odds`` arguments into the expression and the ``>=`` threshold text.
+
+    ``>=`` right after a dice term is part of the expression (``10d10>=7``)
+    unless whitespace separates them (``10d10 >= 7``).
+    """
+    expression, has_threshold, threshold = args.rpartition(">=")
+    if not has_threshold:
+        return args, None
+    last_term = _LAST_TERM_RE.search(expression)
+    is_dice = last_term is not None and "d" in last_term.group().lower()
+    if is_dice and not expression[-1:].isspace():
+        return args, None
+    return expression, threshold
+
+
+def _format_probability(p: float) -> str:
+    """Percentage with two decimals that never rounds a possible outcome to 0/100%."""
+    if 0 < p < 0.0001:
+        return "<0.01%"
+    if 0.9999 < p < 1:
+        return ">99.99%"
+    return f"{p:.2%}"
+
+
+class OddsCog(BaseCog):
+    def _build_odds_embed(
+        self,
+        expr: ParsedExpression,
+        dist: Distribution | None,
+        *,
+        expression_str: str,
+        at_least: int | None,
+        lang: str,
+    ) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"📊 {t(lang, 'odds_title')} — `{expression_str}`",
+            color=discord.Color.purple(),
+        )
+        # Range and moments come from the expression's cached statistics, so
+        # they're shown even when the full distribution is too large.
+        embed.add_field(name=t(lang, "odds_range"), value=f"{expr.minimum}..{expr.maximum}")
+        embed.add_field(name=t(lang, "odds_mean"), value=f"{expr.mean:.2f}")
+        embed.add_field(name=t(lang, "odds_stddev"), value=f"{expr.variance**0.5:.2f}")
+        if dist is None:
+            embed.add_field(
+                name=t(lang, "odds_percentiles"), value=t(lang, "odds_too_large"), inline=False
+            )
+            return embed
+        embed.add_field(
+            name=t(lang, "odds_percentiles"),
+            value=" · ".join(
+                f"{round(p * 100)}%: **{v}**"
+                for p, v in zip(_PERCENTILES, dist.percentiles(_PERCENTILES), strict=True)
+            ),
+            inline=False,
+        )
+        if at_least is not None:
+            embed.add_field(
+                name=t(lang, "odds_at_least", value=at_least),
+                value=_format_probability(dist.probability_at_least(at_least)),
+                inline=False,
+            )
+        return embed
+
+    def _odds(
+        self, expression: str, at_least: int | None, *, lang: str
+    ) -> tuple[discord.Embed | None, str | None]:
+        """Returns ``(embed, error_message)``."""
+        expr, expression_str, error = self._resolve_expression(expression, lang=lang)
+        if error is not None:
+            return None, error
+        assert expr is not None  # narrowed by error check
+        dist: Distribution | None
+        try:
+            dist = self.bot.distribution_cache.distribution(expr)
+        except DistributionTooLarge:
+            dist = None
+        return (
+            self._build_odds_embed(
+                expr, dist, expression_str=expression_str, at_least=at_least, lang=lang
+            ),
+            None,
+        )
+
+    @commands.command(name="odds")
+    @commands.cooldown(1, 3, commands.BucketType.user)
+    async def odds(self, ctx: commands.Context, *, args: str) -> None:
+        """Exact statistics for an expression. Example: ``!odds 1d20+5 >= 15``."""
+        lang = self._lang(ctx)
+        expression, threshold = _split_threshold(args)
+        at_least: int | None = None
+        if threshold is not None:
+            try:
+                at_least = int(threshold.strip())
+            except ValueError:
+                await ctx.send(t(lang, "odds_usage", prefix=self._prefix(ctx)))
+                return
+        embed, error = self._odds(expression, at_least, lang=lang)
+        if error is not None:
+            await ctx.send(error)
+            return
+        await ctx.send(embed=embed)
+
+    @discord.slash_command(name="odds", description="Exact statistics for a dice expression")
+    async def odds_slash(
+        self,
+        ctx: discord.ApplicationContext,
+        expression: discord.Option(  # type: ignore[valid-type]
+            str, description="Dice expression (e.g. 2d6+3)"
+        ),
+        at_least: discord.Option(  # type: ignore[valid-type]
+            int,
+            description="Also show the chance of rolling this total or more.",
+            required=False,
+            default=None,
+        ),
+    ) -> None:
+        if not await self._slash_cooldown(ctx, "odds"):
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id if ctx.guild_id else None)
+        embed, error = self._odds(expression, at_least, lang=lang)
+        if error is not None:
+            await ctx.respond(error, ephemeral=True)
+            return
+        await ctx.respond(embed=embed)
+
+
+def setup(bot: SirrMizan) -> None:
+    bot.add_cog(OddsCog(bot))
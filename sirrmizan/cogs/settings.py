@@ -8,7 +8,7 @@ from typing import TYPE_CHECKING
 import discord
 from discord.ext import commands
 
-from ..dice_parser import DiceParseError, parse, parse_roll_input
+from ..dice_parser import DiceParseError, parse
 from ..state import is_valid_prefix
 from ..translations import SUPPORTED_LANGUAGES, t
 from ._base import BaseCog
@@ -40,7 +40,7 @@ class SettingsCog(BaseCog):
         """Returns (normalized_expression, error_message). If error_message is
         None, the value was stored successfully."""
         cleaned = expression.strip()
-        parsed, normalized, target = parse_roll_input(cleaned)
+        parsed, normalized, target = self.bot.parse_cache.parse_roll_input(cleaned)
         if parsed is None or not parsed.has_dice:
             try:
                 parse(cleaned)
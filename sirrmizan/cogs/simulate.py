@@ -0,0 +1,218 @@
+"""Monte Carlo roll simulation: /simulate."""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+
+import discord
+from discord.ext import commands
+
+from ..simulate import (
+    MAX_TRIALS,
+    SimulationBusy,
+    SimulationFailed,
+    SimulationQueueFull,
+    SimulationResult,
+    SimulationTimeout,
+    SimulationTooLarge,
+)
+from ..translations import t
+from ._base import BaseCog
+
+if TYPE_CHECKING:
+    from ..bot import SirrMizan
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRIALS = 10_000
+_PERCENTILES = (0.1, 0.5, 0.9)
+_HISTOGRAM_BINS = 12
+_HISTOGRAM_BAR_WIDTH = 16
+_PROGRESS_INTERVAL = 2.0
+
+# ``!simulate 100000 4d6`` / ``!simulate 100k 4d6``: optional leading trial count.
+_TRIALS_RE = re.compile(r"^(\d+)([kK]?)\s+(.+)$", re.DOTALL)
+
+
+def _split_trials(args: str) -> tuple[int, str]:
+    match = _TRIALS_RE.match(args.strip())
+    if match is None:
+        return DEFAULT_TRIALS, args
+    trials = int(match.group(1)) * (1000 if match.group(2) else 1)
+    return trials, match.group(3)
+
+
+class SimulateCog(BaseCog):
+    @staticmethod
+    def _format_histogram(result: SimulationResult) -> str:
+        bins = result.histogram(_HISTOGRAM_BINS)
+        peak = max(n for _, _, n in bins) or 1
+        labels = [str(low) if low == high else f"{low}-{high}" for low, high, _ in bins]
+        width = max(map(len, labels))
+        lines = [
+            f"{label:>{width}} {'█' * round(n * _HISTOGRAM_BAR_WIDTH / peak):<{_HISTOGRAM_BAR_WIDTH}}"
+            f" {n / result.trials:.1%}"
+            for label, (_, _, n) in zip(labels, bins, strict=True)
+        ]
+        return "```\n" + "\n".join(lines) + "\n```"
+
+    def _build_result_embed(
+        self, result: SimulationResult, *, expression_str: str, lang: str
+    ) -> discord.Embed:
+        embed = discord.Embed(
+            title=f"📈 {t(lang, 'simulate_title')} — `{expression_str}` ({result.trials})",
+            color=discord.Color.purple(),
+        )
+        embed.add_field(name=t(lang, "odds_range"), value=f"{result.minimum}..{result.maximum}")
+        embed.add_field(name=t(lang, "odds_mean"), value=f"{result.mean:.2f}")
+        embed.add_field(name=t(lang, "odds_stddev"), value=f"{result.stddev:.2f}")
+        embed.add_field(
+            name=t(lang, "odds_percentiles"),
+            value=" · ".join(
+                f"{round(p * 100)}%: **{v}**"
+                for p, v in zip(_PERCENTILES, result.percentiles(_PERCENTILES), strict=True)
+            ),
+            inline=False,
+        )
+        embed.add_field(
+            name=t(lang, "simulate_histogram"),
+            value=self._format_histogram(result),
+            inline=False,
+        )
+        return embed
+
+    async def _simulate(
+        self,
+        *,
+        author_id: int,
+        expression: str,
+        trials: int,
+        lang: str,
+        reply: Callable[[str], Awaitable[Callable[..., Awaitable[object]]]],
+        send_error: Callable[[str], Awaitable[object]],
+    ) -> None:
+        """Run a simulation, editing one progress message into the result.
+
+        ``reply(content)`` sends the progress message and returns a coroutine
+        function that edits it (``edit(content=..., embed=...)``).
+        """
+        expr, expression_str, error = self._resolve_expression(expression, lang=lang)
+        if error is not None:
+            await send_error(error)
+            return
+        assert expr is not None  # narrowed by error check
+        if not 1 <= trials <= MAX_TRIALS:
+            await send_error(t(lang, "simulate_too_large", max=MAX_TRIALS))
+            return
+
+        plan = self.bot.plan_cache.plan(expr)
+        edit = await reply(
+            t(lang, "simulate_progress", trials=trials, expression=expression_str, percent=0)
+        )
+        last_update = time.monotonic()
+
+        async def on_progress(done: int, total: int) -> None:
+            nonlocal last_update
+            now = time.monotonic()
+            if done < total and now - last_update >= _PROGRESS_INTERVAL:
+                last_update = now
+                percent = done * 100 // total
+                try:
+                    await edit(
+                        content=t(
+                            lang,
+                            "simulate_progress",
+                            trials=trials,
+                            expression=expression_str,
+                            percent=percent,
+                        )
+                    )
+                except discord.HTTPException:
+                    pass  # progress is best-effort
+
+        try:
+            result = await self.bot.simulator.run(
+                plan, trials, user_id=author_id, on_progress=on_progress
+            )
+        except SimulationTooLarge:
+            await edit(content=t(lang, "simulate_too_large", max=MAX_TRIALS))
+            return
+        except SimulationBusy:
+            await edit(content=t(lang, "simulate_busy"))
+            return
+        except SimulationQueueFull:
+            await edit(content=t(lang, "simulate_queue_full"))
+            return
+        except SimulationTimeout:
+            logger.info("simulation timed out user=%s expression=%r", author_id, expression_str)
+            await edit(content=t(lang, "simulate_timeout"))
+            return
+        except SimulationFailed:
+            logger.warning(
+                "simulation worker died user=%s expression=%r", author_id, expression_str
+            )
+            await edit(content=t(lang, "simulate_failed"))
+            return
+        await edit(
+            content=None,
+            embed=self._build_result_embed(result, expression_str=expression_str, lang=lang),
+        )
+
+    @commands.command(name="simulate", aliases=["sim"])
+    @commands.cooldown(1, 5, commands.BucketType.user)
+    async def simulate(self, ctx: commands.Context, *, args: str) -> None:
+        """Roll an expression many times. Example: ``!simulate 100000 4d6+2``."""
+        lang = self._lang(ctx)
+        trials, expression = _split_trials(args)
+
+        async def reply(content: str) -> Callable[..., Awaitable[object]]:
+            message = await ctx.send(content)
+            return message.edit
+
+        await self._simulate(
+            author_id=ctx.author.id,
+            expression=expression,
+            trials=trials,
+            lang=lang,
+            reply=reply,
+            send_error=ctx.send,
+        )
+
+    @discord.slash_command(name="simulate", description="Roll an expression many times")
+    async def simulate_slash(
+        self,
+        ctx: discord.ApplicationContext,
+        expression: discord.Option(  # type: ignore[valid-type]
+            str, description="Dice expression (e.g. 4d6+2)"
+        ),
+        trials: discord.Option(  # type: ignore[valid-type]
+            int,
+            description=f"Number of rolls (default {DEFAULT_TRIALS}, max {MAX_TRIALS})",
+            required=False,
+            default=DEFAULT_TRIALS,
+        ),
+    ) -> None:
+        if not await self._slash_cooldown(ctx, "simulate", 5.0):
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id if ctx.guild_id else None)
+
+        async def reply(content: str) -> Callable[..., Awaitable[object]]:
+            await ctx.respond(content)
+            return ctx.edit
+
+        await self._simulate(
+            author_id=ctx.author.id,
+            expression=expression,
+            trials=trials,
+            lang=lang,
+            reply=reply,
+            send_error=lambda content: ctx.respond(content, ephemeral=True),
+        )
+
+
+def setup(bot: SirrMizan) -> None:
+    bot.add_cog(SimulateCog(bot))
@@ -0,0 +1,192 @@
+"""Weighted random tables per server: !table add / remove / list / show / roll."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+import discord
+from discord.ext import commands
+
+from ..tables import MAX_TABLE_DRAWS, TableError, is_valid_table_name, parse_entries
+from ..translations import t
+from ._base import BaseCog
+
+if TYPE_CHECKING:
+    from ..bot import SirrMizan
+
+logger = logging.getLogger(__name__)
+
+_DESCRIPTION_LIMIT = 4096
+# Kept free at the end of a truncated description for the "…and N more" line.
+_MORE_RESERVE = 64
+
+
+class TablesCog(BaseCog):
+    def _table_roll(
+        self, guild_id: int, name: str, count: int, *, lang: str
+    ) -> tuple[discord.Embed | None, str | None]:
+        """Draw ``count`` entries in one embed. Returns ``(embed, error_message)``."""
+        name = name.lower()
+        if not 1 <= count <= MAX_TABLE_DRAWS:
+            return None, t(lang, "table_draws_invalid", max=MAX_TABLE_DRAWS)
+        entries = self.bot.state.get_server_table(guild_id, name)
+        if entries is None:
+            return None, t(lang, "table_not_found", name=name)
+        table = self.bot.table_cache.table(guild_id, name, entries)
+        results = table.draw(self.bot.rng, count)
+        embed = discord.Embed(
+            title=f"📜 {name}" + (f" ({count})" if count > 1 else ""),
+            description=(
+                f"**{results[0]}**"
+                if count == 1
+                else "\n".join(f"{i}. **{text}**" for i, text in enumerate(results, start=1))
+            ),
+            color=discord.Color.gold(),
+        )
+        return embed, None
+
+    def _table_show(
+        self, guild_id: int, name: str, *, lang: str
+    ) -> tuple[discord.Embed | None, str | None]:
+        name = name.lower()
+        entries = self.bot.state.get_server_table(guild_id, name)
+        if entries is None:
+            return None, t(lang, "table_not_found", name=name)
+        total = sum(weight for weight, _ in entries)
+        lines = [f"`{weight / total:6.1%}` {text}" for weight, text in entries]
+        description = "\n".join(lines)
+        if len(description) > _DESCRIPTION_LIMIT:
+            shown: list[str] = []
+            size = 0
+            for line in lines:
+                size += len(line) + 1
+                if size > _DESCRIPTION_LIMIT - _MORE_RESERVE:
+                    break
+                shown.append(line)
+            more = t(lang, "table_more", count=len(lines) - len(shown))
+            description = "\n".join([*shown, more])
+        embed = discord.Embed(
+            title=f"📜 {name}", description=description, color=discord.Color.gold()
+        )
+        return embed, None
+
+    def _table_list(self, guild_id: int, *, lang: str) -> str:
+        names = self.bot.state.get_server_table_names(guild_id)
+        if not names:
+            return t(lang, "table_none")
+        return t(lang, "table_list", names=", ".join(f"`{name}`" for name in names))
+
+    async def _table_add(self, guild_id: int, name: str, text: str, *, lang: str) -> str:
+        name = name.lower()
+        if not is_valid_table_name(name):
+            return t(lang, "table_invalid_name")
+        try:
+            entries = parse_entries(text)
+            await self.bot.state.set_server_table(guild_id, name, entries)
+        except TableError as exc:
+            return t(lang, "table_invalid", error=str(exc))
+        self.bot.table_cache.invalidate(guild_id, name)
+        await self.bot.state.save()
+        return t(lang, "table_saved", name=name, count=len(entries))
+
+    async def _table_remove(self, guild_id: int, name: str, *, lang: str) -> str:
+        name = name.lower()
+        if not await self.bot.state.delete_server_table(guild_id, name):
+            return t(lang, "table_not_found", name=name)
+        self.bot.table_cache.invalidate(guild_id, name)
+        await self.bot.state.save()
+        return t(lang, "table_removed", name=name)
+
+    @commands.group(name="table", invoke_without_command=True)
+    @commands.guild_only()
+    async def table(self, ctx: commands.Context) -> None:
+        """Weighted random tables. Example: ``!table roll loot 3``."""
+        await ctx.send(t(self._lang(ctx), "table_usage", prefix=self._prefix(ctx)))
+
+    @table.command(name="add")
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    @commands.cooldown(1, 3, commands.BucketType.guild)
+    async def table_add(self, ctx: commands.Context, name: str, *, entries: str) -> None:
+        """Create or replace a table: ``!table add loot 50 Copper | 10 Silver | 1 Gem``."""
+        assert ctx.guild is not None
+        await ctx.send(await self._table_add(ctx.guild.id, name, entries, lang=self._lang(ctx)))
+
+    @table.command(name="remove", aliases=["delete"])
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    @commands.cooldown(1, 3, commands.BucketType.guild)
+    async def table_remove(self, ctx: commands.Context, name: str) -> None:
+        assert ctx.guild is not None
+        await ctx.send(await self._table_remove(ctx.guild.id, name, lang=self._lang(ctx)))
+
+    @table.command(name="list")
+    @commands.guild_only()
+    @commands.cooldown(1, 3, commands.BucketType.user)
+    async def table_list(self, ctx: commands.Context) -> None:
+        assert ctx.guild is not None
+        await ctx.send(self._table_list(ctx.guild.id, lang=self._lang(ctx)))
+
+    @table.command(name="show")
+    @commands.guild_only()
+    @commands.cooldown(1, 3, commands.BucketType.user)
+    async def table_show(self, ctx: commands.Context, name: str) -> None:
+        assert ctx.guild is not None
+        embed, error = self._table_show(ctx.guild.id, name, lang=self._lang(ctx))
+        if error is not None:
+            await ctx.send(error)
+            return
+        await ctx.send(embed=embed)
+
+    @table.command(name="roll", aliases=["r"])
+    @commands.guild_only()
+    @commands.cooldown(3, 5, commands.BucketType.user)
+    async def table_roll(self, ctx: commands.Context, name: str, count: int = 1) -> None:
+        """Draw from a table, optionally several times: ``!table roll loot 5``."""
+        assert ctx.guild is not None
+        embed, error = self._table_roll(ctx.guild.id, name, count, lang=self._lang(ctx))
+        if error is not None:
+            await ctx.send(error)
+            return
+        await ctx.send(embed=embed)
+
+    table_slash = discord.SlashCommandGroup("table", "Weighted random tables")
+
+    @table_slash.command(name="roll", description="Draw from a server table")
+    async def table_roll_slash(
+        self,
+        ctx: discord.ApplicationContext,
+        name: discord.Option(str, description="Table name"),  # type: ignore[valid-type]
+        count: discord.Option(  # type: ignore[valid-type]
+            int,
+            description=f"Number of draws (max {MAX_TABLE_DRAWS})",
+            required=False,
+            default=1,
+        ),
+    ) -> None:
+        if not await self._slash_cooldown(ctx, "table", 1.0):
+            return
+        if ctx.guild_id is None:
+            await ctx.respond(t("en", "guild_only"), ephemeral=True)
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id)
+        embed, error = self._table_roll(ctx.guild_id, name, count, lang=lang)
+        if error is not None:
+            await ctx.respond(error, ephemeral=True)
+            return
+        await ctx.respond(embed=embed)
+
+    @table_slash.command(name="list", description="List this server's tables")
+    async def table_list_slash(self, ctx: discord.ApplicationContext) -> None:
+        if not await self._slash_cooldown(ctx, "table"):
+            return
+        if ctx.guild_id is None:
+            await ctx.respond(t("en", "guild_only"), ephemeral=True)
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id)
+        await ctx.respond(self._table_list(ctx.guild_id, lang=lang), ephemeral=True)
+
+
+def setup(bot: SirrMizan) -> None:
+    bot.add_cog(TablesCog(bot))
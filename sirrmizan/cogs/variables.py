@@ -0,0 +1,122 @@
+"""Per-user variables: !var set / delete / list, used as ``@name`` in rolls."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import discord
+from discord.ext import commands
+
+from ..translations import t
+from ..variables import VariableError, is_valid_variable_name
+from ._base import BaseCog
+
+if TYPE_CHECKING:
+    from ..bot import SirrMizan
+
+
+class VariableCog(BaseCog):
+    def _invalidate(self, user_id: int) -> None:
+        """Drop every plan and macro compiled against the old values."""
+        self.bot.user_plan_cache.invalidate(user_id)
+        self.bot.macro_cache.invalidate(user_id)
+
+    async def _var_set(self, user_id: int, name: str, value: int, *, lang: str) -> str:
+        name = name.lower()
+        if not is_valid_variable_name(name):
+            return t(lang, "var_invalid_name")
+        try:
+            await self.bot.state.set_user_variable(user_id, name, value)
+        except VariableError as exc:
+            return t(lang, "var_invalid", error=str(exc))
+        self._invalidate(user_id)
+        await self.bot.state.save()
+        return t(lang, "var_saved", name=name, value=value)
+
+    async def _var_delete(self, user_id: int, name: str, *, lang: str, prefix: str) -> str:
+        name = name.lower()
+        if not await self.bot.state.delete_user_variable(user_id, name):
+            return t(lang, "var_not_found", name=name, prefix=prefix)
+        self._invalidate(user_id)
+        await self.bot.state.save()
+        return t(lang, "var_deleted", name=name)
+
+    def _var_list(self, user_id: int, *, lang: str, prefix: str) -> str:
+        variables = self.bot.state.get_user_variables(user_id)
+        if not variables:
+            return t(lang, "var_none", prefix=prefix)
+        lines = [f"`@{name}` = `{variables[name]}`" for name in sorted(variables)]
+        return "\n".join([t(lang, "var_list"), *lines])
+
+    @commands.group(name="var", invoke_without_command=True)
+    @commands.cooldown(1, 3, commands.BucketType.user)
+    async def var(self, ctx: commands.Context) -> None:
+        """Roll variables. Example: ``!var set str 3``, then ``!roll 1d20+@str``."""
+        await ctx.send(t(self._lang(ctx), "var_usage", prefix=self._prefix(ctx)))
+
+    @var.command(name="set")
+    @commands.cooldown(2, 3, commands.BucketType.user)
+    async def var_set(self, ctx: commands.Context, name: str, value: int) -> None:
+        await ctx.send(await self._var_set(ctx.author.id, name, value, lang=self._lang(ctx)))
+
+    @var.command(name="delete", aliases=["remove"])
+    @commands.cooldown(1, 3, commands.BucketType.user)
+    async def var_delete(self, ctx: commands.Context, name: str) -> None:
+        await ctx.send(
+            await self._var_delete(
+                ctx.author.id, name, lang=self._lang(ctx), prefix=self._prefix(ctx)
+            )
+        )
+
+    @var.command(name="list")
+    @commands.cooldown(1, 3, commands.BucketType.user)
+    async def var_list(self, ctx: commands.Context) -> None:
+        await ctx.send(
+            self._var_list(ctx.author.id, lang=self._lang(ctx), prefix=self._prefix(ctx))
+        )
+
+    var_slash = discord.SlashCommandGroup("var", "Your roll variables, used as @name in /roll")
+
+    @var_slash.command(name="set", description="Set one of your roll variables")
+    async def var_set_slash(
+        self,
+        ctx: discord.ApplicationContext,
+        name: discord.Option(str, description="Variable name"),  # type: ignore[valid-type]
+        value: discord.Option(int, description="Integer value"),  # type: ignore[valid-type]
+    ) -> None:
+        if not await self._slash_cooldown(ctx, "var"):
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id if ctx.guild_id else None)
+        await ctx.respond(
+            await self._var_set(ctx.author.id, name, value, lang=lang), ephemeral=True
+        )
+
+    @var_slash.command(name="delete", description="Delete one of your roll variables")
+    async def var_delete_slash(
+        self,
+        ctx: discord.ApplicationContext,
+        name: discord.Option(str, description="Variable name"),  # type: ignore[valid-type]
+    ) -> None:
+        if not await self._slash_cooldown(ctx, "var"):
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id if ctx.guild_id else None)
+        await ctx.respond(
+            await self._var_delete(
+                ctx.author.id, name, lang=lang, prefix=self.bot.config.default_prefix
+            ),
+            ephemeral=True,
+        )
+
+    @var_slash.command(name="list", description="List your roll variables")
+    async def var_list_slash(self, ctx: discord.ApplicationContext) -> None:
+        if not await self._slash_cooldown(ctx, "var"):
+            return
+        lang = self.bot.state.get_server_language(ctx.guild_id if ctx.guild_id else None)
+        await ctx.respond(
+            self._var_list(ctx.author.id, lang=lang, prefix=self.bot.config.default_prefix),
+            ephemeral=True,
+        )
+
+
+def setup(bot: SirrMizan) -> None:
+    bot.add_cog(VariableCog(bot))
@@ -14,6 +14,9 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
+from .rng import RNG_BACKENDS
+from .storage import STORAGE_BACKENDS
+
 
 class ConfigError(RuntimeError):
     """Raised when the runtime configuration is invalid or incomplete."""
@@ -27,6 +30,11 @@ class Config:
     log_dir: Path
     save_interval: float
     log_level: str
+    parse_cache_size: int
+    rng_backend: str
+    storage_backend: str
+    user_roll_budget: int
+    guild_roll_budget: int
 
 
 def _read_legacy_config(path: Path) -> dict[str, object]:
@@ -42,6 +50,17 @@ def _read_legacy_config(path: Path) -> dict[str, object]:
     return data
 
 
+def _read_budget(name: str, default: int) -> int:
+    raw = os.environ.get(name, str(default))
+    try:
+        value = int(raw)
+    except ValueError as exc:
+        raise ConfigError(f"{name} must be an integer, got {raw!r}") from exc
+    if value < 0:
+        raise ConfigError(f"{name} must be >= 0 (0 disables the limit)")
+    return value
+
+
 def load_config(env_file: Path | None = None) -> Config:
     """Load configuration from environment, ``.env``, and a legacy ``config.json``.
 
@@ -95,6 +114,33 @@ def load_config(env_file: Path | None = None) -> Config:
     if log_level not in {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}:
         raise ConfigError(f"Invalid SIRRMIZAN_LOG_LEVEL: {log_level!r}")
 
+    raw_cache_size = os.environ.get("SIRRMIZAN_PARSE_CACHE_SIZE", "1024")
+    try:
+        parse_cache_size = int(raw_cache_size)
+    except ValueError as exc:
+        raise ConfigError(
+            f"SIRRMIZAN_PARSE_CACHE_SIZE must be an integer, got {raw_cache_size!r}"
+        ) from exc
+    if parse_cache_size < 0:
+        raise ConfigError("SIRRMIZAN_PARSE_CACHE_SIZE must be >= 0 (0 disables the cache)")
+
+    rng_backend = os.environ.get("SIRRMIZAN_RNG_BACKEND", "system").strip().lower()
+    if rng_backend not in RNG_BACKENDS:
+        raise ConfigError(
+            f"Invalid SIRRMIZAN_RNG_BACKEND: {rng_backend!r} (choose from {', '.join(RNG_BACKENDS)})"
+        )
+
+    storage_backend = os.environ.get("SIRRMIZAN_STORAGE_BACKEND", "json").strip().lower()
+    if storage_backend not in STORAGE_BACKENDS:
+        raise ConfigError(
+            f"Invalid SIRRMIZAN_STORAGE_BACKEND: {storage_backend!r} "
+            f"(choose from {', '.join(STORAGE_BACKENDS)})"
+        )
+
+    # Roll cost units per minute (see dice_parser.RollCost); 1d20 costs ~75.
+    user_roll_budget = _read_budget("SIRRMIZAN_USER_ROLL_BUDGET", 20_000)
+    guild_roll_budget = _read_budget("SIRRMIZAN_GUILD_ROLL_BUDGET", 100_000)
+
     data_dir.mkdir(parents=True, exist_ok=True)
     log_dir.mkdir(parents=True, exist_ok=True)
     # Tighten permissions on POSIX (no-op on Windows). Stats and prefs are
@@ -112,4 +158,9 @@ def load_config(env_file: Path | None = None) -> Config:
         log_dir=log_dir,
         save_interval=save_interval,
         log_level=log_level,
+        parse_cache_size=parse_cache_size,
+        rng_backend=rng_backend,
+        storage_backend=storage_backend,
+        user_roll_budget=user_roll_budget,
+        guild_roll_budget=guild_roll_budget,
     )
@@ -0,0 +1,126 @@
+"""Card decks drawn without replacement.
+
+A ``Deck`` is a permutation of its card indexes in an ``array`` plus a
+cursor: cards before the cursor have been drawn. Drawing advances the
+cursor (O(1) per card) and shuffling is one Fisher-Yates pass over the
+whole array with the bot's RNG, which also puts drawn cards back.
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Any
+
+from .rng import Rng
+
+MAX_DECK_DRAWS = 20
+
+_RANKS = ("A", *map(str, range(2, 11)), "J", "Q", "K")
+_SUITS = ("♠", "♥", "♦", "♣")
+_PLAYING_CARDS = tuple(f"{rank}{suit}" for suit in _SUITS for rank in _RANKS)
+_MAJOR_ARCANA = (
+    "The Fool",
+    "The Magician",
+    "The High Priestess",
+    "The Empress",
+    "The Emperor",
+    "The Hierophant",
+    "The Lovers",
+    "The Chariot",
+    "Strength",
+    "The Hermit",
+    "Wheel of Fortune",
+    "Justice",
+    "The Hanged Man",
+    "Death",
+    "Temperance",
+    "The Devil",
+    "The Tower",
+    "The Star",
+    "The Moon",
+    "The Sun",
+    "Judgement",
+    "The World",
+)
+_MINOR_RANKS = ("Ace", *map(str, range(2, 11)), "Page", "Knight", "Queen", "King")
+_TAROT_SUITS = ("Wands", "Cups", "Swords", "Pentacles")
+
+DECK_KINDS: dict[str, tuple[str, ...]] = {
+    "standard": _PLAYING_CARDS,
+    "jokers": (*_PLAYING_CARDS, "🃏 Joker", "🃏 Joker"),
+    "tarot": (
+        *_MAJOR_ARCANA,
+        *(f"{rank} of {suit}" for suit in _TAROT_SUITS for rank in _MINOR_RANKS),
+    ),
+}
+DEFAULT_DECK_KIND = "standard"
+
+
+class DeckError(ValueError):
+    """Unknown deck kind, or more cards asked for than are left."""
+
+
+@dataclass(slots=True)
+class Deck:
+    kind: str
+    order: array[int]  # permutation of card indexes
+    cursor: int = 0  # cards before it have been drawn
+
+    @classmethod
+    def new(cls, kind: str, rng: Rng) -> Deck:
+        """A freshly shuffled deck. Raises DeckError for an unknown kind."""
+        if kind not in DECK_KINDS:
+            raise DeckError(f"unknown deck {kind!r}")
+        deck = cls(kind, array("H", range(len(DECK_KINDS[kind]))))
+        deck.shuffle(rng)
+        return deck
+
+    @property
+    def size(self) -> int:
+        return len(self.order)
+
+    @property
+    def remaining(self) -> int:
+        return len(self.order) - self.cursor
+
+    def card_name(self, card: int) -> str:
+        return DECK_KINDS[self.kind][card]
+
+    def shuffle(self, rng: Rng) -> None:
+        """Put every card back and shuffle (Fisher-Yates)."""
+        order = self.order
+        for i in range(len(order) - 1, 0, -1):
+            j = rng.randbelow(i + 1)
+            order[i], order[j] = order[j], order[i]
+        self.cursor = 0
+
+    def draw(self, count: int = 1) -> list[int]:
+        """Draw ``count`` cards off the top. Raises DeckError if too few are left."""
+        if count > self.remaining:
+            raise DeckError(f"only {self.remaining} cards left")
+        start = self.cursor
+        self.cursor = start + count
+        return self.order[start : self.cursor].tolist()
+
+    def to_json(self) -> dict[str, Any]:
+        return {"kind": self.kind, "order": self.order.tolist(), "cursor": self.cursor}
+
+    @classmethod
+    def from_json(cls, data: object) -> Deck | None:
+        """Rebuild a stored deck; None if it is malformed."""
+        if not isinstance(data, dict):
+            return None
+        kind, order, cursor = data.get("kind"), data.get("order"), data.get("cursor")
+        if not isinstance(kind, str) or kind not in DECK_KINDS:
+            return None
+        size = len(DECK_KINDS[kind])
+        if not (
+            isinstance(order, list)
+            and all(isinstance(card, int) and not isinstance(card, bool) for card in order)
+            and sorted(order) == list(range(size))
+        ):
+            return None
+        if not isinstance(cursor, int) or isinstance(cursor, bool) or not 0 <= cursor <= size:
+            return None
+        return cls(kind, array("H", order), cursor)
@@ -3,44 +3,195 @@
 Grammar:
 
     expression  := term (sign term)*
-    term        := signed_dice | signed_int
-    signed_dice := [+-]? UINT 'd' UINT
+    term        := signed_dice | signed_int | signed_var
+    signed_dice := [+-]? UINT 'd' UINT dice_op?
     signed_int  := [+-]? UINT
+    signed_var  := [+-]? '@' NAME                          variable (constant)
+    dice_op     := ('k' | 'kh' | 'kl' | 'dh' | 'dl') UINT   keep / drop
+                 | '!'                                    explode
+                 | 'r' UINT                               reroll
+                 | ('>=' | '<=' | '>' | '<' | '=') UINT    count successes
+
+Letters are case-insensitive. A dice term takes at most one op; ops are
+parsed into ``Keep`` / ``Explode`` / ``Reroll`` / ``Count`` nodes on the
+``DicePart``. A counted term is worth its number of successes, not its sum.
+
+``@name`` is replaced by the caller-supplied variable's value while
+scanning, so it lands in ``modifiers`` like any other constant. Results
+that used variables depend on them: they must not be cached by input text
+alone (``ParseCache`` is only for variable-free input).
 
 ``parse_roll_input`` is the higher-level wrapper for !roll — splits
 free-form input into expression + optional target name and tolerates
-spaces around operators.
+spaces around operators. ``split_roll_batch`` splits multi-roll input
+(``6x 4d6``, ``1d20+5 Sword; 2d6+3 Damage``) into such inputs first.
+
+``ParsedExpression.stats`` holds the expression's range, mean, variance
+and ``RollCost`` (RNG draws, rendered size), computed on first access and
+then kept on the instance, so everything downstream of the parse cache
+(renderer, audit, admission) reads them without recomputing.
+
+``ParseCache`` puts a bounded LRU in front of both functions; the bot keeps
+one instance so hot expressions like ``1d20`` are parsed once.
 """
 
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+import string
+from collections.abc import Mapping
+from dataclasses import dataclass, field
 
-MAX_ROLLS_PER_TERM = 50
+from .cache import CacheStats, LRUCache
+
+MAX_ROLLS_PER_TERM = 10000
+# Terms with more dice than this are sampled as a total plus face counts
+# instead of one value per die (see ``engine``).
+MAX_ITEMIZED_ROLLS = 50
 MAX_FACES = 99999
-MAX_EXPRESSION_LENGTH = 100
+MAX_EXPRESSION_LENGTH = 200
+MAX_BATCH_ROLLS = 20
+# Each die explodes (rolls again on its highest face) at most this many times.
+MAX_EXPLOSION_DEPTH = 10
+DEFAULT_CACHE_SIZE = 1024
+
+# ``6x 4d6`` / ``6x4d6``: a repeat count glued to an ``x``, then the roll.
+# ``5x`` on its own or ``5xGoblin`` stay ordinary (target) input.
+_REPEAT_RE = re.compile(r"(\d+)[xX](?=[\s\d+-])")
+# ``[[1d20+5]]`` in a chat message.
+_INLINE_ROLL_RE = re.compile(rf"\[\[([^\[\]]{{1,{MAX_EXPRESSION_LENGTH}}})\]\]")
 
-# A token starting with `+`, `-`, or no sign at all (only allowed as the very
-# first token). Either ``NdM`` (dice) or ``N`` (constant modifier).
-_PIECE_RE = re.compile(r"(?P<dice>[+-]?\d+[dD]\d+)|(?P<mod>[+-]?\d+)")
+# First characters of a dice op (``kh3``, ``dl1``, ``!``, ``r1``, ``>=7``).
+_OP_CHARS = frozenset("kKdDrR!<>=")
+_VARIABLE_CHARS = frozenset(string.ascii_letters + string.digits + "_")
+
+# Fast path for the scanner; other Unicode decimals go through str.isdecimal.
+_ASCII_DIGITS = {c: i for i, c in enumerate("0123456789")}
 
 
 class DiceParseError(ValueError):
     """Raised when an expression cannot be parsed."""
 
 
+@dataclass(frozen=True, slots=True)
+class Keep:
+    """``khN`` / ``klN`` keep, ``dhN`` / ``dlN`` drop the N highest / lowest dice."""
+
+    count: int
+    highest: bool
+    drop: bool = False
+
+    def kept(self, rolls: int) -> tuple[int, bool]:
+        """``(dice kept, whether they're the highest)`` out of ``rolls``."""
+        if self.drop:
+            return rolls - self.count, not self.highest
+        return self.count, self.highest
+
+    def __str__(self) -> str:
+        return f"{'d' if self.drop else 'k'}{'h' if self.highest else 'l'}{self.count}"
+
+
+@dataclass(frozen=True, slots=True)
+class Explode:
+    """``!``: a die showing its highest face is rolled again and added."""
+
+    def __str__(self) -> str:
+        return "!"
+
+
+@dataclass(frozen=True, slots=True)
+class Reroll:
+    """``rN``: dice showing N or less are rerolled once."""
+
+    at_most: int
+
+    def __str__(self) -> str:
+        return f"r{self.at_most}"
+
+
+@dataclass(frozen=True, slots=True)
+class Count:
+    """``>=N``, ``<=N``, ``>N``, ``<N``, ``=N``: count the dice that compare true."""
+
+    compare: str
+    target: int
+
+    def successes(self, faces: int) -> int:
+        """How many of the faces ``1..faces`` are a success."""
+        target = self.target
+        if self.compare == ">=":
+            return max(0, faces - target + 1)
+        if self.compare == ">":
+            return max(0, faces - target)
+        if self.compare == "<=":
+            return min(faces, target)
+        if self.compare == "<":
+            return min(faces, target - 1)
+        return 1 if 1 <= target <= faces else 0
+
+    def __str__(self) -> str:
+        return f"{self.compare}{self.target}"
+
+
+DiceOp = Keep | Explode | Reroll | Count
+
+
 @dataclass(frozen=True, slots=True)
 class DicePart:
     rolls: int
     faces: int
     sign: int  # +1 or -1
+    op: DiceOp | None = None
+
+
+# Largest die that gets a face histogram on aggregated terms.
+MAX_HISTOGRAM_FACES = 20
+# An aggregated pool is sampled by face counts (O(faces) binomial draws)
+# once it holds at least this many dice per face; below that, rolling each
+# die in one ``Rng.roll`` call is cheaper.
+DICE_PER_FACE_FOR_COUNTS = 8
+
+# Cost model weights, in units of one die drawn by ``Rng.roll``.
+_BINOMIAL_UNITS = 4  # one binomial sample
+_CHAR_UNITS = 1  # one rendered character
+_FIELD_UNITS = 50  # one embed field
+_HISTOGRAM_LINE_CHARS = 24
+
+
+def samples_face_counts(rolls: int, faces: int) -> bool:
+    """Whether an aggregated term is drawn as face counts rather than dice."""
+    return faces * DICE_PER_FACE_FOR_COUNTS <= rolls
+
+
+@dataclass(frozen=True, slots=True)
+class RollCost:
+    draws: int  # RNG work, in dice-drawn units
+    chars: int  # approximate rendered characters
+    fields: int  # embed fields
+
+    @property
+    def units(self) -> int:
+        return self.draws + _CHAR_UNITS * self.chars + _FIELD_UNITS * self.fields
+
+
+@dataclass(frozen=True, slots=True)
+class ExpressionStats:
+    minimum: int
+    maximum: int
+    mean: float
+    variance: float
+    modifier_total: int
+    cost: RollCost
 
 
 @dataclass(frozen=True, slots=True)
 class ParsedExpression:
     dice: tuple[DicePart, ...]
     modifiers: tuple[int, ...]
+    # Filled in by the first ``stats`` access; not part of equality or hash.
+    _stats: ExpressionStats | None = field(
+        default=None, init=False, repr=False, compare=False, hash=False
+    )
 
     @property
     def has_dice(self) -> bool:
@@ -50,16 +201,422 @@ class ParsedExpression:
     def is_empty(self) -> bool:
         return not self.dice and not self.modifiers
 
+    @property
+    def stats(self) -> ExpressionStats:
+        """Range, moments and roll cost, computed on first access."""
+        stats = self._stats
+        if stats is None:
+            stats = _expression_stats(self)
+            object.__setattr__(self, "_stats", stats)
+        return stats
+
     @property
     def modifier_total(self) -> int:
-        return sum(self.modifiers)
+        return self.stats.modifier_total
+
+    @property
+    def minimum(self) -> int:
+        return self.stats.minimum
 
+    @property
+    def maximum(self) -> int:
+        return self.stats.maximum
 
-def parse(expression: str) -> ParsedExpression:
+    @property
+    def mean(self) -> float:
+        return self.stats.mean
+
+    @property
+    def variance(self) -> float:
+        return self.stats.variance
+
+    @property
+    def cost(self) -> RollCost:
+        return self.stats.cost
+
+
+def _extra_dice(part: DicePart) -> int:
+    """Expected dice ``part.op`` rolls on top of the pool (rounded up)."""
+    if isinstance(part.op, Reroll):
+        return -(-part.rolls * part.op.at_most // part.faces)
+    if isinstance(part.op, Explode):
+        return -(-part.rolls // (part.faces - 1))
+    return 0
+
+
+def _term_cost(part: DicePart) -> RollCost:
+    label_chars = len(str(part.rolls)) + len(str(part.faces)) + len(str(part.op or "")) + 12
+    if isinstance(part.op, Count):
+        # One binomial draw for the whole pool; rendered as a count.
+        return RollCost(draws=_BINOMIAL_UNITS, chars=label_chars + len(str(part.rolls)), fields=0)
+    extra = _extra_dice(part)
+    if part.rolls <= MAX_ITEMIZED_ROLLS:
+        # Rerolled and dropped dice are shown too; keep/drop selects in O(n log k).
+        selection = part.rolls if isinstance(part.op, Keep) else 0
+        return RollCost(
+            draws=part.rolls + extra + selection,
+            chars=label_chars + (part.rolls + extra) * (len(str(part.faces)) + 6),
+            fields=0,
+        )
+    if samples_face_counts(part.rolls, part.faces):
+        draws = part.faces * _BINOMIAL_UNITS
+        draws += min(extra, draws)
+    else:
+        draws = part.rolls + extra
+    chars = label_chars + len(str((part.rolls + extra) * part.faces))
+    fields = 0
+    if part.faces <= MAX_HISTOGRAM_FACES:
+        chars += part.faces * _HISTOGRAM_LINE_CHARS
+        fields = 1
+    return RollCost(draws=draws, chars=chars, fields=fields)
+
+
+def estimate_cost(expr: ParsedExpression) -> RollCost:
+    """Work and output size of rolling and rendering ``expr`` once."""
+    draws = 0
+    chars = sum(len(f"{m:+d}") + 2 for m in expr.modifiers)
+    fields = bool(expr.dice) + bool(expr.modifiers)
+    for part in expr.dice:
+        term = _term_cost(part)
+        draws += term.draws
+        chars += term.chars
+        fields += term.fields
+    return RollCost(draws=draws, chars=chars, fields=fields)
+
+
+# Keep/drop moments are computed exactly while faces * kept² stays under
+# this; larger pools use the continuous order-statistics approximation.
+_KEEP_EXACT_WORK = 100_000
+
+
+def _reroll_moments(faces: int, at_most: int) -> tuple[float, float]:
+    """Mean and variance of one die rerolled once on ``at_most`` or less.
+
+    Of the faces² equally likely (first, second) pairs, value v comes up
+    ``faces`` times if v > at_most (first roll kept) plus ``at_most`` times
+    as the second roll.
+    """
+    total = faces * faces
+    sum_all = faces * (faces + 1) / 2
+    sq_all = faces * (faces + 1) * (2 * faces + 1) / 6
+    sum_low = at_most * (at_most + 1) / 2
+    sq_low = at_most * (at_most + 1) * (2 * at_most + 1) / 6
+    mean = (faces * (sum_all - sum_low) + at_most * sum_all) / total
+    square = (faces * (sq_all - sq_low) + at_most * sq_all) / total
+    return mean, square - mean * mean
+
+
+def _explode_moments(faces: int) -> tuple[float, float]:
+    """Mean and variance of one exploding die, capped at ``MAX_EXPLOSION_DEPTH``.
+
+    With Y one roll and X' the rest of the chain, X = Y + [Y = faces]·X',
+    so E[X] = E[Y] + E[X']/faces and E[X²] = E[Y²] + 2E[X'] + E[X'²]/faces.
+    """
+    die_mean = (faces + 1) / 2
+    die_square = (faces + 1) * (2 * faces + 1) / 6
+    mean, square = die_mean, die_square
+    for _ in range(MAX_EXPLOSION_DEPTH):
+        mean, square = die_mean + mean / faces, die_square + 2 * mean + square / faces
+    return mean, square - mean * mean
+
+
+def _keep_highest_moments(rolls: int, faces: int, keep: int) -> tuple[float, float]:
+    """Mean and variance of the sum of the ``keep`` highest of ``rolls`` dice."""
+    if faces * keep * keep > _KEEP_EXACT_WORK:
+        # Order statistics of uniforms: E[U(i)] = i/(n+1) and, for i <= j,
+        # Cov(U(i), U(j)) = i(n+1-j) / ((n+1)²(n+2)). A die is ceil(faces·U).
+        n = rolls
+        ranks = range(n - keep + 1, n + 1)
+        mean = faces * sum(ranks) / (n + 1) + keep / 2
+        cov = sum((2 - (i == j)) * i * (n + 1 - j) for i in ranks for j in ranks if i <= j) / (
+            (n + 1) ** 2 * (n + 2)
+        )
+        return mean, faces * faces * cov
+
+    # Walk the faces from the top. ``states[j]`` holds (P, E[S·1], E[S²·1])
+    # for "j dice are above the current face" with S their sum; the rest
+    # are uniform on 1..face, so the number on this face is Binomial(free, 1/face).
+    # Once ``keep`` dice are placed the sum is final.
+    states: list[tuple[float, float, float] | None] = [None] * keep
+    states[0] = (1.0, 0.0, 0.0)
+    mean = square = 0.0
+    for face in range(faces, 0, -1):
+        next_states: list[tuple[float, float, float] | None] = [None] * keep
+        for j, state in enumerate(states):
+            if state is None:
+                continue
+            p_state, m1, m2 = state
+            free = rolls - j
+            if face == 1:
+                pmf = [0.0] * free + [1.0]
+            else:
+                pmf = [(1 - 1 / face) ** free]
+                for c in range(free):
+                    pmf.append(pmf[-1] * (free - c) / (c + 1) / (face - 1))
+            for c in range(keep - j):
+                p = pmf[c]
+                if p:
+                    shift = c * face
+                    prev = next_states[j + c] or (0.0, 0.0, 0.0)
+                    next_states[j + c] = (
+                        prev[0] + p * p_state,
+                        prev[1] + p * (m1 + shift * p_state),
+                        prev[2] + p * (m2 + 2 * shift * m1 + shift * shift * p_state),
+                    )
+            p = max(0.0, 1.0 - sum(pmf[: keep - j]))
+            shift = (keep - j) * face
+            mean += p * (m1 + shift * p_state)
+            square += p * (m2 + 2 * shift * m1 + shift * shift * p_state)
+        states = next_states
+    return mean, square - mean * mean
+
+
+def _term_stats(part: DicePart) -> tuple[int, int, float, float]:
+    """``(minimum, maximum, mean, variance)`` of one positive dice term."""
+    rolls, faces, op = part.rolls, part.faces, part.op
+    if isinstance(op, Keep):
+        kept, highest = op.kept(rolls)
+        mean, variance = _keep_highest_moments(rolls, faces, kept)
+        if not highest:
+            # The lowest dice of a pool are the highest of its mirror image.
+            mean = kept * (faces + 1) - mean
+        return kept, kept * faces, mean, variance
+    if isinstance(op, Count):
+        # Binomial(rolls, hits / faces).
+        hits = op.successes(faces)
+        low = rolls if hits == faces else 0
+        return low, rolls, rolls * hits / faces, rolls * hits * (faces - hits) / faces**2
+    if isinstance(op, Explode):
+        mean, variance = _explode_moments(faces)
+        return rolls, rolls * faces * (MAX_EXPLOSION_DEPTH + 1), rolls * mean, rolls * variance
+    if isinstance(op, Reroll):
+        mean, variance = _reroll_moments(faces, op.at_most)
+        return rolls, rolls * faces, rolls * mean, rolls * variance
+    # Per die: range 1..f, mean (f+1)/2, variance (f²-1)/12.
+    return rolls, rolls * faces, rolls * (faces + 1) / 2, rolls * (faces * faces - 1) / 12
+
+
+def _expression_stats(expr: ParsedExpression) -> ExpressionStats:
+    modifier_total = sum(expr.modifiers)
+    minimum = maximum = modifier_total
+    mean = float(modifier_total)
+    variance = 0.0
+    for part in expr.dice:
+        low, high, term_mean, term_variance = _term_stats(part)
+        if part.sign > 0:
+            minimum += low
+            maximum += high
+        else:
+            minimum -= high
+            maximum -= low
+        mean += part.sign * term_mean
+        variance += term_variance
+    return ExpressionStats(
+        minimum=minimum,
+        maximum=maximum,
+        mean=mean,
+        variance=variance,
+        modifier_total=modifier_total,
+        cost=estimate_cost(expr),
+    )
+
+
+def _read_uint(expression: str, pos: int) -> tuple[int, int]:
+    """Read decimal digits at ``pos``; returns ``(value, end)``, end == pos if none."""
+    start = pos
+    while pos < len(expression) and expression[pos].isdecimal():
+        pos += 1
+    return (int(expression[start:pos]) if pos > start else 0), pos
+
+
+def _scan_op(
+    expression: str, start: int, pos: int, rolls: int, faces: int
+) -> tuple[DiceOp | None, int]:
+    """Read the dice op at ``pos`` of the term starting at ``start``.
+
+    Returns ``(None, pos)`` if ``pos`` doesn't start an op (a ``d`` not
+    followed by ``h``/``l`` is left for the next piece to reject).
+    """
+    ch = expression[pos].lower()
+    if ch == "!":
+        pos += 1
+        if faces < 2:
+            raise DiceParseError(f"{expression[start:pos]!r} needs dice with at least 2 faces")
+        return Explode(), pos
+
+    if ch in "<>=":
+        compare = ch + "=" if ch != "=" and expression[pos + 1 : pos + 2] == "=" else ch
+        number_start = pos + len(compare)
+        number, end = _read_uint(expression, number_start)
+        text = expression[start:end]
+        if end == number_start:
+            raise DiceParseError(f"missing target after {expression[start:number_start]!r}")
+        if not 1 <= number <= faces:
+            raise DiceParseError(f"invalid success target in {text!r} (must be 1-{faces})")
+        op = Count(compare, number)
+        if not op.successes(faces):
+            raise DiceParseError(f"{text!r} can never succeed")
+        return op, end
+
+    kind = expression[pos + 1 : pos + 2].lower()
+    if ch == "r":
+        number_start = pos + 1
+    elif ch in "kd" and kind in ("h", "l"):
+        number_start = pos + 2
+    elif ch == "k":
+        number_start = pos + 1
+    else:
+        return None, pos
+    number, end = _read_uint(expression, number_start)
+    text = expression[start:end]
+    if end == number_start:
+        raise DiceParseError(f"missing count after {expression[start:number_start]!r}")
+
+    if ch == "r":
+        if not 1 <= number < faces:
+            raise DiceParseError(
+                f"invalid reroll threshold in {text!r} (must be 1-{faces - 1})"
+                if faces > 1
+                else f"{text!r} needs dice with at least 2 faces"
+            )
+        return Reroll(number), end
+
+    if rolls > MAX_ITEMIZED_ROLLS:
+        raise DiceParseError(f"keep/drop takes at most {MAX_ITEMIZED_ROLLS} dice, got {text!r}")
+    drop = ch == "d"
+    if drop and not 1 <= number < rolls:
+        raise DiceParseError(
+            f"invalid drop count in {text!r} (must be 1-{rolls - 1})"
+            if rolls > 1
+            else f"{text!r} has no dice to drop"
+        )
+    if not drop and not 1 <= number <= rolls:
+        raise DiceParseError(f"invalid keep count in {text!r} (must be 1-{rolls})")
+    return Keep(number, highest=kind != "l", drop=drop), end
+
+
+def _scan_variable(
+    expression: str, pos: int, variables: Mapping[str, int] | None
+) -> tuple[int, int]:
+    """Read ``@name`` at ``pos``; returns ``(value, end)``."""
+    end = pos + 1
+    while end < len(expression) and expression[end] in _VARIABLE_CHARS:
+        end += 1
+    name = expression[pos + 1 : end].lower()
+    if not name:
+        raise DiceParseError(f"missing variable name at position {pos}")
+    if variables is None or name not in variables:
+        raise DiceParseError(f"unknown variable {expression[pos:end]!r}")
+    return variables[name], end
+
+
+def _scan_pieces(
+    expression: str,
+    dice: list[DicePart],
+    modifiers: list[int],
+    variables: Mapping[str, int] | None = None,
+) -> None:
+    """Append every piece of ``expression`` to ``dice`` / ``modifiers``.
+
+    Hand-written scanner: sign, count, ``d``/``D`` and face count are read
+    straight into integers in one pass over the characters, with no
+    intermediate strings. Digits are Unicode decimals (``str.isdecimal``),
+    the same set ``\\d`` matched in the regex this replaces.
+
+    The first piece may be unsigned; every later piece needs a sign.
+    ``@name`` pieces take their value from ``variables``.
+
+    Raises:
+        DiceParseError: On the first piece that doesn't match the grammar or
+            is out of range. Pieces scanned before it stay appended.
+    """
+    digit = _ASCII_DIGITS.get
+    end = len(expression)
+    pos = 0
+    first_token = True
+
+    while pos < end:
+        start = pos
+        ch = expression[pos]
+        sign = 1
+        if ch == "+" or ch == "-":
+            if ch == "-":
+                sign = -1
+            pos += 1
+
+        if pos < end and expression[pos] == "@":
+            if not first_token and start == pos:
+                raise DiceParseError(f"missing sign before variable at position {start}")
+            first_token = False
+            variable, pos = _scan_variable(expression, pos, variables)
+            modifiers.append(sign * variable)
+            continue
+
+        count = 0
+        digits_start = pos
+        while pos < end:
+            ch = expression[pos]
+            value = digit(ch)
+            if value is None:
+                if not ch.isdecimal():
+                    break
+                value = int(ch)
+            count = count * 10 + value
+            pos += 1
+        if pos == digits_start:
+            raise DiceParseError(f"unexpected character {expression[start]!r} at position {start}")
+
+        # ``NdM`` needs at least one digit after the ``d``; a bare ``5d``
+        # leaves the ``d`` to fail as the start of the next piece.
+        faces = -1
+        if pos + 1 < end and expression[pos] in "dD" and expression[pos + 1].isdecimal():
+            pos += 1
+            faces = 0
+            while pos < end:
+                ch = expression[pos]
+                value = digit(ch)
+                if value is None:
+                    if not ch.isdecimal():
+                        break
+                    value = int(ch)
+                faces = faces * 10 + value
+                pos += 1
+
+        # Non-leading tokens require an explicit sign; otherwise "2d63d6"
+        # would split into 2d6 + 3d6.
+        if not first_token and start == digits_start:
+            raise DiceParseError(
+                f"missing sign before token {expression[start:pos]!r} at position {start}"
+            )
+        first_token = False
+
+        if faces < 0:
+            modifiers.append(sign * count)
+            continue
+        if not 1 <= count <= MAX_ROLLS_PER_TERM:
+            raise DiceParseError(
+                f"invalid number of rolls in {expression[start:pos]!r} "
+                f"(must be 1-{MAX_ROLLS_PER_TERM})"
+            )
+        if not 1 <= faces <= MAX_FACES:
+            raise DiceParseError(
+                f"invalid number of faces in {expression[start:pos]!r} (must be 1-{MAX_FACES})"
+            )
+        op: DiceOp | None = None
+        if pos < end and expression[pos] in _OP_CHARS:
+            op, pos = _scan_op(expression, start, pos, count, faces)
+            if op is not None and pos < end and _scan_op(expression, start, pos, count, faces)[0]:
+                raise DiceParseError(
+                    f"only one of k/d/!/r/<>= per dice term in {expression[start:]!r}"
+                )
+        dice.append(DicePart(rolls=count, faces=faces, sign=sign, op=op))
+
+
+def parse(expression: str, variables: Mapping[str, int] | None = None) -> ParsedExpression:
     """Parse ``expression`` into structured dice parts and modifiers.
 
     Whitespace is not allowed inside the expression (caller should strip and
-    pass exactly one token).
+    pass exactly one token). ``@name`` terms are looked up in ``variables``.
 
     Raises:
         DiceParseError: For empty input, unrecognized syntax, or out-of-range
@@ -78,48 +635,7 @@ def parse(expression: str) -> ParsedExpression:
 
     dice: list[DicePart] = []
     modifiers: list[int] = []
-    pos = 0
-    first_token = True
-
-    while pos < len(expression):
-        match = _PIECE_RE.match(expression, pos)
-        if match is None or match.start() != pos:
-            raise DiceParseError(f"unexpected character {expression[pos]!r} at position {pos}")
-
-        # Non-leading tokens require an explicit sign; otherwise "2d63d6"
-        # would split into 2d6 + 3d6.
-        token_text = match.group(0)
-        if not first_token and token_text[0] not in "+-":
-            raise DiceParseError(f"missing sign before token {token_text!r} at position {pos}")
-        first_token = False
-
-        dice_token = match.group("dice")
-        mod_token = match.group("mod")
-
-        if dice_token is not None:
-            sign = -1 if dice_token.startswith("-") else 1
-            unsigned = dice_token.lstrip("+-").lower()
-            rolls_str, faces_str = unsigned.split("d")
-            rolls = int(rolls_str)
-            faces = int(faces_str)
-            if not 1 <= rolls <= MAX_ROLLS_PER_TERM:
-                raise DiceParseError(
-                    f"invalid number of rolls in {dice_token!r} (must be 1-{MAX_ROLLS_PER_TERM})"
-                )
-            if not 1 <= faces <= MAX_FACES:
-                raise DiceParseError(
-                    f"invalid number of faces in {dice_token!r} (must be 1-{MAX_FACES})"
-                )
-            dice.append(DicePart(rolls=rolls, faces=faces, sign=sign))
-        else:
-            assert mod_token is not None
-            modifiers.append(int(mod_token))
-
-        pos = match.end()
-
-    if pos != len(expression):
-        raise DiceParseError(f"trailing characters: {expression[pos:]!r}")
-
+    _scan_pieces(expression, dice, modifiers, variables)
     return ParsedExpression(dice=tuple(dice), modifiers=tuple(modifiers))
 
 
@@ -145,7 +661,7 @@ def _normalize_tokens(tokens: list[str]) -> list[str]:
         tok = tokens[i]
         next_tok = tokens[i + 1] if i + 1 < len(tokens) else ""
         if tok in ("+", "-"):
-            if next_tok and next_tok[0].isdigit():
+            if next_tok and (next_tok[0].isdigit() or next_tok[0] == "@"):
                 out.append(tok + next_tok)
                 i += 2
                 continue
@@ -157,28 +673,15 @@ def _normalize_tokens(tokens: list[str]) -> list[str]:
     return out
 
 
-def _join_expression_tokens(tokens: list[str]) -> str:
-    """Join with a synthetic '+' between unsigned non-leading tokens.
-
-    Without this, "+5" followed by "1d20" would collapse into "+51d20".
-    """
-    if not tokens:
-        return ""
-    out = tokens[0]
-    for tok in tokens[1:]:
-        if tok and tok[0] not in "+-":
-            out += "+"
-        out += tok
-    return out
-
-
 def parse_roll_input(
     raw: str,
+    variables: Mapping[str, int] | None = None,
 ) -> tuple[ParsedExpression | None, str, str | None]:
     """Split free-form roll input into (expression, expression_str, target).
 
     Picks the longest leading run of tokens that parses as an expression;
-    the rest is the target name.
+    the rest is the target name. ``@name`` terms are looked up in
+    ``variables``.
     """
     raw = (raw or "").strip()
     if not raw:
@@ -188,19 +691,34 @@ def parse_roll_input(
     if not tokens:
         return None, "", None
 
-    longest_k = 0
-    longest_expr: ParsedExpression | None = None
-    longest_str = ""
-
-    for k in range(1, len(tokens) + 1):
-        candidate = _join_expression_tokens(tokens[:k])
+    # Single pass over the tokens. Every token after the first becomes its
+    # own sign-led segment of the expression (an unsigned token gets a
+    # synthetic '+', so "+5" followed by "1d20" is "+5+1d20", not "+51d20").
+    # No segment can repair an invalid one before it, so the first token
+    # that fails to scan ends the longest valid prefix.
+    dice: list[DicePart] = []
+    modifiers: list[int] = []
+    segments: list[str] = []
+    length = 0
+    for tok in tokens:
+        segment = tok if not segments or tok[0] in "+-" else "+" + tok
+        length += len(segment)
+        if length > MAX_EXPRESSION_LENGTH:
+            break
+        dice_count, modifier_count = len(dice), len(modifiers)
         try:
-            parsed = parse(candidate)
+            _scan_pieces(tok, dice, modifiers, variables)
         except DiceParseError:
-            continue
-        longest_k = k
-        longest_expr = parsed
-        longest_str = candidate
+            del dice[dice_count:]
+            del modifiers[modifier_count:]
+            break
+        segments.append(segment)
+
+    longest_k = len(segments)
+    longest_expr: ParsedExpression | None = None
+    if longest_k:
+        longest_expr = ParsedExpression(dice=tuple(dice), modifiers=tuple(modifiers))
+    longest_str = "".join(segments)
 
     target_words = list(tokens[longest_k:])
     while target_words and target_words[0] in ("+", "-"):
@@ -210,3 +728,94 @@ def parse_roll_input(
 
     target = " ".join(target_words) if target_words else None
     return longest_expr, longest_str, target
+
+
+def split_roll_batch(raw: str) -> list[tuple[int, str]]:
+    """Split multi-roll input into ``(repeat, roll_input)`` items.
+
+    Items are separated by ``;`` and each may start with a repeat count
+    (``6x 4d6``). Input using neither form comes back as a single
+    ``(1, raw)`` item, so callers can treat every roll as a batch.
+
+    Raises:
+        DiceParseError: If a repeat count is 0 or the batch asks for more
+            than ``MAX_BATCH_ROLLS`` rolls in total.
+    """
+    raw = (raw or "").strip()
+    segments = [segment.strip() for segment in raw.split(";")]
+    segments = [segment for segment in segments if segment] or [raw]
+
+    items: list[tuple[int, str]] = []
+    total = 0
+    for segment in segments:
+        repeat = 1
+        match = _REPEAT_RE.match(segment)
+        if match is not None:
+            repeat = int(match.group(1))
+            if repeat < 1:
+                raise DiceParseError(f"invalid repeat count {repeat} (must be 1-{MAX_BATCH_ROLLS})")
+            segment = segment[match.end() :].strip()
+        total += repeat
+        if total > MAX_BATCH_ROLLS:
+            raise DiceParseError(f"too many rolls in one message (limit: {MAX_BATCH_ROLLS})")
+        items.append((repeat, segment))
+    return items
+
+
+class ParseCache:
+    """LRU cache in front of :func:`parse` and :func:`parse_roll_input`.
+
+    Keys are the raw input strings. Results are immutable so they can be
+    shared between callers. Parse errors are not cached: ``parse`` raises
+    afresh on every call with invalid input.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self._expressions: LRUCache[str, ParsedExpression] = LRUCache(maxsize)
+        self._inputs: LRUCache[str, tuple[ParsedExpression | None, str, str | None]] = LRUCache(
+            maxsize
+        )
+
+    def parse(self, expression: str) -> ParsedExpression:
+        if not isinstance(expression, str):
+            return parse(expression)
+        cached = self._expressions.get(expression)
+        if cached is None:
+            cached = parse(expression)
+            self._expressions.put(expression, cached)
+        return cached
+
+    def parse_roll_input(self, raw: str) -> tuple[ParsedExpression | None, str, str | None]:
+        key = raw or ""
+        cached = self._inputs.get(key)
+        if cached is None:
+            cached = parse_roll_input(key)
+            self._inputs.put(key, cached)
+        return cached
+
+    def clear(self) -> None:
+        self._expressions.clear()
+        self._inputs.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Combined counters of the expression and roll-input caches."""
+        return self._expressions.stats + self._inputs.stats
+
+
+def find_inline_rolls(content: str) -> list[str]:
+    """The ``[[...]]`` spans of a chat message, at most ``MAX_BATCH_ROLLS``.
+
+    Runs on every message the bot sees, so a message without ``[[`` is
+    rejected by one substring search before any regex work.
+    """
+    if "[[" not in content:
+        return []
+    spans = []
+    for match in _INLINE_ROLL_RE.finditer(content):
+        span = match.group(1).strip()
+        if span:
+            spans.append(span)
+            if len(spans) == MAX_BATCH_ROLLS:
+                break
+    return spans
@@ -0,0 +1,318 @@
+"""Exact outcome distributions of dice expressions.
+
+A ``Distribution`` holds the number of equally likely outcomes that reach
+each total, as exact integers, so means, percentiles and tail odds carry no
+sampling error. Adding a die is a sliding-window sum over the running
+counts (O(support) per die, no per-face loop); terms are combined either
+that way or by direct convolution, whichever touches fewer cells.
+
+Terms with a dice op are built separately: rerolled and exploding dice
+from their exact per-die counts (explosions capped at
+``MAX_EXPLOSION_DEPTH``, as when rolling), keep/drop by a walk over the
+faces from the top that tracks how many dice have been placed, and
+success counts as a binomial, O(rolls) whatever the pool size.
+
+``DistributionCache`` memoizes per-term ``(rolls, faces, op)`` distributions.
+Expressions whose computation would exceed ``MAX_DISTRIBUTION_WORK`` cell
+updates raise ``DistributionTooLarge`` up front instead of stalling the
+event loop.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from fractions import Fraction
+from itertools import accumulate, islice, repeat
+from math import comb
+from operator import add, sub
+
+from .cache import CacheStats, LRUCache
+from .dice_parser import (
+    MAX_EXPLOSION_DEPTH,
+    Count,
+    DiceOp,
+    DicePart,
+    Explode,
+    Keep,
+    ParsedExpression,
+    Reroll,
+)
+
+MAX_DISTRIBUTION_WORK = 1_000_000
+DEFAULT_TERM_CACHE_SIZE = 128
+
+
+class DistributionTooLarge(ValueError):
+    """Raised when an exact distribution would cost too much to compute."""
+
+
+@dataclass(frozen=True, slots=True)
+class Distribution:
+    offset: int  # smallest reachable total
+    counts: tuple[int, ...]  # counts[i] = outcomes totalling offset + i
+    outcomes: int  # sum(counts)
+
+    @property
+    def minimum(self) -> int:
+        return self.offset
+
+    @property
+    def maximum(self) -> int:
+        return self.offset + len(self.counts) - 1
+
+    @property
+    def mean(self) -> float:
+        weighted = sum(i * c for i, c in enumerate(self.counts))
+        return self.offset + weighted / self.outcomes
+
+    @property
+    def variance(self) -> float:
+        # n·Σi²c - (Σic)² is exact in integers; divide once at the end.
+        first = sum(i * c for i, c in enumerate(self.counts))
+        second = sum(i * i * c for i, c in enumerate(self.counts))
+        return (self.outcomes * second - first * first) / (self.outcomes * self.outcomes)
+
+    def probability_at_least(self, value: int) -> float:
+        index = value - self.offset
+        if index <= 0:
+            return 1.0
+        return sum(islice(self.counts, index, None)) / self.outcomes
+
+    def percentiles(self, fractions: Sequence[float]) -> list[int]:
+        """Smallest total whose cumulative probability reaches each fraction."""
+        out = [self.offset] * len(fractions)
+        cumulative = accumulate(self.counts)
+        reached = next(cumulative)
+        index = 0
+        for slot in sorted(range(len(fractions)), key=fractions.__getitem__):
+            # Compare as exact rationals: ``outcomes`` can exceed float range.
+            goal = Fraction(fractions[slot]).limit_denominator() * self.outcomes
+            while reached < goal and index < len(self.counts) - 1:
+                reached = next(cumulative)
+                index += 1
+            out[slot] = self.offset + index
+        return out
+
+
+def _add_die(counts: list[int], faces: int) -> list[int]:
+    """Convolve ``counts`` with one uniform ``1..faces`` die (offset +1).
+
+    ``new[j] = counts[j-faces+1] + ... + counts[j]`` is a difference of two
+    prefix sums, computed for every ``j`` with ``map`` instead of a loop.
+    """
+    prefix = [0] * faces
+    prefix.extend(accumulate(counts))
+    prefix.extend(repeat(prefix[-1], faces - 1))
+    return list(map(sub, islice(prefix, faces, None), prefix[: len(counts) + faces - 1]))
+
+
+def _convolve(left: Sequence[int], right: Sequence[int]) -> list[int]:
+    if len(left) < len(right):
+        left, right = right, left
+    width = len(left)
+    out = [0] * (width + len(right) - 1)
+    for i, weight in enumerate(right):
+        if weight:
+            out[i : i + width] = map(add, out[i : i + width], map(weight.__mul__, left))
+    return out
+
+
+def _die_counts(faces: int, op: Reroll | Explode) -> list[int]:
+    """Outcome counts of one rerolled or exploding die, from a total of 1."""
+    if isinstance(op, Reroll):
+        # faces² (first, second) pairs: v > at_most keeps the first roll.
+        return [faces * (value > op.at_most) + op.at_most for value in range(1, faces + 1)]
+    # Exploding: m explosions then r < faces weigh faces^(depth-m) each;
+    # the last allowed roll keeps any face.
+    counts: list[int] = []
+    for explosions in range(MAX_EXPLOSION_DEPTH):
+        counts.extend(repeat(faces ** (MAX_EXPLOSION_DEPTH - explosions), faces - 1))
+        counts.append(0)
+    counts.extend(repeat(1, faces))
+    return counts
+
+
+def _keep_highest_counts(rolls: int, faces: int, keep: int) -> list[int]:
+    """Outcome counts of the sum of the ``keep`` highest of ``rolls`` dice.
+
+    Walks the faces from the top; ``states[j][s]`` counts the ways ``j``
+    dice (fewer than ``keep``) sit above the current face with sum ``s``.
+    Once ``keep`` dice are placed their sum is final and the others only
+    need to land below the current face.
+    """
+    states: dict[int, list[int]] = {0: [1]}
+    result = [0] * (keep * faces + 1)
+    for face in range(faces, 0, -1):
+        next_states: dict[int, list[int]] = {}
+        for placed, sums in states.items():
+            free = rolls - placed
+            for here in range(keep - placed):
+                if face == 1:
+                    break  # every remaining die must land on 1: always final
+                ways = comb(free, here)
+                shift = here * face
+                target = next_states.setdefault(placed + here, [])
+                if len(target) < len(sums) + shift:
+                    target.extend(repeat(0, len(sums) + shift - len(target)))
+                for s, n in enumerate(sums, start=shift):
+                    target[s] += ways * n
+            final_ways = sum(
+                comb(free, here) * (face - 1) ** (free - here)
+                for here in range(keep - placed, free + 1)
+            )
+            shift = (keep - placed) * face
+            for s, n in enumerate(sums, start=shift):
+                result[s] += final_ways * n
+        states = next_states
+    return result[keep:]
+
+
+def _op_term(rolls: int, faces: int, op: DiceOp) -> Distribution:
+    if isinstance(op, Count):
+        # k successes: C(rolls, k) · hits^k · misses^(rolls-k) outcomes, each
+        # derived from the previous one with exact integer steps.
+        hits = op.successes(faces)
+        misses = faces - hits
+        if not misses:
+            return Distribution(rolls, (faces**rolls,), faces**rolls)
+        count = misses**rolls
+        counts = [count]
+        for k in range(rolls):
+            count = count * (rolls - k) * hits // ((k + 1) * misses)
+            counts.append(count)
+        return Distribution(0, tuple(counts), faces**rolls)
+    if isinstance(op, Keep):
+        kept, highest = op.kept(rolls)
+        counts = _keep_highest_counts(rolls, faces, kept)
+        if not highest:
+            # The lowest dice of a pool are the highest of its mirror image.
+            counts.reverse()
+        return Distribution(kept, tuple(counts), faces**rolls)
+    die = _die_counts(faces, op)
+    counts = [1]
+    for _ in range(rolls):
+        counts = _convolve(counts, die)
+    return Distribution(rolls, tuple(counts), sum(die) ** rolls)
+
+
+def _op_support(rolls: int, faces: int, op: DiceOp) -> int:
+    if isinstance(op, Count):
+        return rolls + 1
+    if isinstance(op, Keep):
+        return op.kept(rolls)[0] * (faces - 1) + 1
+    if isinstance(op, Explode):
+        return rolls * ((MAX_EXPLOSION_DEPTH + 1) * faces - 1) + 1
+    return rolls * (faces - 1) + 1
+
+
+def _op_cost(rolls: int, faces: int, op: DiceOp) -> int:
+    """Cells touched building an op term's distribution."""
+    if isinstance(op, Count):
+        return rolls + 1
+    if isinstance(op, Keep):
+        kept = op.kept(rolls)[0]
+        return faces * faces * kept**3 // 2 + faces * kept * rolls
+    die = _op_support(1, faces, op)
+    return die * die * rolls * (rolls + 1) // 2
+
+
+def _slide_cost(rolls: int, faces: int, support: int) -> int:
+    """Cells touched by adding ``rolls`` dice one at a time to ``support``."""
+    return rolls * (support + 2 * faces) + (faces - 1) * rolls * (rolls - 1) // 2
+
+
+def _largest_first(expr: ParsedExpression) -> list[DicePart]:
+    return sorted(expr.dice, key=lambda part: part.rolls * (part.faces - 1), reverse=True)
+
+
+def estimated_work(expr: ParsedExpression) -> int:
+    """Upper bound on the cell updates ``DistributionCache`` needs for ``expr``."""
+    work = 0
+    support = 1
+    for part in _largest_first(expr):
+        if part.op is None:
+            work += _slide_cost(part.rolls, part.faces, support)
+            support += part.rolls * (part.faces - 1)
+        else:
+            term_support = _op_support(part.rolls, part.faces, part.op)
+            work += _op_cost(part.rolls, part.faces, part.op) + support * term_support
+            support += term_support - 1
+    return work
+
+
+class DistributionCache:
+    """Computes expression distributions, memoizing each ``(rolls, faces, op)`` term."""
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_TERM_CACHE_SIZE,
+        max_work: int = MAX_DISTRIBUTION_WORK,
+    ) -> None:
+        self._terms: LRUCache[tuple[int, int, DiceOp | None], Distribution] = LRUCache(maxsize)
+        self._max_work = max_work
+
+    def term(self, rolls: int, faces: int, op: DiceOp | None = None) -> Distribution:
+        """Distribution of ``rolls`` dice with ``faces`` faces, after ``op``."""
+        key = (rolls, faces, op)
+        cached = self._terms.get(key)
+        if cached is None:
+            if op is not None:
+                cached = _op_term(rolls, faces, op)
+            else:
+                counts = [1]
+                for _ in range(rolls):
+                    counts = _add_die(counts, faces)
+                cached = Distribution(rolls, tuple(counts), faces**rolls)
+            self._terms.put(key, cached)
+        return cached
+
+    def distribution(self, expr: ParsedExpression) -> Distribution:
+        """Exact distribution of ``expr``'s total.
+
+        Raises:
+            DistributionTooLarge: If ``estimated_work(expr)`` exceeds the
+                cache's work budget.
+        """
+        work = estimated_work(expr)
+        if work > self._max_work:
+            raise DistributionTooLarge(
+                f"too many possible outcomes to compute exactly ({work} > {self._max_work})"
+            )
+
+        # A die is symmetric, so -XdY has XdY's counts shifted down by
+        # X·(Y+1): negative terms only move the offset.
+        offset = expr.modifier_total
+        counts: list[int] = [1]
+        outcomes = 1
+        for part in _largest_first(expr):
+            if part.op is not None:
+                term = self.term(part.rolls, part.faces, part.op)
+                term_counts: Sequence[int] = term.counts
+                if part.sign < 0:
+                    term_counts = term.counts[::-1]
+                    offset -= term.maximum
+                else:
+                    offset += term.minimum
+                counts = _convolve(counts, term_counts)
+                outcomes *= term.outcomes
+                continue
+            if part.sign < 0:
+                offset -= part.rolls * (part.faces + 1)
+            term_support = part.rolls * (part.faces - 1) + 1
+            if len(counts) * term_support <= _slide_cost(part.rolls, part.faces, len(counts)):
+                term = self.term(part.rolls, part.faces)
+                counts = _convolve(counts, term.counts)
+            else:
+                for _ in range(part.rolls):
+                    counts = _add_die(counts, part.faces)
+            offset += part.rolls
+            outcomes *= part.faces**part.rolls
+        return Distribution(offset, tuple(counts), outcomes)
+
+    def clear(self) -> None:
+        self._terms.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._terms.stats
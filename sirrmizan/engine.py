@@ -0,0 +1,232 @@
+"""Roll engine: executes compiled plans. No Discord objects.
+
+``roll_many`` rolls a batch of plans in one call. Dice are grouped by face
+count across the whole batch and each group is drawn with a single
+``Rng.roll`` call, so a multi-roll command or a load test pays the entropy
+and conversion overhead once per distinct die size rather than per term.
+
+Aggregated terms (more than ``MAX_ITEMIZED_ROLLS`` dice) never materialize
+one value per die when the pool is large relative to the die: the face
+counts are drawn directly (``rng.face_counts``) and the term reports its
+signed total plus, for small dice, a face histogram.
+
+Counted terms (``10d10>=7``) never draw dice at all: the number of
+successes is a single binomial draw (``rng.binomial``), O(1) in the pool
+size.
+
+Other dice ops run on the drawn values in place: keep/drop is a partial
+selection (``heapq.nlargest`` / ``nsmallest``, O(n log k)), rerolls and
+explosions draw only the dice they add, with one ``Rng.roll`` call per
+explosion round and at most ``MAX_EXPLOSION_DEPTH`` rounds. On
+face-counted pools they work on the counts and stay O(faces).
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from .dice_parser import (
+    MAX_EXPLOSION_DEPTH,
+    MAX_HISTOGRAM_FACES,
+    Count,
+    DiceOp,
+    Keep,
+    Reroll,
+    samples_face_counts,
+)
+from .rng import Rng, binomial, face_counts
+from .roll_plan import RollPlan
+
+
+@dataclass(frozen=True, slots=True)
+class RollResult:
+    total: int
+    # (label, signed results) per dice term, in expression order.
+    # Aggregated terms hold a single value: their signed total.
+    terms: tuple[tuple[str, tuple[int, ...]], ...]
+    modifiers: tuple[int, ...]
+    # (term index, count of each face 1..N) for aggregated terms of small dice.
+    histograms: tuple[tuple[int, tuple[int, ...]], ...] = ()
+    # (term index, unsigned values) of dice rolled but not counted: dropped
+    # by keep/drop, or replaced by a reroll.
+    dropped: tuple[tuple[int, tuple[int, ...]], ...] = ()
+    # Indexes of terms whose single value is a number of successes.
+    counted: tuple[int, ...] = ()
+
+
+def _keep_boundary(values: list[int], count: int, highest: bool) -> tuple[int, int]:
+    """Worst kept value and how many of the kept dice show it.
+
+    A bounded heap of ``count`` values (min-heap for highest, negated for
+    lowest): O(n log k), no full sort. Only the boundary is needed: every
+    value beyond it is kept, plus ``ties`` dice equal to it, in roll order.
+    """
+    if highest:
+        heap = values[:count]
+        heapq.heapify(heap)
+        for value in values[count:]:
+            if value > heap[0]:
+                heapq.heapreplace(heap, value)
+        return heap[0], heap.count(heap[0])
+    heap = [-value for value in values[:count]]
+    heapq.heapify(heap)
+    for value in values[count:]:
+        if -value > heap[0]:
+            heapq.heapreplace(heap, -value)
+    return -heap[0], heap.count(heap[0])
+
+
+def _apply_op(rng: Rng, op: DiceOp, values: list[int], faces: int) -> list[int]:
+    """Apply ``op`` to ``values`` in place; returns the discarded values."""
+    if isinstance(op, Keep):
+        boundary, ties = _keep_boundary(values, op.count, op.highest)
+        kept: list[int] = []
+        discarded: list[int] = []
+        for value in values:
+            if value == boundary and ties:
+                ties -= 1
+                kept.append(value)
+            elif value != boundary and (value > boundary) == op.highest:
+                kept.append(value)
+            else:
+                discarded.append(value)
+        values[:] = kept
+        return discarded
+    if isinstance(op, Reroll):
+        low = [i for i, value in enumerate(values) if value <= op.at_most]
+        discarded = [values[i] for i in low]
+        for i, value in zip(low, rng.roll(len(low), faces) if low else (), strict=True):
+            values[i] = value
+        return discarded
+    # Explode (counted terms never get here): each round rolls one new die
+    # per maximum in the last round.
+    hits = values.count(faces)
+    for _ in range(MAX_EXPLOSION_DEPTH):
+        if not hits:
+            break
+        extra = rng.roll(hits, faces)
+        values.extend(extra)
+        hits = extra.count(faces)
+    return []
+
+
+def _draw_counts(rng: Rng, count: int, faces: int) -> list[int]:
+    if samples_face_counts(count, faces):
+        return face_counts(rng, count, faces)
+    counts = [0] * faces
+    for value in rng.roll(count, faces):
+        counts[value - 1] += 1
+    return counts
+
+
+def _apply_op_to_counts(rng: Rng, op: DiceOp, counts: list[int]) -> None:
+    """Reroll or explode a face-counted pool in place (keep/drop never aggregates)."""
+    faces = len(counts)
+    if isinstance(op, Reroll):
+        rerolled = sum(counts[: op.at_most])
+        if rerolled:
+            counts[: op.at_most] = [0] * op.at_most
+            fresh = _draw_counts(rng, rerolled, faces)
+            counts[:] = [a + b for a, b in zip(counts, fresh, strict=True)]
+        return
+    hits = counts[-1]
+    for _ in range(MAX_EXPLOSION_DEPTH):
+        if not hits:
+            break
+        extra = _draw_counts(rng, hits, faces)
+        counts[:] = [a + b for a, b in zip(counts, extra, strict=True)]
+        hits = extra[-1]
+
+
+def _roll_aggregate(
+    rng: Rng, rolls: int, faces: int, op: DiceOp | None = None
+) -> tuple[int, tuple[int, ...] | None]:
+    """Total of ``rolls`` dice and, if ``faces`` is small, each face's count."""
+    if samples_face_counts(rolls, faces):
+        counts = face_counts(rng, rolls, faces)
+        if op is not None:
+            _apply_op_to_counts(rng, op, counts)
+        total = sum(face * n for face, n in enumerate(counts, start=1))
+        return total, tuple(counts) if faces <= MAX_HISTOGRAM_FACES else None
+
+    values = rng.roll(rolls, faces)
+    if op is not None:
+        _apply_op(rng, op, values, faces)
+    if faces > MAX_HISTOGRAM_FACES:
+        return sum(values), None
+    counts = [0] * faces
+    for value in values:
+        counts[value - 1] += 1
+    return sum(values), tuple(counts)
+
+
+def roll_many(plans: Sequence[RollPlan], rng: Rng) -> list[RollResult]:
+    """Roll every plan in ``plans``; results are in the same order."""
+    wanted: dict[int, int] = {}
+    for plan in plans:
+        for rolls, faces, aggregated, op in zip(
+            plan.rolls, plan.faces, plan.aggregated, plan.ops, strict=True
+        ):
+            if not aggregated and not isinstance(op, Count):
+                wanted[faces] = wanted.get(faces, 0) + rolls
+    pools = {faces: rng.roll(count, faces) for faces, count in wanted.items()}
+    offsets = dict.fromkeys(pools, 0)
+
+    results: list[RollResult] = []
+    for plan in plans:
+        total = plan.modifier_total
+        terms: list[tuple[str, tuple[int, ...]]] = []
+        histograms: list[tuple[int, tuple[int, ...]]] = []
+        dropped: list[tuple[int, tuple[int, ...]]] = []
+        counted: list[int] = []
+        for index, (label, rolls, faces, sign, aggregated, op) in enumerate(
+            zip(
+                plan.labels,
+                plan.rolls,
+                plan.faces,
+                plan.signs,
+                plan.aggregated,
+                plan.ops,
+                strict=True,
+            )
+        ):
+            if isinstance(op, Count):
+                successes = binomial(rng, rolls, op.successes(faces) / faces)
+                total += sign * successes
+                terms.append((label, (sign * successes,)))
+                counted.append(index)
+                continue
+            if aggregated:
+                term_total, counts = _roll_aggregate(rng, rolls, faces, op)
+                total += sign * term_total
+                terms.append((label, (sign * term_total,)))
+                if counts is not None:
+                    histograms.append((index, counts))
+                continue
+            start = offsets[faces]
+            offsets[faces] = start + rolls
+            values = pools[faces][start : start + rolls]
+            if op is not None:
+                discarded = _apply_op(rng, op, values, faces)
+                if discarded:
+                    dropped.append((index, tuple(discarded)))
+            signed = tuple(values) if sign > 0 else tuple([-v for v in values])
+            total += sum(signed)
+            terms.append((label, signed))
+        results.append(
+            RollResult(
+                total=total,
+                terms=tuple(terms),
+                modifiers=plan.modifiers,
+                histograms=tuple(histograms),
+                dropped=tuple(dropped),
+                counted=tuple(counted),
+            )
+        )
+    return results
+
+
+def roll(plan: RollPlan, rng: Rng) -> RollResult:
+    return roll_many((plan,), rng)[0]
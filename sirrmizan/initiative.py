@@ -0,0 +1,113 @@
+"""Initiative order per channel.
+
+``!init Goblin:+2 Orc:+1 Alice:+5`` rolls every combatant's d20 in a single
+``Rng.roll`` call, sorts the totals once and keeps the order in an
+``InitiativeTracker`` keyed by channel, so ``!init next`` only moves a turn
+index. Trackers live in memory: a restart ends the encounter.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from .cache import LRUCache
+from .rng import Rng
+
+MAX_COMBATANTS = 25
+MAX_INITIATIVE_MODIFIER = 99
+MAX_TRACKED_CHANNELS = 1024
+INITIATIVE_DIE = 20
+
+# ``Goblin``, ``Goblin:+2``, ``Orc:-1``: a name without spaces or ``:``.
+_COMBATANT_RE = re.compile(r"^([^\s:]{1,32})(?::([+-]?\d{1,3}))?$")
+
+
+class InitiativeError(ValueError):
+    """Malformed combatant list."""
+
+
+@dataclass(frozen=True, slots=True)
+class Combatant:
+    name: str
+    modifier: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class InitiativeEntry:
+    name: str
+    modifier: int
+    roll: int
+
+    @property
+    def total(self) -> int:
+        return self.roll + self.modifier
+
+
+def parse_combatants(text: str) -> list[Combatant]:
+    """``"Goblin:+2 Orc:+1 Alice"`` -> combatants. Raises InitiativeError."""
+    tokens = text.split()
+    if not tokens:
+        raise InitiativeError("no combatants")
+    if len(tokens) > MAX_COMBATANTS:
+        raise InitiativeError(f"too many combatants (max {MAX_COMBATANTS})")
+    combatants: list[Combatant] = []
+    for token in tokens:
+        match = _COMBATANT_RE.match(token)
+        if match is None:
+            raise InitiativeError(f"invalid combatant {token!r} (use Name:+2)")
+        modifier = int(match.group(2) or 0)
+        if abs(modifier) > MAX_INITIATIVE_MODIFIER:
+            raise InitiativeError(f"modifier out of range: {token!r}")
+        combatants.append(Combatant(match.group(1), modifier))
+    return combatants
+
+
+def roll_initiative(combatants: list[Combatant], rng: Rng) -> tuple[InitiativeEntry, ...]:
+    """Roll every combatant at once; highest total first.
+
+    Ties go to the higher modifier, then to the order they were listed in.
+    """
+    rolls = rng.roll(len(combatants), INITIATIVE_DIE)
+    entries = [
+        InitiativeEntry(c.name, c.modifier, roll) for c, roll in zip(combatants, rolls, strict=True)
+    ]
+    entries.sort(key=lambda entry: (-entry.total, -entry.modifier))
+    return tuple(entries)
+
+
+@dataclass(slots=True)
+class Initiative:
+    entries: tuple[InitiativeEntry, ...]
+    turn: int = 0  # index into entries of whoever acts now
+    round: int = 1
+
+    @property
+    def current(self) -> InitiativeEntry:
+        return self.entries[self.turn]
+
+    def advance(self) -> InitiativeEntry:
+        """Pass the turn to the next combatant, wrapping into a new round."""
+        self.turn += 1
+        if self.turn == len(self.entries):
+            self.turn = 0
+            self.round += 1
+        return self.current
+
+
+class InitiativeTracker:
+    """The running initiative of each channel (least recently used dropped first)."""
+
+    def __init__(self, maxsize: int = MAX_TRACKED_CHANNELS) -> None:
+        self._channels: LRUCache[int, Initiative] = LRUCache(maxsize)
+
+    def start(self, channel_id: int, entries: tuple[InitiativeEntry, ...]) -> Initiative:
+        initiative = Initiative(entries)
+        self._channels.put(channel_id, initiative)
+        return initiative
+
+    def get(self, channel_id: int) -> Initiative | None:
+        return self._channels.get(channel_id)
+
+    def end(self, channel_id: int) -> bool:
+        return self._channels.pop(channel_id) is not None
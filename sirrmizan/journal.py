@@ -0,0 +1,97 @@
+"""Append-only journal of changed state records (JSON lines).
+
+Each line is one record as it stood when saved: ``{"s": section, "id":
+record_id, "v": value}``, ``"v": null`` for a removed record. Replaying
+the lines in order on top of the last snapshot rebuilds the state, and a
+record's last line wins, so replaying lines the snapshot already holds is
+harmless.
+
+A save appends all of its lines with one ``write`` and one ``fsync``
+(group commit), so its cost follows the number of changed records, not the
+size of the state.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# (section, record id, record value or None)
+JournalEntry = tuple[str, str, Any]
+
+
+class Journal:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.size = 0  # bytes on disk, set by replay()
+
+    def replay(self) -> list[JournalEntry]:
+        """Read every complete entry, dropping a torn or corrupt tail from the file."""
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            self.size = 0
+            return []
+        entries: list[JournalEntry] = []
+        good = 0
+        for line in data.splitlines(keepends=True):
+            entry = _decode(line) if line.endswith(b"\n") else None
+            if entry is None:
+                logger.warning(
+                    "Journal %s: unreadable entry at byte %d, dropping the rest", self.path, good
+                )
+                with self.path.open("r+b") as handle:
+                    handle.truncate(good)
+                    os.fsync(handle.fileno())
+                break
+            entries.append(entry)
+            good += len(line)
+        self.size = good
+        return entries
+
+    def append(self, entries: Iterable[JournalEntry]) -> int:
+        """Append ``entries`` durably (one write, one fsync). Returns the bytes written."""
+        payload = b"".join(
+            json.dumps(
+                {"s": section, "id": record_id, "v": value},
+                ensure_ascii=False,
+                sort_keys=True,
+                separators=(",", ":"),
+            ).encode("utf-8")
+            + b"\n"
+            for section, record_id, value in entries
+        )
+        if not payload:
+            return 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("ab") as handle:
+            handle.write(payload)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.size += len(payload)
+        return len(payload)
+
+    def truncate(self) -> None:
+        """Empty the journal, once a snapshot holds everything in it."""
+        with self.path.open("wb") as handle:
+            os.fsync(handle.fileno())
+        self.size = 0
+
+
+def _decode(line: bytes) -> JournalEntry | None:
+    try:
+        entry = json.loads(line)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        return None
+    if not isinstance(entry, dict):
+        return None
+    section, record_id = entry.get("s"), entry.get("id")
+    if not (isinstance(section, str) and isinstance(record_id, str) and "v" in entry):
+        return None
+    return section, record_id, entry["v"]
@@ -0,0 +1,109 @@
+"""User macros: saved roll inputs kept as compiled plans.
+
+``State`` stores each user's macros as raw roll input (``1d20+7 Goblin``).
+``MacroCache`` compiles a user's macros the first time one is invoked and
+keeps them as ``{name: Macro}``, so ``!roll @atk`` is a dict lookup that
+hands a ready ``RollPlan`` to the engine: no parsing, no plan lookup.
+Saving or deleting a macro, or changing one of the owner's variables
+(which a macro may reference as ``@name``), invalidates the owner's entry.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from .cache import CacheStats, LRUCache
+from .dice_parser import MAX_EXPRESSION_LENGTH, DiceParseError, parse, parse_roll_input
+from .roll_plan import RollPlan, compile_plan
+
+MAX_MACROS_PER_USER = 25
+DEFAULT_CACHE_SIZE = 1024
+
+_NAME_PATTERN = re.compile(r"^[a-z0-9_-]{1,32}$")
+# ``@atk`` or ``@atk Orc``: a macro reference with an optional target override.
+MACRO_REF_RE = re.compile(r"^@([A-Za-z0-9_-]{1,32})(?:\s+(.+))?$", re.DOTALL)
+
+
+class MacroError(ValueError):
+    """Invalid macro name or roll input."""
+
+
+def is_valid_macro_name(name: str) -> bool:
+    return bool(_NAME_PATTERN.match(name))
+
+
+@dataclass(frozen=True, slots=True)
+class Macro:
+    plan: RollPlan
+    expression_str: str
+    target: str | None
+
+
+def compile_macro(raw: str, variables: Mapping[str, int] | None = None) -> Macro:
+    """Parse and compile a macro's roll input, resolving ``@name`` from ``variables``.
+
+    Raises:
+        MacroError: The input is too long or not a single, non-empty roll.
+    """
+    raw = raw.strip()
+    if len(raw) > MAX_EXPRESSION_LENGTH:
+        raise MacroError(f"input too long (limit: {MAX_EXPRESSION_LENGTH} characters)")
+    if ";" in raw:
+        raise MacroError("a macro holds a single roll (no ';')")
+    expr, expression_str, target = parse_roll_input(raw, variables)
+    if expr is None or expr.is_empty:
+        try:
+            parse(raw, variables)
+        except DiceParseError as exc:
+            raise MacroError(str(exc)) from None
+        raise MacroError("no dice or modifier")
+    return Macro(plan=compile_plan(expr), expression_str=expression_str, target=target)
+
+
+class MacroCache:
+    """Compiled macros per user, indexed by name."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        # A macro that no longer compiles keeps its error, reported on use.
+        self._users: LRUCache[int, dict[str, Macro | MacroError]] = LRUCache(maxsize)
+
+    def lookup(
+        self,
+        user_id: int,
+        name: str,
+        stored: Mapping[str, str],
+        variables: Mapping[str, int] | None = None,
+    ) -> Macro | None:
+        """``user_id``'s macro ``name``, or None if they have none by that name.
+
+        ``stored`` (name -> raw input) and ``variables`` are only read on a miss.
+
+        Raises:
+            MacroError: The stored macro no longer compiles, e.g. a variable
+                it uses was deleted.
+        """
+        macros = self._users.get(user_id)
+        if macros is None:
+            macros = {}
+            for macro_name, raw in stored.items():
+                try:
+                    macros[macro_name] = compile_macro(raw, variables)
+                except MacroError as exc:
+                    macros[macro_name] = exc
+            self._users.put(user_id, macros)
+        macro = macros.get(name)
+        if isinstance(macro, MacroError):
+            raise macro
+        return macro
+
+    def invalidate(self, user_id: int) -> None:
+        self._users.pop(user_id)
+
+    def clear(self) -> None:
+        self._users.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._users.stats
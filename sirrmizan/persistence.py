@@ -32,8 +32,9 @@ def read_json(path: Path, default: Any) -> Any:
         return default
 
 
-def write_json_atomic(path: Path, data: Any) -> None:
-    """Write JSON via tempfile + fsync + os.replace."""
+def write_json_atomic(path: Path, data: Any) -> int:
+    """Write JSON via tempfile + fsync + os.replace. Returns the bytes written."""
+    payload = json.dumps(data, indent=2, ensure_ascii=False, sort_keys=True).encode("utf-8")
     path.parent.mkdir(parents=True, exist_ok=True)
     fd, tmp_name = tempfile.mkstemp(
         prefix=f".{path.name}.",
@@ -42,8 +43,8 @@ def write_json_atomic(path: Path, data: Any) -> None:
     )
     tmp_path = Path(tmp_name)
     try:
-        with os.fdopen(fd, "w", encoding="utf-8") as handle:
-            json.dump(data, handle, indent=2, ensure_ascii=False, sort_keys=True)
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(payload)
             handle.flush()
             os.fsync(handle.fileno())
         os.replace(tmp_path, path)
@@ -53,3 +54,4 @@ def write_json_atomic(path: Path, data: Any) -> None:
         except OSError:
             logger.exception("Failed to remove temp file %s", tmp_path)
         raise
+    return len(payload)
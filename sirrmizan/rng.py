@@ -0,0 +1,239 @@
+"""Random number backends for dice rolls.
+
+Both backends draw from the OS CSPRNG:
+
+``system``
+    ``secrets.SystemRandom`` — one ``os.urandom`` call per integer, so a
+    ``50d99999`` term costs 50 syscalls.
+``buffered``
+    Reads entropy from ``os.urandom`` in large blocks and turns it into
+    unbiased bounded integers by rejection sampling. Buffers are discarded
+    in forked children so two processes never replay the same bytes.
+
+``face_counts`` samples how many times each face comes up in a large pool
+(a multinomial draw built from binomial draws), so a ``10000d6`` costs six
+samples instead of ten thousand.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import secrets
+import weakref
+from array import array
+from collections.abc import Callable
+from typing import Protocol
+
+RNG_BACKENDS = ("system", "buffered")
+DEFAULT_BLOCK_SIZE = 4096
+
+# array typecodes by item size, for converting whole blocks of bytes to ints
+# in C rather than calling int.from_bytes per die.
+_TYPECODES = {array(code).itemsize: code for code in ("B", "H", "I", "L", "Q")}
+_WIDTHS = sorted(_TYPECODES)
+_TWO_POW_MINUS_53 = 2.0**-53
+
+
+class Rng(Protocol):
+    def random(self) -> float:
+        """Return a float in ``[0.0, 1.0)`` with 53 random bits."""
+        ...
+
+    def randbelow(self, n: int) -> int: ...
+
+    def randint(self, a: int, b: int) -> int: ...
+
+    def roll(self, count: int, faces: int) -> list[int]:
+        """Return ``count`` independent integers in ``1..faces``."""
+        ...
+
+
+class SystemRng:
+    """One OS entropy request per integer."""
+
+    def __init__(self) -> None:
+        self._random = secrets.SystemRandom()
+
+    def random(self) -> float:
+        return self._random.random()
+
+    def randbelow(self, n: int) -> int:
+        return self._random.randrange(n)
+
+    def randint(self, a: int, b: int) -> int:
+        return self._random.randint(a, b)
+
+    def roll(self, count: int, faces: int) -> list[int]:
+        randint = self._random.randint
+        return [randint(1, faces) for _ in range(count)]
+
+
+_live_buffers: weakref.WeakSet[BufferedRng] = weakref.WeakSet()
+
+
+def _discard_buffers_after_fork() -> None:
+    for rng in list(_live_buffers):
+        rng.discard()
+
+
+if hasattr(os, "register_at_fork"):  # POSIX only; Windows never forks.
+    os.register_at_fork(after_in_child=_discard_buffers_after_fork)
+
+
+class BufferedRng:
+    """Block-buffered OS entropy with rejection sampling.
+
+    ``randbelow(n)`` draws ``(n - 1).bit_length()`` random bits and retries
+    while the value is ``>= n``, the same unbiased scheme ``secrets`` uses;
+    the bits just come out of a pre-read block instead of a fresh syscall.
+    """
+
+    def __init__(
+        self,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        entropy: Callable[[int], bytes] = os.urandom,
+    ) -> None:
+        if block_size <= 0:
+            raise ValueError(f"block_size must be positive, got {block_size}")
+        self._block_size = block_size
+        self._entropy = entropy
+        self._buffer = b""
+        self._pos = 0
+        _live_buffers.add(self)
+
+    def discard(self) -> None:
+        """Drop buffered bytes so they are never handed out."""
+        self._buffer = b""
+        self._pos = 0
+
+    def _take(self, size: int) -> bytes:
+        end = self._pos + size
+        if end > len(self._buffer):
+            remaining = self._buffer[self._pos :]
+            self._buffer = remaining + self._entropy(max(self._block_size, size))
+            self._pos = 0
+            end = size
+        chunk = self._buffer[self._pos : end]
+        self._pos = end
+        return chunk
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        size = (k + 7) // 8
+        return int.from_bytes(self._take(size), "big") >> (size * 8 - k)
+
+    def random(self) -> float:
+        return self.getrandbits(53) * _TWO_POW_MINUS_53
+
+    def randbelow(self, n: int) -> int:
+        if n <= 0:
+            raise ValueError(f"upper bound must be positive, got {n}")
+        k = (n - 1).bit_length()
+        r = self.getrandbits(k)
+        while r >= n:
+            r = self.getrandbits(k)
+        return r
+
+    def randint(self, a: int, b: int) -> int:
+        if b < a:
+            raise ValueError(f"empty range for randint({a}, {b})")
+        return a + self.randbelow(b - a + 1)
+
+    def roll(self, count: int, faces: int) -> list[int]:
+        if faces <= 0:
+            raise ValueError(f"faces must be positive, got {faces}")
+        if count == 1:
+            return [1 + self.randbelow(faces)]
+        bits = (faces - 1).bit_length()
+        width = next((size for size in _WIDTHS if size * 8 >= bits), None)
+        if width is None:
+            return [1 + self.randbelow(faces) for _ in range(count)]
+        mask = (1 << bits) - 1
+        values: list[int] = []
+        # Draw the whole batch at once and convert it in C; top up for the
+        # (at most ~50%, usually far fewer) values rejected as >= faces.
+        while len(values) < count:
+            words = array(_TYPECODES[width])
+            words.frombytes(self._take((count - len(values)) * width))
+            values.extend([v for v in map(mask.__and__, words) if v < faces])
+        return [v + 1 for v in values[:count]]
+
+
+def binomial(rng: Rng, n: int, p: float) -> int:
+    """Number of successes in ``n`` trials of probability ``p``.
+
+    Same algorithms as ``random.binomialvariate`` (3.12+), driven by ``rng``:
+    Devroye's geometric method when ``n·p < 10``, otherwise Hörmann's BTRS
+    transformed rejection. Both run in expected O(1) time for large ``n``.
+    """
+    if n < 0:
+        raise ValueError(f"n must be non-negative, got {n}")
+    if p <= 0.0 or p >= 1.0:
+        if p == 0.0:
+            return 0
+        if p == 1.0:
+            return n
+        raise ValueError(f"p must be in [0, 1], got {p}")
+    if p > 0.5:
+        return n - binomial(rng, n, 1.0 - p)
+
+    if n * p < 10.0:
+        # Count geometric gaps between successes until they pass n.
+        c = math.log1p(-p)
+        x = y = 0
+        while True:
+            y += math.floor(math.log(1.0 - rng.random()) / c) + 1
+            if y > n:
+                return x
+            x += 1
+
+    spq = math.sqrt(n * p * (1.0 - p))
+    b = 1.15 + 2.53 * spq
+    a = -0.0873 + 0.0248 * b + 0.01 * p
+    c = n * p + 0.5
+    vr = 0.92 - 4.2 / b
+    alpha = (2.83 + 5.1 / b) * spq
+    lpq = math.log(p / (1.0 - p))
+    m = math.floor((n + 1) * p)
+    h = math.lgamma(m + 1) + math.lgamma(n - m + 1)
+    while True:
+        u = rng.random() - 0.5
+        us = 0.5 - abs(u)
+        k = math.floor((2.0 * a / us + b) * u + c)
+        if k < 0 or k > n:
+            continue
+        v = rng.random()
+        if us >= 0.07 and v <= vr:
+            return k
+        v *= alpha / (a / (us * us) + b)
+        if v > 0 and math.log(v) <= h - math.lgamma(k + 1) - math.lgamma(n - k + 1) + (k - m) * lpq:
+            return k
+
+
+def face_counts(rng: Rng, count: int, faces: int) -> list[int]:
+    """How many of ``count`` fair dice show each face, ``1..faces`` in order.
+
+    A multinomial draw as a chain of binomials: face ``i`` takes its share
+    of the dice not yet assigned with probability ``1 / (faces - i)``.
+    Costs O(faces), independent of ``count``.
+    """
+    if faces <= 0:
+        raise ValueError(f"faces must be positive, got {faces}")
+    counts: list[int] = []
+    remaining = count
+    for face in range(faces - 1):
+        drawn = binomial(rng, remaining, 1.0 / (faces - face)) if remaining else 0
+        counts.append(drawn)
+        remaining -= drawn
+    counts.append(remaining)
+    return counts
+
+
+def make_rng(backend: str) -> Rng:
+    if backend == "system":
+        return SystemRng()
+    if backend == "buffered":
+        return BufferedRng()
+    raise ValueError(f"unknown RNG backend {backend!r} (choose from {', '.join(RNG_BACKENDS)})")
@@ -0,0 +1,102 @@
+"""Compiled roll plans.
+
+``compile_plan`` turns a ``ParsedExpression`` into an immutable ``RollPlan``
+once: term labels (``-3d6``), flat per-term arrays and the constant modifier
+total are precomputed, so executing a plan (see ``engine``) only draws dice
+and sums. Terms over ``MAX_ITEMIZED_ROLLS`` dice are flagged as aggregated.
+Dice ops compile to one entry per term in ``ops``; keep/drop is normalized
+to "keep the N highest/lowest", so the engine handles a single form.
+``PlanCache`` keeps compiled plans next to the parse cache.
+
+Each plan also carries its expression's ``RollCost`` (see
+``dice_parser.estimate_cost``), which ``admission`` charges against
+per-user and per-guild budgets before any dice are drawn.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .cache import CacheStats, LRUCache
+from .dice_parser import (
+    DEFAULT_CACHE_SIZE,
+    MAX_ITEMIZED_ROLLS,
+    DiceOp,
+    DicePart,
+    Keep,
+    ParsedExpression,
+    RollCost,
+)
+
+if TYPE_CHECKING:
+    from .engine import RollResult
+    from .rng import Rng
+
+
+@dataclass(frozen=True, slots=True)
+class RollPlan:
+    expression: ParsedExpression
+    labels: tuple[str, ...]
+    rolls: tuple[int, ...]
+    faces: tuple[int, ...]
+    signs: tuple[int, ...]
+    aggregated: tuple[bool, ...]
+    ops: tuple[DiceOp | None, ...]
+    modifier_total: int
+    cost: RollCost
+
+    @property
+    def modifiers(self) -> tuple[int, ...]:
+        return self.expression.modifiers
+
+    def execute(self, rng: Rng) -> RollResult:
+        """Roll this plan alone; ``engine.roll_many`` rolls several in one batch."""
+        from .engine import roll_many  # engine imports this module
+
+        return roll_many((self,), rng)[0]
+
+
+def _compile_op(part: DicePart) -> DiceOp | None:
+    if isinstance(part.op, Keep):
+        count, highest = part.op.kept(part.rolls)
+        return Keep(count, highest)
+    return part.op
+
+
+def compile_plan(expr: ParsedExpression) -> RollPlan:
+    return RollPlan(
+        expression=expr,
+        labels=tuple(
+            f"{'' if part.sign > 0 else '-'}{part.rolls}d{part.faces}{part.op or ''}"
+            for part in expr.dice
+        ),
+        rolls=tuple(part.rolls for part in expr.dice),
+        faces=tuple(part.faces for part in expr.dice),
+        signs=tuple(part.sign for part in expr.dice),
+        aggregated=tuple(part.rolls > MAX_ITEMIZED_ROLLS for part in expr.dice),
+        ops=tuple(_compile_op(part) for part in expr.dice),
+        modifier_total=expr.modifier_total,
+        cost=expr.cost,
+    )
+
+
+class PlanCache:
+    """LRU cache of compiled plans, keyed by the (hashable) parsed expression."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self._plans: LRUCache[ParsedExpression, RollPlan] = LRUCache(maxsize)
+
+    def plan(self, expr: ParsedExpression) -> RollPlan:
+        cached = self._plans.get(expr)
+        if cached is None:
+            cached = compile_plan(expr)
+            self._plans.put(expr, cached)
+        return cached
+
+    def clear(self) -> None:
+        self._plans.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._plans.stats
@@ -0,0 +1,244 @@
+"""Monte Carlo simulation of roll plans in worker processes.
+
+``Simulator.run`` splits a job into chunks of roughly ``CHUNK_DRAWS`` dice,
+runs them on a ``ProcessPoolExecutor`` and merges the per-chunk tallies as
+they complete, so the event loop only ever awaits futures and can report
+progress between chunks. A job is bounded three ways: ``MAX_TRIALS`` trials
+and ``MAX_SIMULATION_DRAWS`` dice in total, a wall-clock timeout, and one
+running job per user. Across users, at most ``MAX_QUEUED_DRAWS`` dice are
+queued or running at once.
+
+Chunks stop at the job's deadline, so a timed-out job doesn't keep the
+workers busy. A pool whose worker died (``BrokenExecutor``) is dropped and
+recreated for the next job.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import multiprocessing
+import time
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Awaitable, Callable, Sequence
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from itertools import accumulate
+
+from .engine import roll_many
+from .rng import BufferedRng, Rng
+from .roll_plan import RollPlan
+
+MAX_TRIALS = 1_000_000
+MAX_SIMULATION_DRAWS = 20_000_000
+MAX_QUEUED_DRAWS = 3 * MAX_SIMULATION_DRAWS
+CHUNK_DRAWS = 200_000
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_WORKERS = 2
+
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+class SimulationError(Exception):
+    """Base class for refused or failed simulations."""
+
+
+class SimulationTooLarge(SimulationError):
+    """The job asks for too many trials or dice."""
+
+
+class SimulationBusy(SimulationError):
+    """The user already has a simulation running."""
+
+
+class SimulationTimeout(SimulationError):
+    """The job did not finish within the timeout."""
+
+
+class SimulationQueueFull(SimulationError):
+    """Other users' jobs already hold the global draw budget."""
+
+
+class SimulationFailed(SimulationError):
+    """A worker process died; the pool is recreated for the next job."""
+
+
+# Workers are started by a clean server process (or spawned where there is
+# none) rather than forked from the bot, whose threads (save executor,
+# logging) may hold locks at fork time. They only need picklable plans.
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# One RNG per worker process, created on first use inside that process.
+_worker_rng: Rng | None = None
+# A chunk checks its deadline this many times.
+_DEADLINE_CHECKS = 8
+
+
+def _run_chunk(plan: RollPlan, trials: int, deadline: float) -> dict[int, int]:
+    """Roll ``plan`` ``trials`` times; returns ``{total: occurrences}``.
+
+    Stops early, with a partial tally, once ``time.time()`` passes ``deadline``.
+    """
+    global _worker_rng
+    if _worker_rng is None:
+        _worker_rng = BufferedRng()
+    tally: Counter[int] = Counter()
+    step = max(1, math.ceil(trials / _DEADLINE_CHECKS))
+    for start in range(0, trials, step):
+        if time.time() > deadline:
+            break
+        batch = [plan] * min(step, trials - start)
+        tally.update(result.total for result in roll_many(batch, _worker_rng))
+    return dict(tally)
+
+
+def chunk_sizes(trials: int, draws_per_trial: int) -> list[int]:
+    """Split ``trials`` into chunks of about ``CHUNK_DRAWS`` dice each."""
+    size = max(1, CHUNK_DRAWS // max(draws_per_trial, 1))
+    full, rest = divmod(trials, size)
+    return [size] * full + ([rest] if rest else [])
+
+
+@dataclass(frozen=True, slots=True)
+class SimulationResult:
+    trials: int
+    tally: dict[int, int]  # total -> occurrences
+
+    @property
+    def minimum(self) -> int:
+        return min(self.tally)
+
+    @property
+    def maximum(self) -> int:
+        return max(self.tally)
+
+    @property
+    def mean(self) -> float:
+        return sum(total * n for total, n in self.tally.items()) / self.trials
+
+    @property
+    def stddev(self) -> float:
+        mean = self.mean
+        spread = sum(n * (total - mean) ** 2 for total, n in self.tally.items())
+        return math.sqrt(spread / self.trials)
+
+    def percentiles(self, fractions: Sequence[float]) -> list[int]:
+        """Smallest observed total whose share of trials reaches each fraction."""
+        totals = sorted(self.tally)
+        cumulative = list(accumulate(self.tally[total] for total in totals))
+        last = len(totals) - 1
+        return [
+            totals[min(bisect_left(cumulative, fraction * self.trials), last)]
+            for fraction in fractions
+        ]
+
+    def histogram(self, bins: int) -> list[tuple[int, int, int]]:
+        """``(low, high, occurrences)`` over at most ``bins`` equal-width ranges."""
+        low, high = self.minimum, self.maximum
+        width = max(1, math.ceil((high - low + 1) / bins))
+        counts = [0] * math.ceil((high - low + 1) / width)
+        for total, n in self.tally.items():
+            counts[(total - low) // width] += n
+        return [
+            (low + i * width, min(high, low + (i + 1) * width - 1), n) for i, n in enumerate(counts)
+        ]
+
+
+class Simulator:
+    """Runs simulation jobs on a lazily created process pool."""
+
+    def __init__(
+        self,
+        *,
+        timeout: float = DEFAULT_TIMEOUT,
+        executor_factory: Callable[[], Executor] | None = None,
+        max_queued_draws: int = MAX_QUEUED_DRAWS,
+    ) -> None:
+        self._timeout = timeout
+        self._max_queued_draws = max_queued_draws
+        self._queued_draws = 0
+        self._executor_factory = executor_factory or partial(
+            ProcessPoolExecutor,
+            max_workers=DEFAULT_WORKERS,
+            mp_context=multiprocessing.get_context(_START_METHOD),
+        )
+        self._executor: Executor | None = None
+        self._active: set[int] = set()
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._executor_factory()
+        return self._executor
+
+    def _discard_pool(self, pool: Executor) -> None:
+        if self._executor is pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(
+        self,
+        plan: RollPlan,
+        trials: int,
+        *,
+        user_id: int,
+        on_progress: ProgressCallback | None = None,
+    ) -> SimulationResult:
+        """Simulate ``trials`` rolls of ``plan`` for ``user_id``.
+
+        ``on_progress(done, trials)`` is awaited after every chunk.
+
+        Raises:
+            SimulationTooLarge: Over ``MAX_TRIALS`` or ``MAX_SIMULATION_DRAWS``.
+            SimulationBusy: ``user_id`` already has a job running.
+            SimulationQueueFull: Running jobs hold ``MAX_QUEUED_DRAWS``.
+            SimulationTimeout: Chunks were still pending at the timeout;
+                the ones not started yet are cancelled and the running
+                ones stop at the deadline.
+            SimulationFailed: A worker process died.
+        """
+        draws = max(plan.cost.draws, 1)
+        job_draws = trials * draws
+        if not 1 <= trials <= MAX_TRIALS or job_draws > MAX_SIMULATION_DRAWS:
+            raise SimulationTooLarge(f"{trials} trials of {draws} draws is over the limit")
+        if user_id in self._active:
+            raise SimulationBusy(f"user {user_id} already has a simulation running")
+        if self._queued_draws + job_draws > self._max_queued_draws:
+            raise SimulationQueueFull(f"{self._queued_draws} draws already queued")
+
+        self._active.add(user_id)
+        self._queued_draws += job_draws
+        loop = asyncio.get_running_loop()
+        deadline = time.time() + self._timeout
+        pool = self._pool()
+        futures: list[asyncio.Future[dict[int, int]]] = []
+        tally: Counter[int] = Counter()
+        done = 0
+        try:
+            for size in chunk_sizes(trials, draws):
+                futures.append(loop.run_in_executor(pool, _run_chunk, plan, size, deadline))
+            for next_chunk in asyncio.as_completed(futures, timeout=self._timeout):
+                chunk = await next_chunk
+                tally.update(chunk)
+                done += sum(chunk.values())
+                if on_progress is not None:
+                    await on_progress(done, trials)
+            if done < trials:  # chunks cut short at the deadline
+                raise TimeoutError
+        except TimeoutError:
+            raise SimulationTimeout(f"simulation timed out after {self._timeout:.0f}s") from None
+        except BrokenExecutor:
+            self._discard_pool(pool)
+            raise SimulationFailed("a simulation worker died") from None
+        finally:
+            for future in futures:
+                future.cancel()
+            self._active.discard(user_id)
+            self._queued_draws -= job_draws
+        return SimulationResult(trials=trials, tally=dict(tally))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
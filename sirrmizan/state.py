@@ -1,16 +1,48 @@
-"""In-memory state, persisted as three JSON files."""
+"""In-memory state, persisted through a storage backend (``storage.py``).
+
+Every mutation records the user, guild or channel it touched in a
+``ChangeSet``; a save hands it to the backend, which persists what it can
+at that granularity. JSON files are rewritten per file (a deck draw never
+rewrites the preference and stats files); SQLite rows are written one by
+one.
+
+Roll counts, bumped on every roll, skip the lock: they go to a pending
+counter that ``save`` folds into the stats once it holds the lock.
+
+``save`` holds the lock only to take a snapshot: shallow copies of the
+sections, sharing their records. The write then runs with the lock
+released; a mutator that changes a record the snapshot still shares
+replaces it with a copy first (``_own``), so the snapshot stays as it was
+taken and no command waits on disk I/O.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import copy
+import dataclasses
 import logging
 import re
+import time
+from collections import Counter
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Any
 
 from . import colors
-from .persistence import read_json, write_json_atomic
+from .decks import Deck
+from .macros import MAX_MACROS_PER_USER, MacroError, is_valid_macro_name
+from .rng import Rng
+from .storage import SECTIONS, ChangeSet, JsonStorage, SaveMetrics, Storage
+from .tables import (
+    MAX_TABLES_PER_GUILD,
+    TableEntries,
+    TableError,
+    is_valid_table_name,
+    validate_entries,
+)
 from .translations import SUPPORTED_LANGUAGES
+from .variables import MAX_VARIABLES_PER_USER, VariableError, clean_variables, validate_variable
 
 logger = logging.getLogger(__name__)
 audit_logger = logging.getLogger("sirrmizan.audit")
@@ -23,47 +55,91 @@ def is_valid_prefix(prefix: str) -> bool:
     return bool(_PREFIX_PATTERN.match(prefix))
 
 
+def _clean_tables(raw: object) -> dict[str, list[list[Any]]]:
+    """Keep the well-formed tables of a stored ``{name: [[weight, text], ...]}``."""
+    if not isinstance(raw, dict):
+        return {}
+    cleaned: dict[str, list[list[Any]]] = {}
+    for name, rows in raw.items():
+        if not (isinstance(name, str) and is_valid_table_name(name) and isinstance(rows, list)):
+            continue
+        if not all(
+            isinstance(row, list)
+            and len(row) == 2
+            and isinstance(row[0], int)
+            and not isinstance(row[0], bool)
+            and isinstance(row[1], str)
+            for row in rows
+        ):
+            continue
+        try:
+            validate_entries([(weight, text) for weight, text in rows])
+        except TableError:
+            continue
+        cleaned[name] = rows
+    return cleaned
+
+
 class State:
     """Encapsulates loaded state and provides safe mutation methods."""
 
-    def __init__(self, data_dir: Path) -> None:
+    def __init__(self, data_dir: Path, storage: Storage | None = None) -> None:
         self._data_dir = data_dir
+        self._storage = storage if storage is not None else JsonStorage(data_dir)
         self._lock = asyncio.Lock()
-        self._dirty = False
-
-        self._users_path = data_dir / "user_preferences.json"
-        self._stats_path = data_dir / "user_stats.json"
-        self._servers_path = data_dir / "server_preferences.json"
+        self._changes = ChangeSet()
+        # Roll counts not yet folded into _user_stats; see increment_dice_rolls().
+        self._pending_rolls: Counter[str] = Counter()
+        # Records copied since the snapshot being written; None when no save is writing.
+        self._cow: dict[str, set[str]] | None = None
+        self._running_save: asyncio.Task[Any] | None = None
+        self._queued_save: asyncio.Task[SaveMetrics] | None = None
+        self._save_totals = SaveMetrics()
 
         self._user_preferences: dict[str, Any] = {"users": {}}
         self._user_stats: dict[str, dict[str, int]] = {}
         self._server_prefs: dict[str, dict[str, Any]] = {}
+        self._decks: dict[str, Deck] = {}
 
     def load(self) -> None:
-        """Synchronously load state from disk, sanitize, and migrate."""
-        users = read_json(self._users_path, {"users": {}})
+        """Synchronously load state from storage, sanitize, and migrate."""
+        stored = self._storage.load()
+        users = stored.users
         self._user_preferences = users if isinstance(users, dict) else {"users": {}}
 
-        stats = read_json(self._stats_path, {})
+        stats = stored.stats
         self._user_stats = stats if isinstance(stats, dict) else {}
 
-        servers = read_json(self._servers_path, {})
+        servers = stored.servers
         self._server_prefs = servers if isinstance(servers, dict) else {}
 
         self._sanitize()
         self._migrate()
+        self._load_decks(stored.decks)
+
+    def _load_decks(self, raw: object) -> None:
+        self._decks = {}
+        if not isinstance(raw, dict):
+            self._changes.mark_all("decks")
+            return
+        for cid, data in raw.items():
+            deck = Deck.from_json(data) if isinstance(cid, str) else None
+            if deck is None:
+                self._changes.mark_all("decks")
+                continue
+            self._decks[cid] = deck
 
     def _sanitize(self) -> None:
         """Drop on-disk values that don't match the expected schema."""
         raw_users = self._user_preferences.get("users")
         if not isinstance(raw_users, dict):
             self._user_preferences = {"users": {}}
-            self._dirty = True
+            self._changes.mark_all("users")
         else:
             cleaned_users: dict[str, dict[str, Any]] = {}
             for uid, prefs in raw_users.items():
                 if not (isinstance(uid, str) and isinstance(prefs, dict)):
-                    self._dirty = True
+                    self._changes.mark_all("users")
                     continue
                 clean: dict[str, Any] = {}
                 color = prefs.get("color")
@@ -73,30 +149,46 @@ class State:
                 if isinstance(compact, bool):
                     clean["compact"] = compact
                 elif "compact" in prefs:
-                    self._dirty = True
+                    self._changes.mark_all("users")
+                macros = prefs.get("macros")
+                if isinstance(macros, dict):
+                    clean_macros = {
+                        name: raw
+                        for name, raw in macros.items()
+                        if isinstance(name, str)
+                        and is_valid_macro_name(name)
+                        and isinstance(raw, str)
+                        and raw.strip()
+                    }
+                    if clean_macros:
+                        clean["macros"] = clean_macros
+                if "variables" in prefs:
+                    variables = clean_variables(prefs["variables"])
+                    if variables:
+                        clean["variables"] = variables
                 cleaned_users[uid] = clean
             if cleaned_users != raw_users:
-                self._dirty = True
+                self._changes.mark_all("users")
             self._user_preferences["users"] = cleaned_users
 
         cleaned_stats: dict[str, dict[str, int]] = {}
         for uid, entry in self._user_stats.items():
             if not (isinstance(uid, str) and isinstance(entry, dict)):
-                self._dirty = True
+                self._changes.mark_all("stats")
                 continue
             count = entry.get("dice_rolls_count", 0)
             if not isinstance(count, int) or isinstance(count, bool) or count < 0:
                 count = 0
-                self._dirty = True
+                self._changes.mark_all("stats")
             cleaned_stats[uid] = {"dice_rolls_count": count}
         if cleaned_stats != self._user_stats:
-            self._dirty = True
+            self._changes.mark_all("stats")
         self._user_stats = cleaned_stats
 
         cleaned_servers: dict[str, dict[str, Any]] = {}
         for gid, entry in self._server_prefs.items():
             if not (isinstance(gid, str) and isinstance(entry, dict)):
-                self._dirty = True
+                self._changes.mark_all("servers")
                 continue
             clean_server: dict[str, Any] = {}
             for key in ("prefix", "language", "default_roll"):
@@ -104,10 +196,14 @@ class State:
                 if isinstance(value, str):
                     clean_server[key] = value
                 elif key in entry:
-                    self._dirty = True
+                    self._changes.mark_all("servers")
+            if "tables" in entry:
+                tables = _clean_tables(entry["tables"])
+                if tables:
+                    clean_server["tables"] = tables
             cleaned_servers[gid] = clean_server
         if cleaned_servers != self._server_prefs:
-            self._dirty = True
+            self._changes.mark_all("servers")
         self._server_prefs = cleaned_servers
 
     def _migrate(self) -> None:
@@ -118,14 +214,14 @@ class State:
                 resolved = colors.resolve(color)
                 if resolved is not None and resolved != color:
                     prefs["color"] = resolved
-                    self._dirty = True
+                    self._changes.mark_all("users")
                 elif resolved is None:
                     prefs["color"] = colors.DEFAULT_COLOR
-                    self._dirty = True
+                    self._changes.mark_all("users")
 
         if "colors" in self._user_preferences:
             self._user_preferences.pop("colors", None)
-            self._dirty = True
+            self._changes.mark_all("users")
 
     @property
     def lock(self) -> asyncio.Lock:
@@ -133,20 +229,114 @@ class State:
 
     @property
     def is_dirty(self) -> bool:
-        return self._dirty
+        return bool(self._changes) or bool(self._pending_rolls)
 
-    async def save(self) -> None:
+    @property
+    def save_stats(self) -> SaveMetrics:
+        """Totals over every save since startup."""
+        return self._save_totals
+
+    async def save(self) -> SaveMetrics:
+        """Persist what changed since the last save; returns what was written.
+
+        Saves run one at a time. A save queued behind the running one takes
+        its snapshot when it starts, so it covers every change made before
+        then: later callers share it instead of queueing another.
+        """
+        if self._queued_save is None:
+            self._queued_save = asyncio.ensure_future(self._save_after(self._running_save))
+        return await asyncio.shield(self._queued_save)
+
+    async def _save_after(self, previous: asyncio.Task[Any] | None) -> SaveMetrics:
+        if previous is not None:
+            await asyncio.wait([previous])
+        self._running_save, self._queued_save = asyncio.current_task(), None
+        try:
+            metrics = await self._save_snapshot()
+        finally:
+            self._running_save = None
+        self._save_totals += metrics
+        logger.debug(
+            "saved %d records, %d bytes in %.1f ms",
+            metrics.records,
+            metrics.bytes_written,
+            metrics.seconds * 1000,
+        )
+        return metrics
+
+    def _drain_rolls(self) -> None:
+        """Fold the pending roll counts into the stats. Runs on the event loop."""
+        pending, self._pending_rolls = self._pending_rolls, Counter()
+        for uid, count in pending.items():
+            entry = self._user_stats.setdefault(uid, {})
+            entry["dice_rolls_count"] = entry.get("dice_rolls_count", 0) + count
+            self._changes.mark("stats", uid)
+
+    async def _save_snapshot(self) -> SaveMetrics:
+        async with self._lock:
+            self._drain_rolls()
+            if not self._changes:
+                return SaveMetrics()
+            changes, self._changes = self._changes, ChangeSet()
+            snapshot = self._snapshot()
+            self._cow = {section: set() for section in SECTIONS}
         # Run the synchronous fsync-heavy work in a worker thread so a slow
         # disk does not block the event loop and starve the Discord gateway
         # heartbeat task.
-        async with self._lock:
-            await asyncio.get_running_loop().run_in_executor(None, self._save_unlocked)
-
-    def _save_unlocked(self) -> None:
-        write_json_atomic(self._users_path, self._user_preferences)
-        write_json_atomic(self._stats_path, self._user_stats)
-        write_json_atomic(self._servers_path, self._server_prefs)
-        self._dirty = False
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._write, snapshot, changes
+            )
+        except BaseException:
+            self._changes.update(changes)  # retried by the next save
+            raise
+        finally:
+            self._cow = None
+
+    def _snapshot(self) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any], dict[str, Deck]]:
+        """Shallow copies of the four sections; ``_own`` keeps their records intact."""
+        users = dict(self._user_preferences)
+        users["users"] = dict(users.get("users", {}))
+        return users, dict(self._user_stats), dict(self._server_prefs), dict(self._decks)
+
+    def _write(
+        self,
+        snapshot: tuple[dict[str, Any], dict[str, Any], dict[str, Any], dict[str, Deck]],
+        changes: ChangeSet,
+    ) -> SaveMetrics:
+        start = time.perf_counter()
+        metrics = self._storage.save(*snapshot, changes)
+        return dataclasses.replace(metrics, seconds=time.perf_counter() - start)
+
+    def _own(self, section: str, records: dict[str, Any], key: str) -> Any:
+        """``records[key]`` (None if missing), safe to change in place.
+
+        While a save is writing, the first change to a record its snapshot
+        shares replaces the record with a copy.
+        """
+        record = records.get(key)
+        cow = self._cow
+        if record is not None and cow is not None and key not in cow[section]:
+            record = records[key] = copy.deepcopy(record)
+            cow[section].add(key)
+        return record
+
+    def _user_entry(self, user_id: int) -> dict[str, Any]:
+        users = self._user_preferences.setdefault("users", {})
+        prefs: dict[str, Any] | None = self._own("users", users, str(user_id))
+        if prefs is None:
+            prefs = users[str(user_id)] = {}
+        return prefs
+
+    def _server_entry(self, guild_id: int) -> dict[str, Any]:
+        entry: dict[str, Any] | None = self._own("servers", self._server_prefs, str(guild_id))
+        if entry is None:
+            entry = self._server_prefs[str(guild_id)] = {}
+        return entry
+
+    def close(self) -> None:
+        """Release the storage backend (e.g. the database connection)."""
+        self._storage.close()
 
     def get_user_color_name(self, user_id: int) -> str:
         users = self._user_preferences.get("users", {})
@@ -165,9 +355,8 @@ class State:
         if canonical is None:
             raise ValueError(f"unknown color: {color_input!r}")
         async with self._lock:
-            users = self._user_preferences.setdefault("users", {})
-            users.setdefault(str(user_id), {})["color"] = canonical
-            self._dirty = True
+            self._user_entry(user_id)["color"] = canonical
+            self._changes.mark("users", str(user_id))
         return canonical
 
     def get_user_compact(self, user_id: int) -> bool:
@@ -182,22 +371,87 @@ class State:
 
     async def set_user_compact(self, user_id: int, compact: bool) -> None:
         async with self._lock:
-            users = self._user_preferences.setdefault("users", {})
-            users.setdefault(str(user_id), {})["compact"] = bool(compact)
-            self._dirty = True
+            self._user_entry(user_id)["compact"] = bool(compact)
+            self._changes.mark("users", str(user_id))
+
+    def get_user_macros(self, user_id: int) -> Mapping[str, str]:
+        """The user's macros (name -> roll input); read-only view."""
+        users = self._user_preferences.get("users", {})
+        prefs = users.get(str(user_id), {})
+        macros = prefs.get("macros") if isinstance(prefs, dict) else None
+        return macros if isinstance(macros, dict) else {}
+
+    async def set_user_macro(self, user_id: int, name: str, raw: str) -> None:
+        """Create or replace a macro. Raises ValueError on a bad name or too many macros.
+
+        ``raw`` is stored as given; validating it as a roll is the caller's job.
+        """
+        if not is_valid_macro_name(name):
+            raise MacroError(f"invalid macro name: {name!r}")
+        async with self._lock:
+            macros = self._user_entry(user_id).setdefault("macros", {})
+            if name not in macros and len(macros) >= MAX_MACROS_PER_USER:
+                raise MacroError(f"too many macros (max {MAX_MACROS_PER_USER})")
+            macros[name] = raw
+            self._changes.mark("users", str(user_id))
+
+    async def delete_user_macro(self, user_id: int, name: str) -> bool:
+        """Remove a macro. Returns False if it did not exist."""
+        async with self._lock:
+            users = self._user_preferences.get("users", {})
+            prefs = self._own("users", users, str(user_id)) or {}
+            macros = prefs.get("macros")
+            if not isinstance(macros, dict) or macros.pop(name, None) is None:
+                return False
+            if not macros:
+                del prefs["macros"]
+            self._changes.mark("users", str(user_id))
+        return True
+
+    def get_user_variables(self, user_id: int) -> Mapping[str, int]:
+        """The user's variables (name -> value); read-only view."""
+        users = self._user_preferences.get("users", {})
+        prefs = users.get(str(user_id), {})
+        variables = prefs.get("variables") if isinstance(prefs, dict) else None
+        return variables if isinstance(variables, dict) else {}
+
+    async def set_user_variable(self, user_id: int, name: str, value: int) -> None:
+        """Create or update a variable. Raises ValueError if invalid or too many."""
+        validate_variable(name, value)
+        async with self._lock:
+            variables = self._user_entry(user_id).setdefault("variables", {})
+            if name not in variables and len(variables) >= MAX_VARIABLES_PER_USER:
+                raise VariableError(f"too many variables (max {MAX_VARIABLES_PER_USER})")
+            variables[name] = value
+            self._changes.mark("users", str(user_id))
+
+    async def delete_user_variable(self, user_id: int, name: str) -> bool:
+        """Remove a variable. Returns False if it did not exist."""
+        async with self._lock:
+            users = self._user_preferences.get("users", {})
+            prefs = self._own("users", users, str(user_id)) or {}
+            variables = prefs.get("variables")
+            if not isinstance(variables, dict) or variables.pop(name, None) is None:
+                return False
+            if not variables:
+                del prefs["variables"]
+            self._changes.mark("users", str(user_id))
+        return True
 
     def get_user_dice_count(self, user_id: int) -> int:
         entry = self._user_stats.get(str(user_id), {})
-        if not isinstance(entry, dict):
-            return 0
-        value = entry.get("dice_rolls_count", 0)
-        return int(value) if isinstance(value, int) else 0
+        value = entry.get("dice_rolls_count", 0) if isinstance(entry, dict) else 0
+        stored = int(value) if isinstance(value, int) else 0
+        return stored + self._pending_rolls[str(user_id)]
 
-    async def increment_dice_rolls(self, user_id: int) -> None:
-        async with self._lock:
-            entry = self._user_stats.setdefault(str(user_id), {})
-            entry["dice_rolls_count"] = entry.get("dice_rolls_count", 0) + 1
-            self._dirty = True
+    async def increment_dice_rolls(self, user_id: int, count: int = 1) -> None:
+        """Count ``count`` rolls for the user without taking the lock.
+
+        The count lands in ``_pending_rolls``, which ``save`` swaps out and
+        folds into the stats under the lock. Both run on the event loop with
+        no ``await`` in between, so no increment is lost or counted twice.
+        """
+        self._pending_rolls[str(user_id)] += count
 
     def get_server_prefix(self, guild_id: int, default: str) -> str:
         entry = self._server_prefs.get(str(guild_id), {})
@@ -211,8 +465,8 @@ class State:
         if not is_valid_prefix(prefix):
             raise ValueError(f"invalid prefix: {prefix!r}")
         async with self._lock:
-            self._server_prefs.setdefault(str(guild_id), {})["prefix"] = prefix
-            self._dirty = True
+            self._server_entry(guild_id)["prefix"] = prefix
+            self._changes.mark("servers", str(guild_id))
         audit_logger.info("prefix_changed guild=%s prefix=%r", guild_id, prefix)
 
     def get_server_language(self, guild_id: int | None) -> str:
@@ -229,8 +483,8 @@ class State:
         if lang not in SUPPORTED_LANGUAGES:
             raise ValueError(f"unsupported language: {lang!r}")
         async with self._lock:
-            self._server_prefs.setdefault(str(guild_id), {})["language"] = lang
-            self._dirty = True
+            self._server_entry(guild_id)["language"] = lang
+            self._changes.mark("servers", str(guild_id))
         audit_logger.info("language_changed guild=%s lang=%s", guild_id, lang)
 
     def get_server_default_roll(self, guild_id: int | None) -> str | None:
@@ -245,6 +499,76 @@ class State:
 
     async def set_server_default_roll(self, guild_id: int, expression: str) -> None:
         async with self._lock:
-            self._server_prefs.setdefault(str(guild_id), {})["default_roll"] = expression
-            self._dirty = True
+            self._server_entry(guild_id)["default_roll"] = expression
+            self._changes.mark("servers", str(guild_id))
         audit_logger.info("default_roll_changed guild=%s expression=%r", guild_id, expression)
+
+    def get_server_table_names(self, guild_id: int) -> list[str]:
+        entry = self._server_prefs.get(str(guild_id), {})
+        tables = entry.get("tables") if isinstance(entry, dict) else None
+        return sorted(tables) if isinstance(tables, dict) else []
+
+    def get_server_table(self, guild_id: int, name: str) -> TableEntries | None:
+        entry = self._server_prefs.get(str(guild_id), {})
+        tables = entry.get("tables") if isinstance(entry, dict) else None
+        rows = tables.get(name) if isinstance(tables, dict) else None
+        if not isinstance(rows, list):
+            return None
+        return tuple((weight, text) for weight, text in rows)
+
+    async def set_server_table(self, guild_id: int, name: str, entries: TableEntries) -> None:
+        """Create or replace a table. Raises ValueError on a bad name or entries."""
+        if not is_valid_table_name(name):
+            raise TableError(f"invalid table name: {name!r}")
+        validate_entries(entries)
+        async with self._lock:
+            tables = self._server_entry(guild_id).setdefault("tables", {})
+            if name not in tables and len(tables) >= MAX_TABLES_PER_GUILD:
+                raise TableError(f"too many tables (max {MAX_TABLES_PER_GUILD})")
+            tables[name] = [[weight, text] for weight, text in entries]
+            self._changes.mark("servers", str(guild_id))
+        audit_logger.info("table_set guild=%s name=%r entries=%d", guild_id, name, len(entries))
+
+    async def delete_server_table(self, guild_id: int, name: str) -> bool:
+        """Remove a table. Returns False if it did not exist."""
+        async with self._lock:
+            entry = self._own("servers", self._server_prefs, str(guild_id)) or {}
+            tables = entry.get("tables")
+            if not isinstance(tables, dict) or tables.pop(name, None) is None:
+                return False
+            if not tables:
+                del entry["tables"]
+            self._changes.mark("servers", str(guild_id))
+        audit_logger.info("table_deleted guild=%s name=%r", guild_id, name)
+        return True
+
+    def get_channel_deck(self, channel_id: int) -> Deck | None:
+        return self._decks.get(str(channel_id))
+
+    async def new_channel_deck(self, channel_id: int, kind: str, rng: Rng) -> Deck:
+        """Replace the channel's deck with a freshly shuffled one. Raises DeckError."""
+        deck = Deck.new(kind, rng)
+        async with self._lock:
+            self._decks[str(channel_id)] = deck
+            self._changes.mark("decks", str(channel_id))
+        return deck
+
+    async def draw_from_channel_deck(self, channel_id: int, count: int) -> list[int] | None:
+        """Draw from the channel's deck; None if it has none. Raises DeckError."""
+        async with self._lock:
+            deck: Deck | None = self._own("decks", self._decks, str(channel_id))
+            if deck is None:
+                return None
+            cards = deck.draw(count)
+            self._changes.mark("decks", str(channel_id))
+        return cards
+
+    async def shuffle_channel_deck(self, channel_id: int, rng: Rng) -> Deck | None:
+        """Put every card back and reshuffle; None if the channel has no deck."""
+        async with self._lock:
+            deck: Deck | None = self._own("decks", self._decks, str(channel_id))
+            if deck is None:
+                return None
+            deck.shuffle(rng)
+            self._changes.mark("decks", str(channel_id))
+        return deck
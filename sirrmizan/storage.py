@@ -0,0 +1,507 @@
+"""Storage backends for ``State``.
+
+``State`` keeps everything in memory and hands a backend its four sections
+(user preferences, user stats, server preferences, channel decks) to load
+at startup and persist on save, together with a ``ChangeSet`` of the
+records touched since the last save.
+
+* ``JsonStorage`` (default) keeps one JSON file per section, written
+  atomically; a save rewrites only the files of the sections it touches.
+* ``JournalStorage`` keeps the same files as snapshots and appends the
+  changed records to a journal (``journal.py``) instead of rewriting them.
+  Startup replays the journal over the snapshots; once it passes
+  ``JOURNAL_COMPACT_BYTES``, and at shutdown, it is folded into fresh
+  snapshots and emptied.
+* ``SqliteStorage`` keeps one row per user, guild and channel in a
+  ``state.sqlite3`` database in WAL mode and writes only the changed rows,
+  in one transaction per save. A new database imports the JSON files found
+  next to it once.
+
+All are synchronous; ``State.save`` runs them in a worker thread on a
+snapshot of the sections.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import sqlite3
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+from .decks import Deck
+from .journal import Journal, JournalEntry
+from .persistence import read_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+STORAGE_BACKENDS = ("json", "journal", "sqlite")
+SECTIONS = ("users", "stats", "servers", "decks")
+SQLITE_FILENAME = "state.sqlite3"
+JOURNAL_FILENAME = "state.journal.jsonl"
+JOURNAL_COMPACT_BYTES = 4 * 1024 * 1024
+
+
+class ChangeSet:
+    """Records changed since the last save, per section.
+
+    ``mark`` names one record (a user, guild or channel id); ``mark_all``
+    asks for the whole section to be rewritten, e.g. after load-time repairs.
+    """
+
+    __slots__ = ("_ids", "_whole")
+
+    def __init__(self) -> None:
+        self._ids: dict[str, set[str]] = {section: set() for section in SECTIONS}
+        self._whole: set[str] = set()
+
+    def mark(self, section: str, record_id: str) -> None:
+        self._ids[section].add(record_id)
+
+    def mark_all(self, section: str) -> None:
+        self._whole.add(section)
+
+    def ids(self, section: str) -> set[str]:
+        return self._ids[section]
+
+    def is_whole(self, section: str) -> bool:
+        return section in self._whole
+
+    def touches(self, section: str) -> bool:
+        return section in self._whole or bool(self._ids[section])
+
+    def __bool__(self) -> bool:
+        return bool(self._whole) or any(self._ids.values())
+
+    def update(self, other: ChangeSet) -> None:
+        """Add ``other``'s records, e.g. to retry those of a failed save."""
+        for section, ids in other._ids.items():
+            self._ids[section] |= ids
+        self._whole |= other._whole
+
+    def clear(self) -> None:
+        for ids in self._ids.values():
+            ids.clear()
+        self._whole.clear()
+
+
+@dataclass(frozen=True, slots=True)
+class SaveMetrics:
+    """What one save, or a sum of saves, wrote."""
+
+    saves: int = 0
+    records: int = 0  # records serialized: every record of a rewritten file
+    bytes_written: int = 0  # serialized record data
+    seconds: float = 0.0
+
+    def __add__(self, other: SaveMetrics) -> SaveMetrics:
+        return SaveMetrics(
+            saves=self.saves + other.saves,
+            records=self.records + other.records,
+            bytes_written=self.bytes_written + other.bytes_written,
+            seconds=self.seconds + other.seconds,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class StoredState:
+    """The four sections in their JSON-file shapes.
+
+    ``users`` is ``{"users": {uid: prefs}}``; ``stats``, ``servers`` and
+    ``decks`` map an id to its record. Loaded values are unsanitized.
+    """
+
+    users: Any
+    stats: Any
+    servers: Any
+    decks: Any
+
+
+class Storage(Protocol):
+    def load(self) -> StoredState: ...
+
+    def save(
+        self,
+        users: Mapping[str, Any],
+        stats: Mapping[str, Any],
+        servers: Mapping[str, Any],
+        decks: Mapping[str, Deck],
+        changes: ChangeSet,
+    ) -> SaveMetrics:
+        """Persist the records ``changes`` names; ``users`` is the user file shape.
+
+        ``seconds`` is left for the caller to fill in.
+        """
+
+    def close(self) -> None: ...
+
+
+class JsonStorage:
+    """One JSON file per section in ``data_dir``."""
+
+    def __init__(self, data_dir: Path) -> None:
+        self.users_path = data_dir / "user_preferences.json"
+        self.stats_path = data_dir / "user_stats.json"
+        self.servers_path = data_dir / "server_preferences.json"
+        self.decks_path = data_dir / "channel_decks.json"
+
+    def exists(self) -> bool:
+        paths = (self.users_path, self.stats_path, self.servers_path, self.decks_path)
+        return any(path.exists() for path in paths)
+
+    def load(self) -> StoredState:
+        return StoredState(
+            users=read_json(self.users_path, {"users": {}}),
+            stats=read_json(self.stats_path, {}),
+            servers=read_json(self.servers_path, {}),
+            decks=read_json(self.decks_path, {}),
+        )
+
+    def save(
+        self,
+        users: Mapping[str, Any],
+        stats: Mapping[str, Any],
+        servers: Mapping[str, Any],
+        decks: Mapping[str, Deck],
+        changes: ChangeSet,
+    ) -> SaveMetrics:
+        # A file is rewritten whole, but only if one of its records changed:
+        # a roll rewrites the stats file alone, a deck draw the deck file.
+        records = 0
+        written = 0
+        if changes.touches("users"):
+            written += write_json_atomic(self.users_path, users)
+            records += len(users.get("users", {}))
+        if changes.touches("stats"):
+            written += write_json_atomic(self.stats_path, stats)
+            records += len(stats)
+        if changes.touches("servers"):
+            written += write_json_atomic(self.servers_path, servers)
+            records += len(servers)
+        if changes.touches("decks"):
+            written += write_json_atomic(
+                self.decks_path, {cid: deck.to_json() for cid, deck in decks.items()}
+            )
+            records += len(decks)
+        return SaveMetrics(saves=1, records=records, bytes_written=written)
+
+    def close(self) -> None:
+        pass
+
+
+class JournalStorage(JsonStorage):
+    """JSON snapshots plus an append-only journal of changed records."""
+
+    def __init__(self, data_dir: Path, *, compact_bytes: int = JOURNAL_COMPACT_BYTES) -> None:
+        super().__init__(data_dir)
+        self.journal = Journal(data_dir / JOURNAL_FILENAME)
+        self._compact_bytes = compact_bytes
+        # The sections last passed to save(), for the compaction at close().
+        self._latest: tuple[Mapping[str, Any], ...] | None = None
+
+    def load(self) -> StoredState:
+        stored = super().load()
+        users_file = stored.users if isinstance(stored.users, dict) else {"users": {}}
+        if not isinstance(users_file.get("users"), dict):
+            users_file["users"] = {}
+        sections: dict[str, dict[str, Any]] = {
+            "users": users_file["users"],
+            "stats": stored.stats if isinstance(stored.stats, dict) else {},
+            "servers": stored.servers if isinstance(stored.servers, dict) else {},
+            "decks": stored.decks if isinstance(stored.decks, dict) else {},
+        }
+        entries = self.journal.replay()
+        for section, record_id, value in entries:
+            records = sections.get(section)
+            if records is None:
+                continue
+            if value is None:
+                records.pop(record_id, None)
+            else:
+                records[record_id] = value
+        if entries:
+            logger.info("Replayed %d journal entries from %s", len(entries), self.journal.path)
+        return StoredState(
+            users=users_file,
+            stats=sections["stats"],
+            servers=sections["servers"],
+            decks=sections["decks"],
+        )
+
+    def save(
+        self,
+        users: Mapping[str, Any],
+        stats: Mapping[str, Any],
+        servers: Mapping[str, Any],
+        decks: Mapping[str, Deck],
+        changes: ChangeSet,
+    ) -> SaveMetrics:
+        self._latest = (users, stats, servers, decks)
+        records: dict[str, Mapping[str, Any]] = {
+            "users": users.get("users", {}),
+            "stats": stats,
+            "servers": servers,
+            "decks": decks,
+        }
+        entries: list[JournalEntry] = []
+        for section in SECTIONS:
+            for record_id in changes.ids(section):
+                value = records[section].get(record_id)
+                if isinstance(value, Deck):
+                    value = value.to_json()
+                entries.append((section, record_id, value))
+        metrics = SaveMetrics(
+            saves=1, records=len(entries), bytes_written=self.journal.append(entries)
+        )
+        # Records dropped by load-time repairs can't be journaled: those
+        # sections need fresh snapshots.
+        whole = any(changes.is_whole(section) for section in SECTIONS)
+        if whole or self.journal.size >= self._compact_bytes:
+            compaction = self._compact(users, stats, servers, decks)
+            metrics += dataclasses.replace(compaction, saves=0)
+        return metrics
+
+    def _compact(
+        self,
+        users: Mapping[str, Any],
+        stats: Mapping[str, Any],
+        servers: Mapping[str, Any],
+        decks: Mapping[str, Deck],
+    ) -> SaveMetrics:
+        """Write every snapshot file, then empty the journal.
+
+        The journal already holds every change since the last compaction,
+        so a crash in between only leaves entries that replay to the state
+        the snapshots hold.
+        """
+        everything = ChangeSet()
+        for section in SECTIONS:
+            everything.mark_all(section)
+        metrics = super().save(users, stats, servers, decks, everything)
+        self.journal.truncate()
+        logger.info("Compacted journal into snapshots (%d bytes)", metrics.bytes_written)
+        return metrics
+
+    def close(self) -> None:
+        if self._latest is not None and self.journal.size:
+            self._compact(*self._latest)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (id TEXT PRIMARY KEY, data TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS user_stats (
+    id TEXT PRIMARY KEY, dice_rolls_count INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS servers (id TEXT PRIMARY KEY, data TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS channel_decks (id TEXT PRIMARY KEY, data TEXT NOT NULL) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;
+"""
+
+# Set, in the import's own transaction, once the JSON files are copied in.
+_IMPORTED_KEY = "json_imported"
+
+# section -> (table, value column)
+_TABLES = {
+    "users": ("users", "data"),
+    "stats": ("user_stats", "dice_rolls_count"),
+    "servers": ("servers", "data"),
+    "decks": ("channel_decks", "data"),
+}
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+class SqliteStorage:
+    """One row per record in a WAL-mode SQLite database."""
+
+    def __init__(self, path: Path, *, import_from: JsonStorage | None = None) -> None:
+        self.path = path
+        self._import_from = import_from
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Saves run on executor threads, outside State's lock; State.save chains
+        # them so only one writes at a time.
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")
+        conn.executescript(_SCHEMA)
+        self._conn = conn
+        return conn
+
+    def _needs_import(self, conn: sqlite3.Connection) -> bool:
+        """No import has committed yet, and the tables are still empty.
+
+        Checking the tables too keeps a database written before the marker
+        existed from being overwritten by stale JSON files.
+        """
+        if conn.execute("SELECT 1 FROM meta WHERE key = ?", (_IMPORTED_KEY,)).fetchone():
+            return False
+        return not any(
+            conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone()
+            for table, _ in _TABLES.values()
+        )
+
+    def load(self) -> StoredState:
+        conn = self._connect()
+        if self._needs_import(conn):
+            if self._import_from is not None and self._import_from.exists():
+                stored = self._import_from.load()
+                self._import(stored)
+                return stored
+            with self._transaction() as conn:
+                self._mark_imported(conn)
+        users = {uid: json.loads(data) for uid, data in conn.execute("SELECT id, data FROM users")}
+        stats = {
+            uid: {"dice_rolls_count": count}
+            for uid, count in conn.execute("SELECT id, dice_rolls_count FROM user_stats")
+        }
+        servers = {
+            gid: json.loads(data) for gid, data in conn.execute("SELECT id, data FROM servers")
+        }
+        decks = {
+            cid: json.loads(data)
+            for cid, data in conn.execute("SELECT id, data FROM channel_decks")
+        }
+        return StoredState(users={"users": users}, stats=stats, servers=servers, decks=decks)
+
+    def _import(self, stored: StoredState) -> None:
+        """Copy the JSON files' records into the new database, as loaded."""
+        users = stored.users.get("users") if isinstance(stored.users, dict) else None
+        sections = {
+            "users": users if isinstance(users, dict) else {},
+            "stats": stored.stats if isinstance(stored.stats, dict) else {},
+            "servers": stored.servers if isinstance(stored.servers, dict) else {},
+            "decks": stored.decks if isinstance(stored.decks, dict) else {},
+        }
+        rows = {
+            section: {
+                key: value
+                for key, value in records.items()
+                if isinstance(key, str) and isinstance(value, dict)
+            }
+            for section, records in sections.items()
+        }
+        with self._transaction() as conn:
+            for section, records in rows.items():
+                self._write(conn, section, records, records.keys())
+            self._mark_imported(conn)
+        logger.info(
+            "Imported JSON state into %s: %d users, %d stats, %d servers, %d decks",
+            self.path,
+            *(len(rows[section]) for section in SECTIONS),
+        )
+
+    @staticmethod
+    def _mark_imported(conn: sqlite3.Connection) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, '1')", (_IMPORTED_KEY,))
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """``BEGIN`` ... ``COMMIT``, or ``ROLLBACK`` if the body raises."""
+        conn = self._conn
+        assert conn is not None, "load() opens the database"
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _row_value(section: str, record: Any) -> int | str:
+        if section == "stats":
+            count = record.get("dice_rolls_count", 0) if isinstance(record, dict) else 0
+            return count if isinstance(count, int) and not isinstance(count, bool) else 0
+        if section == "decks" and isinstance(record, Deck):
+            return _dumps(record.to_json())
+        return _dumps(record)
+
+    def _write(
+        self,
+        conn: sqlite3.Connection,
+        section: str,
+        records: Mapping[str, Any],
+        ids: Iterable[str],
+    ) -> tuple[int, int]:
+        """Upsert each of ``ids`` present in ``records``; delete the others.
+
+        Returns ``(rows written, bytes of row data)``; an integer counts 8 bytes.
+        """
+        table, column = _TABLES[section]
+        upserts = []
+        deletes = []
+        written = 0
+        for record_id in ids:
+            record = records.get(record_id)
+            if record is None:
+                deletes.append((record_id,))
+            else:
+                value = self._row_value(section, record)
+                written += len(value.encode("utf-8")) if isinstance(value, str) else 8
+                upserts.append((record_id, value))
+        if upserts:
+            conn.executemany(
+                f"INSERT INTO {table} (id, {column}) VALUES (?, ?) "
+                f"ON CONFLICT(id) DO UPDATE SET {column} = excluded.{column}",
+                upserts,
+            )
+        if deletes:
+            conn.executemany(f"DELETE FROM {table} WHERE id = ?", deletes)
+        return len(upserts) + len(deletes), written
+
+    def save(
+        self,
+        users: Mapping[str, Any],
+        stats: Mapping[str, Any],
+        servers: Mapping[str, Any],
+        decks: Mapping[str, Deck],
+        changes: ChangeSet,
+    ) -> SaveMetrics:
+        records: dict[str, Mapping[str, Any]] = {
+            "users": users.get("users", {}),
+            "stats": stats,
+            "servers": servers,
+            "decks": decks,
+        }
+        rows = 0
+        written = 0
+        with self._transaction() as conn:
+            for section in SECTIONS:
+                if changes.is_whole(section):
+                    table, _ = _TABLES[section]
+                    conn.execute(f"DELETE FROM {table}")
+                    ids: Iterable[str] = records[section].keys()
+                elif changes.ids(section):
+                    ids = changes.ids(section)
+                else:
+                    continue
+                section_rows, section_bytes = self._write(conn, section, records[section], ids)
+                rows += section_rows
+                written += section_bytes
+        return SaveMetrics(saves=1, records=rows, bytes_written=written)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def make_storage(backend: str, data_dir: Path) -> Storage:
+    if backend == "json":
+        return JsonStorage(data_dir)
+    if backend == "journal":
+        return JournalStorage(data_dir)
+    if backend == "sqlite":
+        return SqliteStorage(data_dir / SQLITE_FILENAME, import_from=JsonStorage(data_dir))
+    raise ValueError(
+        f"unknown storage backend {backend!r} (choose from {', '.join(STORAGE_BACKENDS)})"
+    )
@@ -0,0 +1,159 @@
+"""Weighted random tables with O(1) draws.
+
+A guild's table is a list of ``(weight, text)`` entries (``State`` stores
+them). ``compile_table`` turns one into an ``AliasTable`` with Vose's alias
+method: each of the ``n`` slots holds a threshold and an alias, and a draw
+picks a slot uniformly then keeps it or takes its alias. Two bounded
+integers per draw, whatever the number of entries or how skewed the
+weights. Thresholds are integers scaled by the total weight, so the draw
+is exact, with no float rounding.
+
+``TableCache`` keeps compiled tables in memory; the table commands
+invalidate an entry whenever they edit it.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from .cache import CacheStats, LRUCache
+from .rng import Rng
+
+MAX_TABLES_PER_GUILD = 25
+MAX_TABLE_ENTRIES = 100
+MAX_ENTRY_LENGTH = 100
+MAX_ENTRY_WEIGHT = 1_000_000
+MAX_TABLE_DRAWS = 20
+DEFAULT_CACHE_SIZE = 256
+
+_NAME_PATTERN = re.compile(r"^[a-z0-9_-]{1,32}$")
+# ``3 Gold coins``: optional leading weight, then the entry text.
+_ENTRY_RE = re.compile(r"^(?:(\d+)\s+)?(.+)$", re.DOTALL)
+
+TableEntries = tuple[tuple[int, str], ...]
+
+
+class TableError(ValueError):
+    """Invalid table name or entries."""
+
+
+def is_valid_table_name(name: str) -> bool:
+    return bool(_NAME_PATTERN.match(name))
+
+
+def validate_entries(entries: Sequence[tuple[int, str]]) -> TableEntries:
+    """Check ``(weight, text)`` pairs against the limits.
+
+    Raises:
+        TableError: No entries, too many, or a bad weight or text.
+    """
+    if not entries:
+        raise TableError("a table needs at least one entry")
+    if len(entries) > MAX_TABLE_ENTRIES:
+        raise TableError(f"too many entries (max {MAX_TABLE_ENTRIES})")
+    for weight, text in entries:
+        if not 1 <= weight <= MAX_ENTRY_WEIGHT:
+            raise TableError(f"weight {weight} for {text!r} must be 1-{MAX_ENTRY_WEIGHT}")
+        if not text or len(text) > MAX_ENTRY_LENGTH:
+            raise TableError(f"entry text must be 1-{MAX_ENTRY_LENGTH} characters")
+    return tuple(entries)
+
+
+def parse_entries(text: str) -> TableEntries:
+    """Parse ``3 Gold | Sword | 2 Potion`` into ``((3, "Gold"), (1, "Sword"), (2, "Potion"))``.
+
+    Entries are separated by ``|``; an entry without a leading weight
+    weighs 1.
+
+    Raises:
+        TableError: See ``validate_entries``.
+    """
+    entries: list[tuple[int, str]] = []
+    for raw in text.split("|"):
+        match = _ENTRY_RE.match(raw.strip())
+        if match is None:
+            raise TableError("empty entry")
+        weight, entry = match.groups()
+        entries.append((int(weight) if weight else 1, entry.strip()))
+    return validate_entries(entries)
+
+
+@dataclass(frozen=True, slots=True)
+class AliasTable:
+    texts: tuple[str, ...]
+    weights: tuple[int, ...]
+    total: int
+    # Slot i keeps entry i when ``randbelow(total) < thresholds[i]``,
+    # otherwise it yields ``aliases[i]``.
+    thresholds: tuple[int, ...]
+    aliases: tuple[int, ...]
+
+    def probability(self, index: int) -> float:
+        return self.weights[index] / self.total
+
+    def draw_index(self, rng: Rng) -> int:
+        slot = rng.randbelow(len(self.thresholds))
+        if rng.randbelow(self.total) < self.thresholds[slot]:
+            return slot
+        return self.aliases[slot]
+
+    def draw(self, rng: Rng, count: int = 1) -> list[str]:
+        return [self.texts[self.draw_index(rng)] for _ in range(count)]
+
+
+def compile_table(entries: Sequence[tuple[int, str]]) -> AliasTable:
+    """Build the alias table for ``entries`` in O(n) (Vose's method)."""
+    weights = tuple(weight for weight, _ in entries)
+    n = len(weights)
+    total = sum(weights)
+    # Slot mass scaled by ``total``: a full slot holds exactly ``total``.
+    scaled = [weight * n for weight in weights]
+    thresholds = [total] * n
+    aliases = list(range(n))
+    small = [i for i, mass in enumerate(scaled) if mass < total]
+    large = [i for i, mass in enumerate(scaled) if mass >= total]
+    while small and large:
+        less = small.pop()
+        more = large.pop()
+        thresholds[less] = scaled[less]
+        aliases[less] = more
+        scaled[more] -= total - scaled[less]
+        (small if scaled[more] < total else large).append(more)
+    # Whatever is left is full (up to nothing: the arithmetic is exact).
+    return AliasTable(
+        texts=tuple(text for _, text in entries),
+        weights=weights,
+        total=total,
+        thresholds=tuple(thresholds),
+        aliases=tuple(aliases),
+    )
+
+
+class TableCache:
+    """Compiled tables keyed by ``(guild_id, name)``.
+
+    Callers must ``invalidate`` a table after editing or removing it.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self._tables: LRUCache[tuple[int, str], AliasTable] = LRUCache(maxsize)
+
+    def table(self, guild_id: int, name: str, entries: Sequence[tuple[int, str]]) -> AliasTable:
+        key = (guild_id, name)
+        cached = self._tables.get(key)
+        if cached is None:
+            cached = compile_table(entries)
+            self._tables.put(key, cached)
+        return cached
+
+    def invalidate(self, guild_id: int, name: str) -> None:
+        self._tables.pop((guild_id, name))
+
+    def clear(self) -> None:
+        self._tables.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._tables.stats
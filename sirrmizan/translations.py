@@ -19,7 +19,7 @@ _TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "help_description": "Below is the list of available commands.",
         "help_footer": "Contact core.layer for any feedback ❤️",
         "roll_title": "Roll Dice",
-        "roll_desc": "Roll dice with an expression like 2d6+3. You can append a target name.",
+        "roll_desc": "Roll dice with an expression like 2d6+3, 4d6kh3, 1d6!, 2d6r1 or 10d10>=7 (counts successes). You can append a target name. Roll several at once with `6x 4d6` or `1d20+5; 2d6+3`.",
         "setcolor_title": "Set Color",
         "setcolor_desc": "Choose your preferred embed color.",
         "getcolor_title": "Get Color",
@@ -35,6 +35,8 @@ _TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "embed_dice": "Dice",
         "embed_modifiers": "Modifiers",
         "embed_rolled_by": "Rolled by",
+        "embed_histogram": "Faces rolled",
+        "embed_successes": "successes",
         "rollshort_title": "Compact Rolls",
         "rollshort_desc": "Toggle short single-line roll output for yourself.",
         "rollshort_on": "Compact roll output **enabled**.",
@@ -54,8 +56,79 @@ _TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "defaultroll_invalid": "Invalid expression: {error}",
         "defaultroll_set": "Server default roll is now `{expression}`.",
         "defaultroll_missing": "No default roll set. Provide an expression or run `{prefix}defaultRoll`.",
-        "roll_input_too_long": "Input too long. Limit: 100 characters.",
+        "roll_input_too_long": "Input too long. Limit: {limit} characters.",
         "roll_invalid": "Invalid expression: {error}",
+        "roll_too_expensive": "That roll is too large. Try fewer dice or fewer rolls at once.",
+        "roll_output_too_large": "That roll's result is too long to show. Try fewer dice terms.",
+        "roll_over_budget": "You are rolling too much. Try again in {seconds:.0f}s.",
+        "odds_title": "Odds",
+        "odds_desc": "Exact statistics for an expression: range, mean, spread, percentiles and the chance of reaching a total.",
+        "odds_range": "Range",
+        "odds_mean": "Mean",
+        "odds_stddev": "Std. deviation",
+        "odds_percentiles": "Percentiles",
+        "odds_at_least": "Chance of {value} or more",
+        "odds_too_large": "Too many possible outcomes to compute exactly. Try fewer dice or faces.",
+        "odds_usage": "Usage: `{prefix}odds 2d6+3 >= 10`.",
+        "simulate_title": "Simulation",
+        "simulate_desc": "Roll an expression up to 1,000,000 times and show the spread of results.",
+        "simulate_progress": "Simulating {trials} rolls of `{expression}`… {percent}%",
+        "simulate_histogram": "Results",
+        "simulate_too_large": "That simulation is too large (at most {max} rolls, fewer for big expressions).",
+        "simulate_busy": "You already have a simulation running.",
+        "simulate_timeout": "The simulation took too long and was stopped. Try fewer rolls.",
+        "simulate_queue_full": "Too many simulations are running right now. Try again in a moment.",
+        "simulate_failed": "The simulation failed. Please try again.",
+        "table_title": "Random Tables",
+        "table_desc": "Weighted random tables for this server: `add` and `remove` (requires `manage_guild`), `list`, `show`, `roll <name> [count]`. Entries are separated by `|`, with an optional weight first.",
+        "table_usage": "Usage: `{prefix}table roll <name> [count]`, `{prefix}table list`, `{prefix}table show <name>`, `{prefix}table add <name> 3 Gold | 1 Gem`, `{prefix}table remove <name>`.",
+        "table_invalid_name": "Invalid table name. Use 1-32 lowercase letters, digits, `-` or `_`.",
+        "table_invalid": "Invalid table: {error}",
+        "table_saved": "Table `{name}` saved with {count} entries.",
+        "table_removed": "Table `{name}` removed.",
+        "table_not_found": "No table named `{name}` on this server.",
+        "table_none": "This server has no tables yet.",
+        "table_list": "Tables: {names}",
+        "table_more": "…and {count} more",
+        "table_draws_invalid": "You can draw between 1 and {max} times at once.",
+        "deck_title": "Card Decks",
+        "deck_desc": "A deck of cards per channel, drawn without replacement: `new [standard|jokers|tarot]`, `draw [count]`, `shuffle` (puts every card back).",
+        "deck_usage": "No deck in this channel. Start one with `{prefix}deck new` (standard, jokers or tarot).",
+        "deck_none": "No deck in this channel. Start one with `{prefix}deck new`.",
+        "deck_new": "New **{kind}** deck shuffled: {size} cards.",
+        "deck_unknown": "Unknown deck. Available: {kinds}.",
+        "deck_shuffled": "All {size} cards are back in the deck, shuffled.",
+        "deck_status": "{kind} deck: {remaining}/{size} cards left",
+        "deck_too_few": "Only {remaining} cards left. Use `{prefix}deck shuffle` to put them all back.",
+        "deck_draws_invalid": "You can draw between 1 and {max} cards at once.",
+        "macro_title": "Macros",
+        "macro_desc": "Save rolls you repeat and roll them with `@name`, alone or in a batch: `save`, `delete`, `list`.",
+        "macro_usage": "Usage: `{prefix}macro save atk 1d20+7 Goblin`, then `{prefix}roll @atk`. Also `{prefix}macro list` and `{prefix}macro delete <name>`.",
+        "macro_invalid_name": "Invalid macro name. Use 1-32 lowercase letters, digits, `-` or `_`.",
+        "macro_invalid": "Invalid macro: {error}",
+        "macro_saved": "Macro `@{name}` saved: `{expression}`.",
+        "macro_deleted": "Macro `@{name}` deleted.",
+        "macro_not_found": "You have no macro named `@{name}`. See `{prefix}macro list`.",
+        "macro_none": "You have no macros yet. Save one with `{prefix}macro save <name> <roll>`.",
+        "macro_list": "Your macros:",
+        "var_title": "Variables",
+        "var_desc": "Numbers you use in rolls as `@name`, like ability modifiers: `set`, `delete`, `list`.",
+        "var_usage": "Usage: `{prefix}var set str 3`, then `{prefix}roll 1d20+@str`. Also `{prefix}var list` and `{prefix}var delete <name>`.",
+        "var_invalid_name": "Invalid variable name. Use a lowercase letter followed by up to 31 lowercase letters, digits or `_`.",
+        "var_invalid": "Invalid variable: {error}",
+        "var_saved": "Variable `@{name}` set to `{value}`.",
+        "var_deleted": "Variable `@{name}` deleted.",
+        "var_not_found": "You have no variable named `@{name}`. See `{prefix}var list`.",
+        "var_none": "You have no variables yet. Set one with `{prefix}var set <name> <number>`.",
+        "var_list": "Your variables:",
+        "init_title": "Initiative",
+        "init_desc": "Roll initiative for every combatant in one message, then step through the turns: `next`, `show`, `end`.",
+        "init_usage": "Usage: `{prefix}init Goblin:+2 Orc:+1 Alice:+5`, then `{prefix}init next`. Also `{prefix}init show` and `{prefix}init end`.",
+        "init_invalid": "Invalid initiative: {error}",
+        "init_none": "No initiative running in this channel. Start one with `{prefix}init Name:+2 ...`.",
+        "init_turn": "Round {round}: **{name}** ({total}) acts.",
+        "init_round": "Round {round}",
+        "init_ended": "Initiative ended.",
         "guild_only": "This command can only be used inside a server.",
         "missing_permission": "You don't have permission to use this command.",
         "command_cooldown": "Command on cooldown. Try again in {seconds:.1f}s.",
@@ -68,7 +141,7 @@ _TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "help_description": "Voici la liste des commandes disponibles.",
         "help_footer": "Contactez core.layer pour tout retour ❤️",
         "roll_title": "Lancer des Dés",
-        "roll_desc": "Lance des dés avec une expression comme 2d6+3. Vous pouvez ajouter un nom de cible.",
+        "roll_desc": "Lance des dés avec une expression comme 2d6+3, 4d6kh3, 1d6!, 2d6r1 ou 10d10>=7 (compte les succès). Vous pouvez ajouter un nom de cible. Plusieurs jets d'un coup avec `6x 4d6` ou `1d20+5; 2d6+3`.",
         "setcolor_title": "Définir la Couleur",
         "setcolor_desc": "Choisissez votre couleur préférée pour les embeds.",
         "getcolor_title": "Obtenir la Couleur",
@@ -84,6 +157,8 @@ _TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "embed_dice": "Dés",
         "embed_modifiers": "Modificateurs",
         "embed_rolled_by": "Lancé par",
+        "embed_histogram": "Faces obtenues",
+        "embed_successes": "succès",
         "rollshort_title": "Rolls Compacts",
         "rollshort_desc": "Active/désactive l'affichage compact des jets pour toi.",
         "rollshort_on": "Affichage compact **activé**.",
@@ -103,8 +178,79 @@ _TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "defaultroll_invalid": "Expression invalide : {error}",
         "defaultroll_set": "Jet par défaut du serveur défini sur `{expression}`.",
         "defaultroll_missing": "Aucun jet par défaut défini. Fournissez une expression ou lancez `{prefix}defaultRoll`.",
-        "roll_input_too_long": "Entrée trop longue. Limite : 100 caractères.",
+        "roll_input_too_long": "Entrée trop longue. Limite : {limit} caractères.",
         "roll_invalid": "Expression invalide : {error}",
+        "roll_too_expensive": "Ce jet est trop gros. Essayez moins de dés ou moins de jets à la fois.",
+        "roll_output_too_large": "Le résultat de ce jet est trop long à afficher. Essayez moins de termes de dés.",
+        "roll_over_budget": "Vous lancez trop de dés. Réessayez dans {seconds:.0f}s.",
+        "odds_title": "Probabilités",
+        "odds_desc": "Statistiques exactes d'une expression : plage, moyenne, dispersion, percentiles et chance d'atteindre un total.",
+        "odds_range": "Plage",
+        "odds_mean": "Moyenne",
+        "odds_stddev": "Écart type",
+        "odds_percentiles": "Percentiles",
+        "odds_at_least": "Chance de faire {value} ou plus",
+        "odds_too_large": "Trop de résultats possibles pour un calcul exact. Essayez moins de dés ou de faces.",
+        "odds_usage": "Utilisation : `{prefix}odds 2d6+3 >= 10`.",
+        "simulate_title": "Simulation",
+        "simulate_desc": "Lance une expression jusqu'à 1 000 000 de fois et montre la répartition des résultats.",
+        "simulate_progress": "Simulation de {trials} jets de `{expression}`… {percent}%",
+        "simulate_histogram": "Résultats",
+        "simulate_too_large": "Cette simulation est trop grande (au plus {max} jets, moins pour les grosses expressions).",
+        "simulate_busy": "Vous avez déjà une simulation en cours.",
+        "simulate_timeout": "La simulation a pris trop de temps et a été arrêtée. Essayez moins de jets.",
+        "simulate_queue_full": "Trop de simulations sont en cours. Réessayez dans un instant.",
+        "simulate_failed": "La simulation a échoué. Veuillez réessayer.",
+        "table_title": "Tables aléatoires",
+        "table_desc": "Tables aléatoires pondérées du serveur : `add` et `remove` (nécessite `manage_guild`), `list`, `show`, `roll <nom> [nombre]`. Les entrées sont séparées par `|`, avec un poids facultatif en tête.",
+        "table_usage": "Utilisation : `{prefix}table roll <nom> [nombre]`, `{prefix}table list`, `{prefix}table show <nom>`, `{prefix}table add <nom> 3 Or | 1 Gemme`, `{prefix}table remove <nom>`.",
+        "table_invalid_name": "Nom de table invalide. Utilisez 1 à 32 lettres minuscules, chiffres, `-` ou `_`.",
+        "table_invalid": "Table invalide : {error}",
+        "table_saved": "Table `{name}` enregistrée avec {count} entrées.",
+        "table_removed": "Table `{name}` supprimée.",
+        "table_not_found": "Aucune table nommée `{name}` sur ce serveur.",
+        "table_none": "Ce serveur n'a pas encore de table.",
+        "table_list": "Tables : {names}",
+        "table_more": "…et {count} de plus",
+        "table_draws_invalid": "Vous pouvez tirer entre 1 et {max} fois d'un coup.",
+        "deck_title": "Paquets de cartes",
+        "deck_desc": "Un paquet de cartes par salon, tiré sans remise : `new [standard|jokers|tarot]`, `draw [nombre]`, `shuffle` (remet toutes les cartes).",
+        "deck_usage": "Aucun paquet dans ce salon. Commencez-en un avec `{prefix}deck new` (standard, jokers ou tarot).",
+        "deck_none": "Aucun paquet dans ce salon. Commencez-en un avec `{prefix}deck new`.",
+        "deck_new": "Nouveau paquet **{kind}** mélangé : {size} cartes.",
+        "deck_unknown": "Paquet inconnu. Disponibles : {kinds}.",
+        "deck_shuffled": "Les {size} cartes sont de retour dans le paquet, mélangées.",
+        "deck_status": "Paquet {kind} : {remaining}/{size} cartes restantes",
+        "deck_too_few": "Il ne reste que {remaining} cartes. Utilisez `{prefix}deck shuffle` pour toutes les remettre.",
+        "deck_draws_invalid": "Vous pouvez tirer entre 1 et {max} cartes d'un coup.",
+        "macro_title": "Macros",
+        "macro_desc": "Enregistrez les jets que vous répétez et lancez-les avec `@nom`, seuls ou en lot : `save`, `delete`, `list`.",
+        "macro_usage": "Utilisation : `{prefix}macro save atk 1d20+7 Gobelin`, puis `{prefix}roll @atk`. Aussi `{prefix}macro list` et `{prefix}macro delete <nom>`.",
+        "macro_invalid_name": "Nom de macro invalide. Utilisez 1 à 32 lettres minuscules, chiffres, `-` ou `_`.",
+        "macro_invalid": "Macro invalide : {error}",
+        "macro_saved": "Macro `@{name}` enregistrée : `{expression}`.",
+        "macro_deleted": "Macro `@{name}` supprimée.",
+        "macro_not_found": "Vous n'avez pas de macro nommée `@{name}`. Voir `{prefix}macro list`.",
+        "macro_none": "Vous n'avez pas encore de macro. Enregistrez-en une avec `{prefix}macro save <nom> <jet>`.",
+        "macro_list": "Vos macros :",
+        "var_title": "Variables",
+        "var_desc": "Des nombres à utiliser dans vos jets avec `@nom`, comme vos modificateurs : `set`, `delete`, `list`.",
+        "var_usage": "Utilisation : `{prefix}var set for 3`, puis `{prefix}roll 1d20+@for`. Aussi `{prefix}var list` et `{prefix}var delete <nom>`.",
+        "var_invalid_name": "Nom de variable invalide. Utilisez une lettre minuscule suivie de 31 lettres minuscules, chiffres ou `_` au plus.",
+        "var_invalid": "Variable invalide : {error}",
+        "var_saved": "Variable `@{name}` définie à `{value}`.",
+        "var_deleted": "Variable `@{name}` supprimée.",
+        "var_not_found": "Vous n'avez pas de variable nommée `@{name}`. Voir `{prefix}var list`.",
+        "var_none": "Vous n'avez pas encore de variable. Définissez-en une avec `{prefix}var set <nom> <nombre>`.",
+        "var_list": "Vos variables :",
+        "init_title": "Initiative",
+        "init_desc": "Lancez l'initiative de tous les combattants en un seul message, puis passez les tours : `next`, `show`, `end`.",
+        "init_usage": "Utilisation : `{prefix}init Gobelin:+2 Orc:+1 Alice:+5`, puis `{prefix}init next`. Aussi `{prefix}init show` et `{prefix}init end`.",
+        "init_invalid": "Initiative invalide : {error}",
+        "init_none": "Aucune initiative en cours dans ce salon. Lancez-en une avec `{prefix}init Nom:+2 ...`.",
+        "init_turn": "Round {round} : **{name}** ({total}) agit.",
+        "init_round": "Round {round}",
+        "init_ended": "Initiative terminée.",
         "guild_only": "Cette commande ne peut être utilisée que dans un serveur.",
         "missing_permission": "Vous n'avez pas la permission d'utiliser cette commande.",
         "command_cooldown": "Commande en cooldown. Réessayez dans {seconds:.1f}s.",
@@ -117,7 +263,7 @@ _TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "help_description": "Hier ist die Liste der verfügbaren Befehle.",
         "help_footer": "Kontaktiere core.layer für Feedback ❤️",
         "roll_title": "Würfeln",
-        "roll_desc": "Würfle mit einem Ausdruck wie 2d6+3. Optional kann ein Zielname angefügt werden.",
+        "roll_desc": "Würfle mit einem Ausdruck wie 2d6+3, 4d6kh3, 1d6!, 2d6r1 oder 10d10>=7 (zählt Erfolge). Optional kann ein Zielname angefügt werden. Mehrere Würfe auf einmal mit `6x 4d6` oder `1d20+5; 2d6+3`.",
         "setcolor_title": "Farbe Festlegen",
         "setcolor_desc": "Wähle deine bevorzugte Embed-Farbe.",
         "getcolor_title": "Farbe Anzeigen",
@@ -133,6 +279,8 @@ _TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "embed_dice": "Würfel",
         "embed_modifiers": "Modifikatoren",
         "embed_rolled_by": "Gewürfelt von",
+        "embed_histogram": "Gewürfelte Seiten",
+        "embed_successes": "Erfolge",
         "rollshort_title": "Kompakte Würfe",
         "rollshort_desc": "Schaltet die einzeilige Würfel-Ausgabe für dich um.",
         "rollshort_on": "Kompakte Ausgabe **aktiviert**.",
@@ -152,8 +300,79 @@ _TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "defaultroll_invalid": "Ungültiger Ausdruck: {error}",
         "defaultroll_set": "Server-Standardwurf ist jetzt `{expression}`.",
         "defaultroll_missing": "Kein Standardwurf gesetzt. Gib einen Ausdruck an oder nutze `{prefix}defaultRoll`.",
-        "roll_input_too_long": "Eingabe zu lang. Limit: 100 Zeichen.",
+        "roll_input_too_long": "Eingabe zu lang. Limit: {limit} Zeichen.",
         "roll_invalid": "Ungültiger Ausdruck: {error}",
+        "roll_too_expensive": "Dieser Wurf ist zu groß. Versuche weniger Würfel oder weniger Würfe auf einmal.",
+        "roll_output_too_large": "Das Ergebnis dieses Wurfs ist zu lang für die Anzeige. Versuche weniger Würfelterme.",
+        "roll_over_budget": "Du würfelst zu viel. Versuche es in {seconds:.0f}s erneut.",
+        "odds_title": "Wahrscheinlichkeiten",
+        "odds_desc": "Exakte Statistik für einen Ausdruck: Bereich, Mittelwert, Streuung, Perzentile und die Chance, eine Summe zu erreichen.",
+        "odds_range": "Bereich",
+        "odds_mean": "Mittelwert",
+        "odds_stddev": "Standardabweichung",
+        "odds_percentiles": "Perzentile",
+        "odds_at_least": "Chance auf {value} oder mehr",
+        "odds_too_large": "Zu viele mögliche Ergebnisse für eine exakte Berechnung. Versuche weniger Würfel oder Seiten.",
+        "odds_usage": "Verwendung: `{prefix}odds 2d6+3 >= 10`.",
+        "simulate_title": "Simulation",
+        "simulate_desc": "Würfelt einen Ausdruck bis zu 1.000.000 Mal und zeigt die Verteilung der Ergebnisse.",
+        "simulate_progress": "Simuliere {trials} Würfe von `{expression}`… {percent}%",
+        "simulate_histogram": "Ergebnisse",
+        "simulate_too_large": "Diese Simulation ist zu groß (höchstens {max} Würfe, weniger bei großen Ausdrücken).",
+        "simulate_busy": "Bei dir läuft bereits eine Simulation.",
+        "simulate_timeout": "Die Simulation hat zu lange gedauert und wurde abgebrochen. Versuche weniger Würfe.",
+        "simulate_queue_full": "Gerade laufen zu viele Simulationen. Versuche es gleich noch einmal.",
+        "simulate_failed": "Die Simulation ist fehlgeschlagen. Bitte versuche es erneut.",
+        "table_title": "Zufallstabellen",
+        "table_desc": "Gewichtete Zufallstabellen dieses Servers: `add` und `remove` (erfordert `manage_guild`), `list`, `show`, `roll <name> [anzahl]`. Einträge werden durch `|` getrennt, optional mit vorangestelltem Gewicht.",
+        "table_usage": "Verwendung: `{prefix}table roll <name> [anzahl]`, `{prefix}table list`, `{prefix}table show <name>`, `{prefix}table add <name> 3 Gold | 1 Edelstein`, `{prefix}table remove <name>`.",
+        "table_invalid_name": "Ungültiger Tabellenname. Verwende 1-32 Kleinbuchstaben, Ziffern, `-` oder `_`.",
+        "table_invalid": "Ungültige Tabelle: {error}",
+        "table_saved": "Tabelle `{name}` mit {count} Einträgen gespeichert.",
+        "table_removed": "Tabelle `{name}` entfernt.",
+        "table_not_found": "Keine Tabelle namens `{name}` auf diesem Server.",
+        "table_none": "Dieser Server hat noch keine Tabellen.",
+        "table_list": "Tabellen: {names}",
+        "table_more": "…und {count} weitere",
+        "table_draws_invalid": "Du kannst 1 bis {max} Mal auf einmal ziehen.",
+        "deck_title": "Kartendecks",
+        "deck_desc": "Ein Kartendeck pro Kanal, gezogen ohne Zurücklegen: `new [standard|jokers|tarot]`, `draw [anzahl]`, `shuffle` (legt alle Karten zurück).",
+        "deck_usage": "Kein Deck in diesem Kanal. Starte eines mit `{prefix}deck new` (standard, jokers oder tarot).",
+        "deck_none": "Kein Deck in diesem Kanal. Starte eines mit `{prefix}deck new`.",
+        "deck_new": "Neues **{kind}**-Deck gemischt: {size} Karten.",
+        "deck_unknown": "Unbekanntes Deck. Verfügbar: {kinds}.",
+        "deck_shuffled": "Alle {size} Karten sind zurück im Deck und gemischt.",
+        "deck_status": "{kind}-Deck: {remaining}/{size} Karten übrig",
+        "deck_too_few": "Nur noch {remaining} Karten übrig. Mit `{prefix}deck shuffle` legst du alle zurück.",
+        "deck_draws_invalid": "Du kannst 1 bis {max} Karten auf einmal ziehen.",
+        "macro_title": "Makros",
+        "macro_desc": "Speichere Würfe, die du oft wiederholst, und würfle sie mit `@name`, einzeln oder im Stapel: `save`, `delete`, `list`.",
+        "macro_usage": "Verwendung: `{prefix}macro save atk 1d20+7 Goblin`, dann `{prefix}roll @atk`. Außerdem `{prefix}macro list` und `{prefix}macro delete <name>`.",
+        "macro_invalid_name": "Ungültiger Makroname. Verwende 1-32 Kleinbuchstaben, Ziffern, `-` oder `_`.",
+        "macro_invalid": "Ungültiges Makro: {error}",
+        "macro_saved": "Makro `@{name}` gespeichert: `{expression}`.",
+        "macro_deleted": "Makro `@{name}` gelöscht.",
+        "macro_not_found": "Du hast kein Makro namens `@{name}`. Siehe `{prefix}macro list`.",
+        "macro_none": "Du hast noch keine Makros. Speichere eines mit `{prefix}macro save <name> <wurf>`.",
+        "macro_list": "Deine Makros:",
+        "var_title": "Variablen",
+        "var_desc": "Zahlen, die du in Würfen als `@name` verwendest, etwa Attributsmodifikatoren: `set`, `delete`, `list`.",
+        "var_usage": "Verwendung: `{prefix}var set str 3`, dann `{prefix}roll 1d20+@str`. Außerdem `{prefix}var list` und `{prefix}var delete <name>`.",
+        "var_invalid_name": "Ungültiger Variablenname. Verwende einen Kleinbuchstaben, gefolgt von höchstens 31 Kleinbuchstaben, Ziffern oder `_`.",
+        "var_invalid": "Ungültige Variable: {error}",
+        "var_saved": "Variable `@{name}` auf `{value}` gesetzt.",
+        "var_deleted": "Variable `@{name}` gelöscht.",
+        "var_not_found": "Du hast keine Variable namens `@{name}`. Siehe `{prefix}var list`.",
+        "var_none": "Du hast noch keine Variablen. Lege eine mit `{prefix}var set <name> <zahl>` an.",
+        "var_list": "Deine Variablen:",
+        "init_title": "Initiative",
+        "init_desc": "Würfle die Initiative aller Kämpfer in einer Nachricht und geh dann die Züge durch: `next`, `show`, `end`.",
+        "init_usage": "Verwendung: `{prefix}init Goblin:+2 Ork:+1 Alice:+5`, dann `{prefix}init next`. Außerdem `{prefix}init show` und `{prefix}init end`.",
+        "init_invalid": "Ungültige Initiative: {error}",
+        "init_none": "In diesem Kanal läuft keine Initiative. Starte eine mit `{prefix}init Name:+2 ...`.",
+        "init_turn": "Runde {round}: **{name}** ({total}) ist am Zug.",
+        "init_round": "Runde {round}",
+        "init_ended": "Initiative beendet.",
         "guild_only": "Dieser Befehl kann nur in einem Server verwendet werden.",
         "missing_permission": "Du hast keine Berechtigung für diesen Befehl.",
         "command_cooldown": "Befehl im Cooldown. Versuche es in {seconds:.1f}s erneut.",
@@ -166,7 +385,7 @@ _TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "help_description": "Esta es la lista de los comandos disponibles.",
         "help_footer": "Contacta a core.layer para cualquier comentario ❤️",
         "roll_title": "Lanzar Dados",
-        "roll_desc": "Lanza dados con una expresión como 2d6+3. Puedes añadir un nombre de objetivo.",
+        "roll_desc": "Lanza dados con una expresión como 2d6+3, 4d6kh3, 1d6!, 2d6r1 o 10d10>=7 (cuenta éxitos). Puedes añadir un nombre de objetivo. Varias tiradas a la vez con `6x 4d6` o `1d20+5; 2d6+3`.",
         "setcolor_title": "Configurar Color",
         "setcolor_desc": "Elige tu color preferido para los embeds.",
         "getcolor_title": "Obtener Color",
@@ -182,6 +401,8 @@ _TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "embed_dice": "Dados",
         "embed_modifiers": "Modificadores",
         "embed_rolled_by": "Lanzado por",
+        "embed_histogram": "Caras obtenidas",
+        "embed_successes": "éxitos",
         "rollshort_title": "Tiradas Compactas",
         "rollshort_desc": "Activa/desactiva la salida compacta de tiradas para ti.",
         "rollshort_on": "Salida compacta **activada**.",
@@ -201,8 +422,79 @@ _TRANSLATIONS: Final[dict[str, dict[str, str]]] = {
         "defaultroll_invalid": "Expresión no válida: {error}",
         "defaultroll_set": "La tirada por defecto del servidor es ahora `{expression}`.",
         "defaultroll_missing": "No hay tirada por defecto. Proporciona una expresión o usa `{prefix}defaultRoll`.",
-        "roll_input_too_long": "Entrada demasiado larga. Límite: 100 caracteres.",
+        "roll_input_too_long": "Entrada demasiado larga. Límite: {limit} caracteres.",
         "roll_invalid": "Expresión no válida: {error}",
+        "roll_too_expensive": "Esa tirada es demasiado grande. Prueba con menos dados o menos tiradas a la vez.",
+        "roll_output_too_large": "El resultado de esa tirada es demasiado largo para mostrarlo. Prueba con menos términos de dados.",
+        "roll_over_budget": "Estás tirando demasiado. Inténtalo de nuevo en {seconds:.0f}s.",
+        "odds_title": "Probabilidades",
+        "odds_desc": "Estadísticas exactas de una expresión: rango, media, dispersión, percentiles y la probabilidad de alcanzar un total.",
+        "odds_range": "Rango",
+        "odds_mean": "Media",
+        "odds_stddev": "Desviación típica",
+        "odds_percentiles": "Percentiles",
+        "odds_at_least": "Probabilidad de {value} o más",
+        "odds_too_large": "Demasiados resultados posibles para un cálculo exacto. Prueba con menos dados o caras.",
+        "odds_usage": "Uso: `{prefix}odds 2d6+3 >= 10`.",
+        "simulate_title": "Simulación",
+        "simulate_desc": "Tira una expresión hasta 1.000.000 de veces y muestra la distribución de los resultados.",
+        "simulate_progress": "Simulando {trials} tiradas de `{expression}`… {percent}%",
+        "simulate_histogram": "Resultados",
+        "simulate_too_large": "Esa simulación es demasiado grande (como máximo {max} tiradas, menos para expresiones grandes).",
+        "simulate_busy": "Ya tienes una simulación en curso.",
+        "simulate_timeout": "La simulación tardó demasiado y se detuvo. Prueba con menos tiradas.",
+        "simulate_queue_full": "Hay demasiadas simulaciones en curso. Inténtalo de nuevo en un momento.",
+        "simulate_failed": "La simulación falló. Inténtalo de nuevo.",
+        "table_title": "Tablas aleatorias",
+        "table_desc": "Tablas aleatorias ponderadas del servidor: `add` y `remove` (requiere `manage_guild`), `list`, `show`, `roll <nombre> [cantidad]`. Las entradas se separan con `|`, con un peso opcional al principio.",
+        "table_usage": "Uso: `{prefix}table roll <nombre> [cantidad]`, `{prefix}table list`, `{prefix}table show <nombre>`, `{prefix}table add <nombre> 3 Oro | 1 Gema`, `{prefix}table remove <nombre>`.",
+        "table_invalid_name": "Nombre de tabla no válido. Usa de 1 a 32 letras minúsculas, dígitos, `-` o `_`.",
+        "table_invalid": "Tabla no válida: {error}",
+        "table_saved": "Tabla `{name}` guardada con {count} entradas.",
+        "table_removed": "Tabla `{name}` eliminada.",
+        "table_not_found": "No hay ninguna tabla llamada `{name}` en este servidor.",
+        "table_none": "Este servidor aún no tiene tablas.",
+        "table_list": "Tablas: {names}",
+        "table_more": "…y {count} más",
+        "table_draws_invalid": "Puedes sacar entre 1 y {max} veces a la vez.",
+        "deck_title": "Mazos de cartas",
+        "deck_desc": "Un mazo de cartas por canal, sin reposición: `new [standard|jokers|tarot]`, `draw [cantidad]`, `shuffle` (devuelve todas las cartas).",
+        "deck_usage": "No hay mazo en este canal. Empieza uno con `{prefix}deck new` (standard, jokers o tarot).",
+        "deck_none": "No hay mazo en este canal. Empieza uno con `{prefix}deck new`.",
+        "deck_new": "Nuevo mazo **{kind}** barajado: {size} cartas.",
+        "deck_unknown": "Mazo desconocido. Disponibles: {kinds}.",
+        "deck_shuffled": "Las {size} cartas han vuelto al mazo, barajadas.",
+        "deck_status": "Mazo {kind}: quedan {remaining}/{size} cartas",
+        "deck_too_few": "Solo quedan {remaining} cartas. Usa `{prefix}deck shuffle` para devolverlas todas.",
+        "deck_draws_invalid": "Puedes robar entre 1 y {max} cartas a la vez.",
+        "macro_title": "Macros",
+        "macro_desc": "Guarda las tiradas que repites y lánzalas con `@nombre`, solas o en lote: `save`, `delete`, `list`.",
+        "macro_usage": "Uso: `{prefix}macro save atk 1d20+7 Goblin`, luego `{prefix}roll @atk`. También `{prefix}macro list` y `{prefix}macro delete <nombre>`.",
+        "macro_invalid_name": "Nombre de macro no válido. Usa de 1 a 32 letras minúsculas, dígitos, `-` o `_`.",
+        "macro_invalid": "Macro no válida: {error}",
+        "macro_saved": "Macro `@{name}` guardada: `{expression}`.",
+        "macro_deleted": "Macro `@{name}` eliminada.",
+        "macro_not_found": "No tienes ninguna macro llamada `@{name}`. Consulta `{prefix}macro list`.",
+        "macro_none": "Aún no tienes macros. Guarda una con `{prefix}macro save <nombre> <tirada>`.",
+        "macro_list": "Tus macros:",
+        "var_title": "Variables",
+        "var_desc": "Números que usas en tus tiradas como `@nombre`, como tus modificadores: `set`, `delete`, `list`.",
+        "var_usage": "Uso: `{prefix}var set fue 3`, luego `{prefix}roll 1d20+@fue`. También `{prefix}var list` y `{prefix}var delete <nombre>`.",
+        "var_invalid_name": "Nombre de variable no válido. Usa una letra minúscula seguida de hasta 31 letras minúsculas, dígitos o `_`.",
+        "var_invalid": "Variable no válida: {error}",
+        "var_saved": "Variable `@{name}` establecida en `{value}`.",
+        "var_deleted": "Variable `@{name}` eliminada.",
+        "var_not_found": "No tienes ninguna variable llamada `@{name}`. Consulta `{prefix}var list`.",
+        "var_none": "Aún no tienes variables. Crea una con `{prefix}var set <nombre> <número>`.",
+        "var_list": "Tus variables:",
+        "init_title": "Iniciativa",
+        "init_desc": "Tira la iniciativa de todos los combatientes en un solo mensaje y luego avanza los turnos: `next`, `show`, `end`.",
+        "init_usage": "Uso: `{prefix}init Goblin:+2 Orco:+1 Alice:+5`, luego `{prefix}init next`. También `{prefix}init show` y `{prefix}init end`.",
+        "init_invalid": "Iniciativa no válida: {error}",
+        "init_none": "No hay iniciativa en curso en este canal. Empieza una con `{prefix}init Nombre:+2 ...`.",
+        "init_turn": "Ronda {round}: actúa **{name}** ({total}).",
+        "init_round": "Ronda {round}",
+        "init_ended": "Iniciativa terminada.",
         "guild_only": "Este comando solo se puede usar en un servidor.",
         "missing_permission": "No tienes permiso para usar este comando.",
         "command_cooldown": "Comando en enfriamiento. Inténtalo en {seconds:.1f}s.",
@@ -0,0 +1,89 @@
+"""Per-user numeric variables (``!var set str 3``) used as ``@str`` in rolls.
+
+The parser substitutes ``@name`` with the variable's value while scanning,
+so a roll that references variables compiles to an ordinary plan whose
+modifiers already hold the constants. Such plans depend on their owner's
+variables, not just the input text, so they are kept in ``UserPlanCache``
+keyed by ``(user, version, input)``: bumping a user's version when a
+variable changes invalidates all of their plans in O(1), and the stale
+entries age out of the LRU. Versions are kept for at most ``maxsize``
+users; past that the whole cache is dropped and versions start over.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Mapping
+
+from .cache import CacheStats, LRUCache
+from .roll_plan import RollPlan
+
+MAX_VARIABLES_PER_USER = 50
+MAX_VARIABLE_VALUE = 99999
+DEFAULT_CACHE_SIZE = 1024
+
+# No ``-``: ``@str-2`` must read as the variable minus 2.
+_NAME_PATTERN = re.compile(r"^[a-z][a-z0-9_]{0,31}$")
+
+# (plan, expression_str, target) for one roll input.
+ResolvedInput = tuple[RollPlan, str, str | None]
+
+
+class VariableError(ValueError):
+    """Invalid variable name or value."""
+
+
+def is_valid_variable_name(name: str) -> bool:
+    return bool(_NAME_PATTERN.match(name))
+
+
+def validate_variable(name: str, value: int) -> None:
+    """Raises VariableError if ``name`` or ``value`` is out of bounds."""
+    if not is_valid_variable_name(name):
+        raise VariableError(f"invalid variable name: {name!r}")
+    if not -MAX_VARIABLE_VALUE <= value <= MAX_VARIABLE_VALUE:
+        raise VariableError(f"value must be between -{MAX_VARIABLE_VALUE} and {MAX_VARIABLE_VALUE}")
+
+
+def clean_variables(raw: object) -> dict[str, int]:
+    """Keep the valid ``name -> int`` pairs of a stored mapping."""
+    if not isinstance(raw, Mapping):
+        return {}
+    cleaned: dict[str, int] = {}
+    for name, value in raw.items():
+        if isinstance(name, str) and isinstance(value, int) and not isinstance(value, bool):
+            try:
+                validate_variable(name, value)
+            except VariableError:
+                continue
+            cleaned[name] = value
+    return cleaned
+
+
+class UserPlanCache:
+    """Compiled plans for roll inputs that reference a user's variables."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self._maxsize = maxsize
+        self._plans: LRUCache[tuple[int, int, str], ResolvedInput] = LRUCache(maxsize)
+        self._versions: dict[int, int] = {}
+
+    def get(self, user_id: int, raw: str) -> ResolvedInput | None:
+        return self._plans.get((user_id, self._versions.get(user_id, 0), raw))
+
+    def put(self, user_id: int, raw: str, resolved: ResolvedInput) -> None:
+        self._plans.put((user_id, self._versions.get(user_id, 0), raw), resolved)
+
+    def invalidate(self, user_id: int) -> None:
+        if user_id not in self._versions and len(self._versions) >= self._maxsize:
+            # Forgetting a version could revive a stale plan; start over instead.
+            self.clear()
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def clear(self) -> None:
+        self._plans.clear()
+        self._versions.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._plans.stats
@@ -0,0 +1,76 @@
+"""Tests for cost-based admission control."""
+
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from sirrmizan.admission import Admission, TokenBuckets
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBuckets:
+    def test_starts_full_and_refills_over_the_window(self) -> None:
+        clock = _Clock()
+        buckets = TokenBuckets(600, window=60.0, clock=clock)
+        assert buckets.wait_time(1, 600) == 0
+        buckets.charge(1, 600)
+        # 10 units per second.
+        assert buckets.wait_time(1, 100) == pytest.approx(10.0)
+        clock.now += 5
+        assert buckets.wait_time(1, 100) == pytest.approx(5.0)
+        clock.now += 5
+        assert buckets.wait_time(1, 100) == 0
+
+    def test_refill_is_capped_at_budget(self) -> None:
+        clock = _Clock()
+        buckets = TokenBuckets(100, clock=clock)
+        clock.now += 3600
+        buckets.charge(1, 100)
+        assert buckets.wait_time(1, 1) > 0
+
+    def test_cost_over_budget_never_fits(self) -> None:
+        assert TokenBuckets(100).wait_time(1, 101) == math.inf
+
+    def test_keys_are_independent(self) -> None:
+        buckets = TokenBuckets(100, clock=_Clock())
+        buckets.charge(1, 100)
+        assert buckets.wait_time(2, 100) == 0
+
+    def test_zero_budget_disables(self) -> None:
+        buckets = TokenBuckets(0)
+        buckets.charge(1, 10**9)
+        assert buckets.wait_time(1, 10**9) == 0
+
+    def test_rejects_negative_budget(self) -> None:
+        with pytest.raises(ValueError):
+            TokenBuckets(-1)
+
+
+class TestAdmission:
+    def test_charges_user_and_guild(self) -> None:
+        admission = Admission(user_budget=100, guild_budget=150, clock=_Clock())
+        assert admission.admit(1, 9, 100) == 0
+        assert admission.admit(1, 9, 10) > 0  # user exhausted
+        assert admission.admit(2, 9, 50) == 0
+        assert admission.admit(3, 9, 10) > 0  # guild exhausted
+        assert admission.admit(3, None, 10) == 0  # DMs only use the user budget
+
+    def test_rejection_charges_nothing(self) -> None:
+        admission = Admission(user_budget=100, guild_budget=100, clock=_Clock())
+        admission.admit(1, 9, 60)
+        assert admission.admit(2, 9, 60) > 0
+        # User 2's bucket is still full.
+        assert admission.admit(2, None, 100) == 0
+
+    def test_oversized_cost(self) -> None:
+        admission = Admission(user_budget=100, guild_budget=0)
+        assert admission.admit(1, 9, 1000) == math.inf
@@ -0,0 +1,69 @@
+"""Tests for the LRU cache."""
+
+from __future__ import annotations
+
+import pytest
+
+from sirrmizan.cache import CacheStats, LRUCache
+
+
+def test_miss_then_hit() -> None:
+    cache: LRUCache[str, int] = LRUCache(4)
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 1, 0)
+
+
+def test_evicts_least_recently_used() -> None:
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" is now the oldest
+    cache.put("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.stats.evictions == 1
+
+
+def test_put_existing_key_refreshes_without_eviction() -> None:
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+    assert cache.get("a") == 10
+    assert "b" not in cache
+
+
+def test_zero_size_disables_cache() -> None:
+    cache: LRUCache[str, int] = LRUCache(0)
+    cache.put("a", 1)
+    assert len(cache) == 0
+    assert cache.get("a") is None
+    assert cache.stats.misses == 1
+
+
+def test_negative_size_rejected() -> None:
+    with pytest.raises(ValueError):
+        LRUCache(-1)
+
+
+def test_clear_keeps_counters() -> None:
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats.hits == 1
+
+
+def test_stats_hit_rate_and_sum() -> None:
+    a = CacheStats(hits=3, misses=1, evictions=0, size=2, maxsize=8)
+    b = CacheStats(hits=1, misses=3, evictions=2, size=4, maxsize=8)
+    total = a + b
+    assert total == CacheStats(hits=4, misses=4, evictions=2, size=6, maxsize=16)
+    assert total.hit_rate == 0.5
+    assert CacheStats(0, 0, 0, 0, 0).hit_rate == 0.0
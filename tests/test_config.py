@@ -25,6 +25,11 @@ def _isolate_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
         "SIRRMIZAN_LOG_DIR",
         "SIRRMIZAN_SAVE_INTERVAL",
         "SIRRMIZAN_LOG_LEVEL",
+        "SIRRMIZAN_PARSE_CACHE_SIZE",
+        "SIRRMIZAN_RNG_BACKEND",
+        "SIRRMIZAN_STORAGE_BACKEND",
+        "SIRRMIZAN_USER_ROLL_BUDGET",
+        "SIRRMIZAN_GUILD_ROLL_BUDGET",
         "SIRRMIZAN_CONFIG",
     ):
         monkeypatch.delenv(key, raising=False)
@@ -85,6 +90,61 @@ def test_invalid_log_level(monkeypatch: pytest.MonkeyPatch) -> None:
         load_config()
 
 
+def test_parse_cache_size_default_and_override(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SIRRMIZAN_TOKEN", "abc")
+    assert load_config().parse_cache_size == 1024
+    monkeypatch.setenv("SIRRMIZAN_PARSE_CACHE_SIZE", "0")
+    assert load_config().parse_cache_size == 0
+
+
+@pytest.mark.parametrize("value", ["-1", "lots"])
+def test_invalid_parse_cache_size(monkeypatch: pytest.MonkeyPatch, value: str) -> None:
+    monkeypatch.setenv("SIRRMIZAN_TOKEN", "abc")
+    monkeypatch.setenv("SIRRMIZAN_PARSE_CACHE_SIZE", value)
+    with pytest.raises(ConfigError):
+        load_config()
+
+
+def test_rng_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SIRRMIZAN_TOKEN", "abc")
+    assert load_config().rng_backend == "system"
+    monkeypatch.setenv("SIRRMIZAN_RNG_BACKEND", "Buffered")
+    assert load_config().rng_backend == "buffered"
+    monkeypatch.setenv("SIRRMIZAN_RNG_BACKEND", "mersenne")
+    with pytest.raises(ConfigError):
+        load_config()
+
+
+def test_storage_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SIRRMIZAN_TOKEN", "abc")
+    assert load_config().storage_backend == "json"
+    monkeypatch.setenv("SIRRMIZAN_STORAGE_BACKEND", "SQLite")
+    assert load_config().storage_backend == "sqlite"
+    monkeypatch.setenv("SIRRMIZAN_STORAGE_BACKEND", "journal")
+    assert load_config().storage_backend == "journal"
+    monkeypatch.setenv("SIRRMIZAN_STORAGE_BACKEND", "redis")
+    with pytest.raises(ConfigError):
+        load_config()
+
+
+def test_roll_budgets(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SIRRMIZAN_TOKEN", "abc")
+    cfg = load_config()
+    assert (cfg.user_roll_budget, cfg.guild_roll_budget) == (20_000, 100_000)
+    monkeypatch.setenv("SIRRMIZAN_USER_ROLL_BUDGET", "0")
+    monkeypatch.setenv("SIRRMIZAN_GUILD_ROLL_BUDGET", "5000")
+    cfg = load_config()
+    assert (cfg.user_roll_budget, cfg.guild_roll_budget) == (0, 5000)
+
+
+@pytest.mark.parametrize("value", ["-5", "1e4"])
+def test_invalid_roll_budget(monkeypatch: pytest.MonkeyPatch, value: str) -> None:
+    monkeypatch.setenv("SIRRMIZAN_TOKEN", "abc")
+    monkeypatch.setenv("SIRRMIZAN_GUILD_ROLL_BUDGET", value)
+    with pytest.raises(ConfigError, match="SIRRMIZAN_GUILD_ROLL_BUDGET"):
+        load_config()
+
+
 def test_creates_data_and_log_dirs(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
     monkeypatch.setenv("SIRRMIZAN_TOKEN", "abc")
     monkeypatch.setenv("SIRRMIZAN_DATA_DIR", str(tmp_path / "d"))
@@ -0,0 +1,102 @@
+"""Tests for card decks."""
+
+from __future__ import annotations
+
+from array import array
+from collections import Counter
+
+import pytest
+
+from sirrmizan.decks import DECK_KINDS, Deck, DeckError
+from sirrmizan.rng import SystemRng
+
+
+class _ZeroRng:
+    """``randbelow`` always returns 0 and records each bound."""
+
+    def __init__(self) -> None:
+        self.bounds: list[int] = []
+
+    def random(self) -> float:
+        return 0.0
+
+    def randbelow(self, n: int) -> int:
+        self.bounds.append(n)
+        return 0
+
+    def randint(self, a: int, b: int) -> int:
+        return a
+
+    def roll(self, count: int, faces: int) -> list[int]:
+        return [1] * count
+
+
+class TestDeck:
+    @pytest.mark.parametrize(("kind", "size"), [("standard", 52), ("jokers", 54), ("tarot", 78)])
+    def test_new_is_a_permutation(self, kind: str, size: int) -> None:
+        deck = Deck.new(kind, SystemRng())
+        assert (deck.size, deck.remaining, deck.cursor) == (size, size, 0)
+        assert sorted(deck.order) == list(range(size))
+
+    def test_unknown_kind(self) -> None:
+        with pytest.raises(DeckError):
+            Deck.new("uno", SystemRng())
+
+    def test_shuffle_is_one_fisher_yates_pass(self) -> None:
+        rng = _ZeroRng()
+        deck = Deck.new("standard", rng)
+        assert rng.bounds == list(range(52, 1, -1))
+        assert sorted(deck.order) == list(range(52))
+
+    def test_draw_without_replacement(self) -> None:
+        deck = Deck.new("standard", SystemRng())
+        drawn = deck.draw(5) + deck.draw(47)
+        assert sorted(drawn) == list(range(52))
+        assert deck.remaining == 0
+        with pytest.raises(DeckError):
+            deck.draw()
+
+    def test_shuffle_puts_cards_back(self) -> None:
+        deck = Deck.new("tarot", SystemRng())
+        deck.draw(10)
+        deck.shuffle(SystemRng())
+        assert deck.remaining == 78
+        assert sorted(deck.order) == list(range(78))
+
+    def test_shuffle_is_uniform(self) -> None:
+        # First card of a 4-card deck over 8000 shuffles: ~2000 each.
+        deck = Deck("standard", array("H", range(4)))
+        rng = SystemRng()
+        firsts: Counter[int] = Counter()
+        for _ in range(8000):
+            deck.shuffle(rng)
+            firsts[deck.order[0]] += 1
+        assert all(1700 <= n <= 2300 for n in firsts.values())
+
+    def test_card_names(self) -> None:
+        assert DECK_KINDS["standard"][0] == "A♠"
+        assert DECK_KINDS["tarot"][0] == "The Fool"
+        assert DECK_KINDS["tarot"][-1] == "King of Pentacles"
+        assert len(set(DECK_KINDS["tarot"])) == 78
+
+
+class TestDeckJson:
+    def test_round_trip(self) -> None:
+        deck = Deck.new("jokers", SystemRng())
+        deck.draw(3)
+        copy = Deck.from_json(deck.to_json())
+        assert copy == deck
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            None,
+            {"kind": "uno", "order": [0], "cursor": 0},
+            {"kind": "standard", "order": list(range(51)), "cursor": 0},
+            {"kind": "standard", "order": [0] * 52, "cursor": 0},
+            {"kind": "standard", "order": list(range(52)), "cursor": 53},
+            {"kind": "standard", "order": list(range(52)), "cursor": True},
+        ],
+    )
+    def test_malformed(self, data: object) -> None:
+        assert Deck.from_json(data) is None
@@ -0,0 +1,174 @@
+"""Tests for the dice cog: input resolution and message building."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+import discord
+
+from sirrmizan.cogs.dice import DiceCog
+from sirrmizan.dice_parser import parse
+from sirrmizan.engine import roll_many
+from sirrmizan.macros import MacroCache
+from sirrmizan.rng import SystemRng
+from sirrmizan.roll_plan import PlanCache, compile_plan
+from sirrmizan.variables import UserPlanCache
+
+_AUTHOR: Any = SimpleNamespace(id=1, display_name="Tester", avatar=None)
+
+
+def _cog() -> DiceCog:
+    state = SimpleNamespace(get_user_color_hex=lambda user_id: 0x3498DB)
+    bot: Any = SimpleNamespace(state=state)
+    return DiceCog(bot)
+
+
+def _fits(embed: discord.Embed) -> bool:
+    return (
+        len(embed) <= 6000
+        and len(embed.fields) <= 25
+        and all(len(field.value) <= 1024 for field in embed.fields)
+    )
+
+
+def _single_embed(expression: str) -> discord.Embed:
+    (result,) = roll_many([compile_plan(parse(expression))], SystemRng())
+    return _cog()._build_embed(
+        _AUTHOR,
+        total=result.total,
+        expression_str=expression,
+        terms=result.terms,
+        modifiers=result.modifiers,
+        target_name=None,
+        lang="en",
+        histograms=result.histograms,
+    )
+
+
+class TestEmbed:
+    def test_histograms_and_modifiers_kept_when_they_fit(self) -> None:
+        embed = _single_embed("1000d20+3")
+        assert [field.name for field in embed.fields][1:] == ["Faces rolled `1000d20`", "Modifiers"]
+        assert _fits(embed)
+
+    def test_histograms_dropped_past_embed_limit(self) -> None:
+        embed = _single_embed("+".join(["1000d20"] * 12) + "+1")
+        assert _fits(embed)
+        assert embed.fields[-1].name == "Modifiers"
+        assert 1 < len(embed.fields) < 14
+
+    def test_long_dice_field_clipped(self) -> None:
+        embed = _single_embed("+".join(["50d99999"] * 11))
+        assert _fits(embed)
+        assert embed.fields[0].value.endswith("…")
+
+
+class TestBatchEmbed:
+    def test_breakdowns_kept_when_they_fit(self) -> None:
+        plans = [compile_plan(parse("2d6+3"))] * 3
+        rolls = [("2d6+3", None, result) for result in roll_many(plans, SystemRng())]
+        embed = _cog()._build_batch_embed(_AUTHOR, rolls=rolls, lang="en")
+        assert len(embed.fields) == 3
+        assert all("(2d6=" in field.value for field in embed.fields)
+
+    def test_breakdowns_dropped_past_embed_limit(self) -> None:
+        plans = [compile_plan(parse("50d99999"))] * 20
+        rolls = [("50d99999", None, result) for result in roll_many(plans, SystemRng())]
+        embed = _cog()._build_batch_embed(_AUTHOR, rolls=rolls, lang="en")
+        assert _fits(embed)
+        assert len(embed.fields) == 20
+        assert all(
+            field.value == f"**{result.total}**"
+            for field, (_, _, result) in zip(embed.fields, rolls, strict=True)
+        )
+
+
+class TestAdmit:
+    def _admit(self, expression: str) -> tuple[str | None, list[int]]:
+        charged: list[int] = []
+        cog = _cog()
+        cog.bot.admission = SimpleNamespace(
+            admit=lambda user_id, guild_id, cost: charged.append(cost) or 0.0
+        )
+        plan = compile_plan(parse(expression))
+        error = cog._admit([(plan, expression, None)], author_id=1, guild_id=None, lang="en")
+        return error, charged
+
+    def test_ordinary_roll_charged(self) -> None:
+        error, charged = self._admit("4d6+2")
+        assert error is None
+        assert len(charged) == 1
+
+    def test_oversized_output_refused_before_charging(self) -> None:
+        for expression in ("+".join(["1000d20"] * 24), "+".join(["50d99999"] * 22)):
+            error, charged = self._admit(expression)
+            assert error is not None
+            assert charged == []
+
+
+class TestInlineRolls:
+    async def test_author_on_cooldown_ignored(self) -> None:
+        cog = _cog()
+        cog.bot.config = SimpleNamespace(default_prefix="!")
+        cog.bot.state.get_server_language = lambda guild_id: "en"
+        resolved: list[str] = []
+
+        async def resolve(raw: str, **kwargs: Any) -> tuple[None, str, None, str]:
+            resolved.append(raw)
+            return None, "", None, "invalid"
+
+        cog._resolve_roll = resolve  # type: ignore[method-assign]
+        author = SimpleNamespace(id=1, bot=False)
+        message: Any = SimpleNamespace(content="attack [[1d20+5]]", author=author, guild=None)
+        await cog.inline_rolls(message)
+        await cog.inline_rolls(message)
+        assert resolved == ["1d20+5"]
+        other: Any = SimpleNamespace(
+            content="[[1d4]]", author=SimpleNamespace(id=2, bot=False), guild=None
+        )
+        await cog.inline_rolls(other)
+        assert resolved == ["1d20+5", "1d4"]
+
+
+class TestUserInput:
+    def _resolve(self, raw: str) -> tuple[Any, str, str | None, str | None]:
+        cog = _cog()
+        cog.bot.state.get_user_variables = lambda user_id: {"str": 3}
+        cog.bot.state.get_user_macros = lambda user_id: {"atk": "1d20+@str Goblin"}
+        cog.bot.macro_cache = MacroCache()
+        cog.bot.user_plan_cache = UserPlanCache()
+        cog.bot.plan_cache = PlanCache()
+        return cog._resolve_user_input(raw, user_id=1, lang="en", prefix="!")
+
+    def test_macro(self) -> None:
+        plan, expression_str, target, error = self._resolve("@atk Orc")
+        assert error is None
+        assert (plan.modifier_total, expression_str, target) == (3, "1d20+@str", "Orc")
+
+    def test_variable_minus_constant(self) -> None:
+        plan, expression_str, target, error = self._resolve("@str-2")
+        assert error is None
+        assert (plan.modifier_total, expression_str, target) == (1, "@str-2", None)
+
+    def test_variable_minus_dice(self) -> None:
+        plan, expression_str, _, error = self._resolve("@str-1d4")
+        assert error is None
+        assert expression_str == "@str-1d4"
+        assert (plan.labels, plan.modifier_total) == (("-1d4",), 3)
+
+    def test_variable_inside_expression(self) -> None:
+        plan, _, _, error = self._resolve("1d20+@str-2")
+        assert error is None
+        assert plan.modifier_total == 1
+
+    def test_unknown_name_is_a_missing_macro(self) -> None:
+        for raw in ("@nope", "@nope Orc", "@nope-2"):
+            plan, _, _, error = self._resolve(raw)
+            assert plan is None
+            assert error is not None and "`@nope" in error
+
+    def test_unknown_variable_in_expression(self) -> None:
+        plan, _, _, error = self._resolve("1d20+@dex")
+        assert plan is None
+        assert error is not None and "@dex" in error
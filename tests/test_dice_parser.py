@@ -2,14 +2,28 @@
 
 from __future__ import annotations
 
+import pickle
+import random
+
 import pytest
 
+from benchmarks.reference import quadratic_parse_roll_input, regex_parse
 from sirrmizan.dice_parser import (
+    MAX_BATCH_ROLLS,
+    MAX_EXPRESSION_LENGTH,
     MAX_FACES,
+    MAX_ITEMIZED_ROLLS,
     MAX_ROLLS_PER_TERM,
+    Count,
     DiceParseError,
+    Explode,
+    Keep,
+    ParseCache,
+    Reroll,
+    find_inline_rolls,
     parse,
     parse_roll_input,
+    split_roll_batch,
 )
 
 
@@ -124,7 +138,7 @@ class TestRejectedInputs:
 
     def test_too_long(self) -> None:
         with pytest.raises(DiceParseError):
-            parse("1" + "+1" * 60)
+            parse("1" + "+1" * (MAX_EXPRESSION_LENGTH // 2))
 
     def test_letters_only(self) -> None:
         with pytest.raises(DiceParseError):
@@ -339,9 +353,9 @@ class TestParseRollInput:
 
     # ── Limits & invalid inputs ───────────────────────────────────────
     def test_over_max_rolls_returns_no_expression(self) -> None:
-        expr, expr_str, target = parse_roll_input("100d6")
+        expr, expr_str, target = parse_roll_input("20000d6")
         assert expr is None
-        assert target == "100d6"
+        assert target == "20000d6"
 
     def test_over_max_faces_returns_no_expression(self) -> None:
         expr, expr_str, target = parse_roll_input("1d100000")
@@ -354,9 +368,9 @@ class TestParseRollInput:
         assert target == "0d6"
 
     def test_invalid_second_term_keeps_only_valid_prefix(self) -> None:
-        # ``1d20`` is valid; ``100d6`` exceeds max rolls. Greedy keeps just
+        # ``1d20`` is valid; ``20000d6`` exceeds max rolls. Greedy keeps just
         # the valid first term and pushes the over-limit term to target.
-        assert self._summary("1d20 100d6") == ("1d20", "100d6")
+        assert self._summary("1d20 20000d6") == ("1d20", "20000d6")
 
     def test_invalid_dice_with_letter_suffix(self) -> None:
         # ``5x`` — digit then letter, not a token. Becomes target.
@@ -400,3 +414,324 @@ class TestParseRollInput:
 
     def test_zero_modifier_with_target(self) -> None:
         assert self._summary("+0 Boss") == ("+0", "Boss")
+
+
+class TestScannerMatchesRegexParser:
+    """The hand-written scanner must accept, reject and word errors exactly
+    like the regex parser it replaced."""
+
+    @staticmethod
+    def _outcome(fn, text: str) -> object:
+        try:
+            return fn(text)
+        except DiceParseError as exc:
+            return f"error: {exc}"
+
+    def test_random_inputs(self) -> None:
+        rng = random.Random(4321)
+        alphabet = "0123456789dD+-x ٣"
+        for _ in range(5000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12)))
+            assert self._outcome(parse, text) == self._outcome(regex_parse, text), text
+
+    @pytest.mark.parametrize(
+        "text",
+        ["1d", "5d", "d6", "+", "1d20+", "2d63d6", "10001d6", "1d100000", "0d6", "1d0", "1d6 x"],
+    )
+    def test_error_messages(self, text: str) -> None:
+        assert self._outcome(parse, text) == self._outcome(regex_parse, text)
+
+    def test_unicode_digits_still_accepted(self) -> None:
+        # Fullwidth digits, as typed with some IMEs.
+        assert parse("\uff11d\uff12\uff10") == parse("1d20")
+
+
+class TestSinglePassMatchesReference:
+    """The single-pass splitter must agree with the old quadratic loop."""
+
+    _WORDS = (
+        "1d20", "2d6", "+3", "-2", "5", "+", "-", "++", "1d20+", "2d6-", "1d",
+        "0d6", "20000d6", "1d100000", "2d63d6", "Goblin", "Boss5", "5x", "-1d4",
+        "+0", "1D6", "d6", "1d6+1d4-2",
+    )  # fmt: skip
+
+    def test_random_inputs(self) -> None:
+        rng = random.Random(1234)
+        for _ in range(2000):
+            raw = " ".join(rng.choice(self._WORDS) for _ in range(rng.randint(1, 8)))
+            assert parse_roll_input(raw) == quadratic_parse_roll_input(raw), raw
+
+    def test_length_limit_cuts_prefix(self) -> None:
+        raw = " ".join(["1"] * (MAX_EXPRESSION_LENGTH // 2 + 10)) + " Boss"
+        assert parse_roll_input(raw) == quadratic_parse_roll_input(raw)
+        _, expr_str, _ = parse_roll_input(raw)
+        assert len(expr_str) <= MAX_EXPRESSION_LENGTH
+
+
+class TestDiceOps:
+    @pytest.mark.parametrize(
+        ("text", "op"),
+        [
+            ("4d6kh3", Keep(3, highest=True)),
+            ("4d6k3", Keep(3, highest=True)),
+            ("2d20kl1", Keep(1, highest=False)),
+            ("4d6dl1", Keep(1, highest=False, drop=True)),
+            ("5d6DH2", Keep(2, highest=True, drop=True)),
+            ("1d6!", Explode()),
+            ("2d6r1", Reroll(1)),
+            ("2d6R2", Reroll(2)),
+        ],
+    )
+    def test_parsed_into_nodes(self, text: str, op: object) -> None:
+        (part,) = parse(text).dice
+        assert part.op == op
+
+    def test_ops_mix_with_other_terms(self) -> None:
+        result = parse("4d6kh3+1d6!-2d4r1+3")
+        assert [part.op for part in result.dice] == [Keep(3, highest=True), Explode(), Reroll(1)]
+        assert result.modifiers == (3,)
+
+    def test_drop_normalizes_to_keep(self) -> None:
+        assert Keep(1, highest=False, drop=True).kept(4) == (3, True)
+        assert Keep(2, highest=True, drop=True).kept(5) == (3, False)
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "4d6kh5",
+            "4d6kh0",
+            "4d6dl4",
+            "1d6dh1",
+            "1d1!",
+            "2d6r6",
+            "2d6r0",
+            "2d6r",
+            "4d6kh",
+            "4d6kh3!",
+            "1d6!!",
+            f"{MAX_ITEMIZED_ROLLS + 1}d6kh3",
+            "4d6dx1",
+        ],
+    )
+    def test_invalid_ops(self, text: str) -> None:
+        with pytest.raises(DiceParseError):
+            parse(text)
+
+    def test_roll_input_keeps_target(self) -> None:
+        expr, expr_str, target = parse_roll_input("4d6kh3 + 2 Strength")
+        assert expr is not None and expr.dice[0].op == Keep(3, highest=True)
+        assert (expr_str, target) == ("4d6kh3+2", "Strength")
+
+    def test_stats(self) -> None:
+        # Known values: 4d6kh3 averages 12.24, 2d20kl1 (disadvantage) 7.175.
+        keep = parse("4d6kh3")
+        assert (keep.minimum, keep.maximum) == (3, 18)
+        assert keep.mean == pytest.approx(12.2446, abs=1e-4)
+        assert parse("2d20kl1").mean == pytest.approx(7.175)
+        assert parse("4d6dl1").stats == keep.stats
+        # Rerolling 1s once: (6·20 + 21) / 36 per die.
+        assert parse("2d6r1").mean == pytest.approx(2 * 141 / 36)
+        explode = parse("1d6!")
+        assert explode.maximum == 6 * 11
+        assert explode.mean == pytest.approx(4.2, abs=1e-6)
+
+    def test_large_keep_stats_are_close(self) -> None:
+        # Past the exact-work bound the moments come from order statistics.
+        expr = parse("50d1000kh3")
+        assert expr.mean == pytest.approx(2883.8, rel=0.01)
+
+
+class TestSuccessCounting:
+    @pytest.mark.parametrize(
+        ("text", "op", "successes"),
+        [
+            ("10d10>=7", Count(">=", 7), 4),
+            ("6d6=6", Count("=", 6), 1),
+            ("5d6>4", Count(">", 4), 2),
+            ("3d20<=5", Count("<=", 5), 5),
+            ("3d20<2", Count("<", 2), 1),
+        ],
+    )
+    def test_parsed_into_nodes(self, text: str, op: Count, successes: int) -> None:
+        (part,) = parse(text).dice
+        assert part.op == op
+        assert op.successes(part.faces) == successes
+        assert str(op) == text[text.index(op.compare) :]
+
+    @pytest.mark.parametrize(
+        "text", ["10d10>=", "10d10>=11", "6d6=0", "6d6>6", "6d6<1", "6d6>=1r1", "4d6kh3>=4"]
+    )
+    def test_invalid_targets(self, text: str) -> None:
+        with pytest.raises(DiceParseError):
+            parse(text)
+
+    def test_large_pools_allowed(self) -> None:
+        (part,) = parse(f"{MAX_ROLLS_PER_TERM}d10>=7").dice
+        assert part.rolls == MAX_ROLLS_PER_TERM
+
+    def test_stats_are_binomial(self) -> None:
+        expr = parse("10d10>=7+1")
+        assert (expr.minimum, expr.maximum) == (1, 11)
+        assert expr.mean == pytest.approx(10 * 0.4 + 1)
+        assert expr.variance == pytest.approx(10 * 0.4 * 0.6)
+
+
+_VARIABLES = {"str": 3, "dex": -1}
+
+
+class TestVariables:
+    def test_substituted_as_modifiers(self) -> None:
+        expr = parse("1d20+@str-@dex", _VARIABLES)
+        assert expr == parse("1d20+3+1")
+
+    def test_spaced_input_with_target(self) -> None:
+        expr, expression_str, target = parse_roll_input("1d20 + @str Goblin", _VARIABLES)
+        assert expr == parse("1d20+3")
+        assert (expression_str, target) == ("1d20+@str", "Goblin")
+
+    @pytest.mark.parametrize(
+        ("text", "error"),
+        [
+            ("1d20+@wis", "unknown variable"),
+            ("1d20@str", "missing sign"),
+            ("1d20+@", "missing variable name"),
+        ],
+    )
+    def test_rejected(self, text: str, error: str) -> None:
+        with pytest.raises(DiceParseError, match=error):
+            parse(text, _VARIABLES)
+
+    def test_without_variables_is_unknown(self) -> None:
+        with pytest.raises(DiceParseError, match="unknown variable"):
+            parse("1d20+@str")
+
+
+class TestStats:
+    def test_range_and_moments(self) -> None:
+        # Per die: mean (f+1)/2, variance (f²-1)/12.
+        expr = parse("3d8-1d6+2")
+        assert (expr.minimum, expr.maximum) == (3 - 6 + 2, 24 - 1 + 2)
+        assert expr.mean == pytest.approx(3 * 4.5 - 3.5 + 2)
+        assert expr.variance == pytest.approx(3 * 63 / 12 + 35 / 12)
+        assert expr.modifier_total == 2
+
+    def test_modifier_only(self) -> None:
+        expr = parse("+7-2")
+        assert (expr.minimum, expr.maximum, expr.mean, expr.variance) == (5, 5, 5.0, 0.0)
+        assert expr.cost.draws == 0
+
+    def test_computed_once(self) -> None:
+        expr = parse("2d6+3")
+        assert expr.stats is expr.stats
+        assert expr.cost is expr.stats.cost
+
+    def test_not_part_of_equality_or_hash(self) -> None:
+        warm = parse("2d6+3")
+        _ = warm.stats
+        cold = parse("2d6+3")
+        assert warm == cold
+        assert hash(warm) == hash(cold)
+        assert {warm: 1}[cold] == 1
+
+    def test_survives_pickling(self) -> None:
+        expr = parse("4d6+1")
+        _ = expr.stats
+        copy = pickle.loads(pickle.dumps(expr))
+        assert copy == expr
+        assert copy.stats == expr.stats
+
+
+class TestParseCache:
+    def test_parse_returns_cached_object(self) -> None:
+        cache = ParseCache(maxsize=8)
+        first = cache.parse("1d20+5")
+        second = cache.parse("1d20+5")
+        assert first is second
+        assert first == parse("1d20+5")
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_parse_errors_are_not_cached(self) -> None:
+        cache = ParseCache(maxsize=8)
+        for _ in range(2):
+            with pytest.raises(DiceParseError):
+                cache.parse("1d0")
+        assert cache.stats.size == 0
+
+    def test_parse_roll_input_matches_uncached(self) -> None:
+        cache = ParseCache(maxsize=8)
+        for raw in ("1d20 +2d6 +4 Goblin", "Goblin", "", "1d20 20000d6"):
+            assert cache.parse_roll_input(raw) == parse_roll_input(raw)
+            assert cache.parse_roll_input(raw) == parse_roll_input(raw)
+        assert cache.stats.hits == 4
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = ParseCache(maxsize=2)
+        cache.parse("1d20")
+        cache.parse("2d6")
+        cache.parse("1d20")
+        cache.parse("1d4")
+        assert cache.stats.evictions == 1
+        cache.parse("1d20")
+        assert cache.stats.hits == 2
+
+    def test_zero_size_disables_caching(self) -> None:
+        cache = ParseCache(maxsize=0)
+        cache.parse("1d20")
+        cache.parse("1d20")
+        assert cache.stats.hits == 0
+        assert cache.stats.misses == 2
+
+
+class TestSplitRollBatch:
+    def test_plain_input_is_one_item(self) -> None:
+        assert split_roll_batch("1d20+5 Goblin") == [(1, "1d20+5 Goblin")]
+
+    def test_empty_input_is_one_empty_item(self) -> None:
+        # Empty input still rolls once (the server default roll).
+        assert split_roll_batch("") == [(1, "")]
+
+    def test_repeat_prefix(self) -> None:
+        assert split_roll_batch("6x 4d6") == [(6, "4d6")]
+        assert split_roll_batch("3X1d20+2 Orc") == [(3, "1d20+2 Orc")]
+
+    def test_repeat_needs_a_separator_or_dice(self) -> None:
+        # ``2xd6`` / ``2xGoblin`` are not repeat prefixes.
+        assert split_roll_batch("2xGoblin") == [(1, "2xGoblin")]
+
+    def test_semicolon_separated(self) -> None:
+        assert split_roll_batch("1d20+5 Sword; 2d6+3 Damage") == [
+            (1, "1d20+5 Sword"),
+            (1, "2d6+3 Damage"),
+        ]
+
+    def test_mixed_and_blank_segments(self) -> None:
+        assert split_roll_batch("2x 1d20;; 1d8;") == [(2, "1d20"), (1, "1d8")]
+
+    def test_zero_repeat_rejected(self) -> None:
+        with pytest.raises(DiceParseError, match="repeat count"):
+            split_roll_batch("0x 1d20")
+
+    def test_batch_limit(self) -> None:
+        assert split_roll_batch(f"{MAX_BATCH_ROLLS}x 1d6") == [(MAX_BATCH_ROLLS, "1d6")]
+        with pytest.raises(DiceParseError, match="too many rolls"):
+            split_roll_batch(f"{MAX_BATCH_ROLLS}x 1d6; 1d4")
+
+
+class TestFindInlineRolls:
+    def test_spans_in_order(self) -> None:
+        text = "I swing [[1d20+5]] and hit for [[ 2d6+3 Fire ]]!"
+        assert find_inline_rolls(text) == ["1d20+5", "2d6+3 Fire"]
+
+    @pytest.mark.parametrize(
+        "text", ["no rolls here", "[1d20]", "[[]]", "[[   ]]", "[[1d20", "[[a[b]]", "]]1d20[["]
+    )
+    def test_no_spans(self, text: str) -> None:
+        assert find_inline_rolls(text) == []
+
+    def test_capped(self) -> None:
+        text = "[[1d6]]" * (MAX_BATCH_ROLLS + 5)
+        assert len(find_inline_rolls(text)) == MAX_BATCH_ROLLS
+
+    def test_overlong_span_ignored(self) -> None:
+        assert find_inline_rolls(f"[[{'1' * (MAX_EXPRESSION_LENGTH + 1)}]]") == []
@@ -0,0 +1,170 @@
+"""Tests for sirrmizan.distribution."""
+
+from __future__ import annotations
+
+import itertools
+import math
+from collections import Counter
+
+import pytest
+
+from sirrmizan.dice_parser import MAX_EXPLOSION_DEPTH, parse
+from sirrmizan.distribution import (
+    MAX_DISTRIBUTION_WORK,
+    DistributionCache,
+    DistributionTooLarge,
+    estimated_work,
+)
+
+
+def _brute_force(expression: str) -> Counter[int]:
+    expr = parse(expression)
+    dice = [(part.faces, part.sign) for part in expr.dice for _ in range(part.rolls)]
+    totals: Counter[int] = Counter()
+    for faces_rolled in itertools.product(*(range(1, faces + 1) for faces, _ in dice)):
+        value = sum(sign * r for (_, sign), r in zip(dice, faces_rolled, strict=True))
+        totals[value + expr.modifier_total] += 1
+    return totals
+
+
+class TestExactCounts:
+    @pytest.mark.parametrize(
+        "expression",
+        ["1d20", "2d6+3", "3d4-1d6", "-2d3+1d8-4", "1d1+1d2", "5", "2d6-2d6", "4d3+2d5"],
+    )
+    def test_matches_enumeration(self, expression: str) -> None:
+        dist = DistributionCache().distribution(parse(expression))
+        counts = {dist.offset + i: c for i, c in enumerate(dist.counts) if c}
+        assert counts == dict(_brute_force(expression))
+        assert sum(dist.counts) == dist.outcomes
+
+    def test_range(self) -> None:
+        dist = DistributionCache().distribution(parse("2d6-1d4+1"))
+        assert (dist.minimum, dist.maximum) == (-1, 12)
+
+
+class TestDiceOps:
+    @staticmethod
+    def _brute_force_keep(rolls: int, faces: int, keep: int, highest: bool) -> dict[int, int]:
+        totals: Counter[int] = Counter()
+        for dice in itertools.product(range(1, faces + 1), repeat=rolls):
+            ordered = sorted(dice, reverse=highest)
+            totals[sum(ordered[:keep])] += 1
+        return dict(totals)
+
+    @pytest.mark.parametrize(
+        ("expression", "rolls", "faces", "keep", "highest"),
+        [
+            ("4d6kh3", 4, 6, 3, True),
+            ("2d20kl1", 2, 20, 1, False),
+            ("4d6dl1", 4, 6, 3, True),
+            ("5d4dh2", 5, 4, 3, False),
+            ("3d5k3", 3, 5, 3, True),
+        ],
+    )
+    def test_keep_matches_enumeration(
+        self, expression: str, rolls: int, faces: int, keep: int, highest: bool
+    ) -> None:
+        dist = DistributionCache().distribution(parse(expression))
+        counts = {dist.offset + i: c for i, c in enumerate(dist.counts) if c}
+        assert counts == self._brute_force_keep(rolls, faces, keep, highest)
+        assert dist.outcomes == faces**rolls
+
+    def test_reroll_counts(self) -> None:
+        # 16 (first, second) pairs; a 1 only survives as the second roll.
+        dist = DistributionCache().distribution(parse("1d4r1"))
+        assert (dist.offset, dist.counts, dist.outcomes) == (1, (1, 5, 5, 5), 16)
+
+    def test_explode_counts(self) -> None:
+        dist = DistributionCache().distribution(parse("1d2!"))
+        assert dist.maximum == 2 * (MAX_EXPLOSION_DEPTH + 1)
+        # 1 needs no explosion, 3 needs one: half as likely, 4 is impossible.
+        assert dist.counts[:4] == (2**MAX_EXPLOSION_DEPTH, 0, 2 ** (MAX_EXPLOSION_DEPTH - 1), 0)
+        assert sum(dist.counts) == dist.outcomes
+
+    @pytest.mark.parametrize(
+        "expression", ["4d6kh3", "2d6r2", "2d6!", "-3d4r1+2d8kl1-1", "8d10>=8-2d6=1"]
+    )
+    def test_moments_match_expression_stats(self, expression: str) -> None:
+        expr = parse(expression)
+        dist = DistributionCache().distribution(expr)
+        assert (dist.minimum, dist.maximum) == (expr.minimum, expr.maximum)
+        assert dist.mean == pytest.approx(expr.mean)
+        assert dist.variance == pytest.approx(expr.variance)
+
+    @pytest.mark.parametrize(
+        ("expression", "rolls", "faces", "successes"),
+        [("10d10>=7", 10, 10, 4), ("6d6=6", 6, 6, 1), ("-5d4<3", 5, 4, 2), ("3d6<=6", 3, 6, 6)],
+    )
+    def test_success_counts_are_binomial(
+        self, expression: str, rolls: int, faces: int, successes: int
+    ) -> None:
+        dist = DistributionCache().distribution(parse(expression))
+        assert dist.outcomes == faces**rolls
+        sign = -1 if expression.startswith("-") else 1
+        expected = {
+            sign * k: math.comb(rolls, k) * successes**k * (faces - successes) ** (rolls - k)
+            for k in range(rolls + 1)
+        }
+        counts = {dist.offset + i: c for i, c in enumerate(dist.counts)}
+        assert {k: c for k, c in counts.items() if c} == {k: c for k, c in expected.items() if c}
+
+    def test_large_success_pool_is_cheap(self) -> None:
+        expr = parse("10000d10>=7")
+        assert estimated_work(expr) <= MAX_DISTRIBUTION_WORK
+        dist = DistributionCache().distribution(expr)
+        assert dist.mean == pytest.approx(4000)
+        assert dist.probability_at_least(4000) == pytest.approx(0.5, abs=0.01)
+
+    def test_terms_memoized_by_op(self) -> None:
+        cache = DistributionCache()
+        cache.distribution(parse("4d6kh3"))
+        cache.distribution(parse("4d6kh3+1"))
+        cache.distribution(parse("4d6kl3"))
+        assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+
+class TestStatistics:
+    def test_mean_and_variance_match_closed_form(self) -> None:
+        # Per die: mean (f+1)/2, variance (f²-1)/12.
+        dist = DistributionCache().distribution(parse("3d8-1d6+2"))
+        assert dist.mean == pytest.approx(3 * 4.5 - 3.5 + 2)
+        assert dist.variance == pytest.approx(3 * 63 / 12 + 35 / 12)
+
+    def test_probability_at_least(self) -> None:
+        dist = DistributionCache().distribution(parse("2d6"))
+        assert dist.probability_at_least(12) == pytest.approx(1 / 36)
+        assert dist.probability_at_least(10) == pytest.approx(6 / 36)
+        assert dist.probability_at_least(2) == 1.0
+        assert dist.probability_at_least(-5) == 1.0
+        assert dist.probability_at_least(13) == 0.0
+
+    def test_percentiles(self) -> None:
+        dist = DistributionCache().distribution(parse("1d20"))
+        assert dist.percentiles([0.5, 0.05, 1.0, 0.0]) == [10, 1, 20, 1]
+
+    def test_huge_outcome_counts_stay_exact(self) -> None:
+        # 20^300 outcomes overflows a float; the statistics must not.
+        dist = DistributionCache().distribution(parse("+".join(["50d20"] * 6)))
+        assert dist.mean == pytest.approx(300 * 10.5)
+        assert dist.variance == pytest.approx(300 * 399 / 12)
+        assert dist.percentiles([0.5]) == [3150]
+
+
+class TestCache:
+    def test_terms_are_memoized(self) -> None:
+        cache = DistributionCache()
+        cache.distribution(parse("3d6+1"))
+        cache.distribution(parse("3d6-2"))
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_over_budget_is_refused(self) -> None:
+        expr = parse("50d1000")
+        assert estimated_work(expr) > MAX_DISTRIBUTION_WORK
+        with pytest.raises(DistributionTooLarge):
+            DistributionCache().distribution(expr)
+
+    def test_budget_is_configurable(self) -> None:
+        with pytest.raises(DistributionTooLarge):
+            DistributionCache(max_work=10).distribution(parse("2d6"))
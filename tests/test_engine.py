@@ -0,0 +1,228 @@
+"""Tests for the roll engine."""
+
+from __future__ import annotations
+
+import random
+
+from sirrmizan.dice_parser import MAX_EXPLOSION_DEPTH, Keep, parse
+from sirrmizan.engine import MAX_HISTOGRAM_FACES, _apply_op, roll, roll_many
+from sirrmizan.rng import SystemRng
+from sirrmizan.roll_plan import compile_plan
+
+
+class _CountingRng:
+    """Returns 1, 2, 3, ... (wrapped to the face count) and records each call."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[int, int]] = []
+        self._next = 0
+
+    def random(self) -> float:
+        return 0.5
+
+    def randbelow(self, n: int) -> int:
+        return 0
+
+    def randint(self, a: int, b: int) -> int:
+        return a
+
+    def roll(self, count: int, faces: int) -> list[int]:
+        self.calls.append((count, faces))
+        values = []
+        for _ in range(count):
+            values.append(self._next % faces + 1)
+            self._next += 1
+        return values
+
+
+class _MaxRng(_CountingRng):
+    """Every die shows its highest face."""
+
+    def roll(self, count: int, faces: int) -> list[int]:
+        self.calls.append((count, faces))
+        return [faces] * count
+
+
+def _plan(text: str):
+    return compile_plan(parse(text))
+
+
+class TestRoll:
+    def test_signed_results_and_total(self) -> None:
+        result = roll(_plan("2d6-1d4+3"), _CountingRng())
+        # The d6 pool is drawn first (1, 2), then the d4 pool (3).
+        assert result.terms == (("2d6", (1, 2)), ("-1d4", (-3,)))
+        assert result.modifiers == (3,)
+        assert result.total == 1 + 2 - 3 + 3
+
+    def test_modifier_only(self) -> None:
+        rng = _CountingRng()
+        result = roll(_plan("+7"), rng)
+        assert result.total == 7
+        assert result.terms == ()
+        assert rng.calls == []
+
+    def test_results_within_range(self) -> None:
+        result = roll(_plan("50d6"), SystemRng())
+        ((_, values),) = result.terms
+        assert len(values) == 50
+        assert all(1 <= v <= 6 for v in values)
+        assert result.total == sum(values)
+
+    def test_plan_execute_matches_roll(self) -> None:
+        plan = _plan("2d6-1d4+3")
+        assert plan.execute(_CountingRng()) == roll(plan, _CountingRng())
+
+
+class TestAggregatedTerms:
+    def test_large_pool_reports_total_and_histogram(self) -> None:
+        result = roll(_plan("10000d6+2"), SystemRng())
+        ((label, (term_total,)),) = result.terms
+        ((index, counts),) = result.histograms
+        assert label == "10000d6"
+        assert index == 0
+        assert sum(counts) == 10_000
+        assert term_total == sum(face * n for face, n in enumerate(counts, start=1))
+        assert result.total == term_total + 2
+
+    def test_negative_pool(self) -> None:
+        result = roll(_plan("-100d4"), SystemRng())
+        ((_, (term_total,)),) = result.terms
+        assert -400 <= term_total <= -100
+        assert result.total == term_total
+
+    def test_pool_is_not_itemized(self) -> None:
+        # 10000d6 is sampled by face counts, never via a 10000-die roll call.
+        rng = _CountingRng()
+        roll(_plan("10000d6"), rng)
+        assert rng.calls == []
+
+    def test_small_pool_rolls_dice_but_still_aggregates(self) -> None:
+        rng = _CountingRng()
+        result = roll(_plan("60d20"), rng)
+        assert rng.calls == [(60, 20)]
+        assert len(result.terms[0][1]) == 1
+        ((_, counts),) = result.histograms
+        assert counts == (3,) * 20
+
+    def test_no_histogram_for_large_dice(self) -> None:
+        result = roll(_plan(f"60d{MAX_HISTOGRAM_FACES + 1}"), SystemRng())
+        assert result.histograms == ()
+        assert 60 <= result.total <= 60 * (MAX_HISTOGRAM_FACES + 1)
+
+    def test_itemized_terms_have_no_histogram(self) -> None:
+        assert roll(_plan("50d6"), SystemRng()).histograms == ()
+
+
+class TestDiceOps:
+    def test_keep_highest(self) -> None:
+        result = roll(_plan("4d6kh3"), _CountingRng())
+        assert result.terms == (("4d6kh3", (2, 3, 4)),)
+        assert result.dropped == ((0, (1,)),)
+        assert result.total == 9
+
+    def test_keep_lowest_and_drop(self) -> None:
+        assert roll(_plan("2d20kl1"), _CountingRng()).terms == (("2d20kl1", (1,)),)
+        result = roll(_plan("5d6dh2"), _CountingRng())
+        assert result.terms == (("5d6dh2", (1, 2, 3)),)
+        assert result.dropped == ((0, (4, 5)),)
+
+    def test_keep_matches_sorting(self) -> None:
+        rng = random.Random(7)
+        for _ in range(500):
+            values = [rng.randint(1, 6) for _ in range(rng.randint(1, 12))]
+            count = rng.randint(1, len(values))
+            highest = rng.random() < 0.5
+            kept = list(values)
+            discarded = _apply_op(SystemRng(), Keep(count, highest), kept, 6)
+            ranked = sorted(values, reverse=highest)
+            assert sorted(kept) == sorted(ranked[:count])
+            assert sorted(discarded) == sorted(ranked[count:])
+
+    def test_negative_keep(self) -> None:
+        result = roll(_plan("-3d6k1+10"), _CountingRng())
+        assert result.terms == (("-3d6kh1", (-3,)),)
+        assert result.total == 7
+
+    def test_reroll_replaces_low_dice_once(self) -> None:
+        rng = _CountingRng()
+        result = roll(_plan("3d6r2"), rng)
+        # 1, 2, 3 drawn; the 1 and 2 are rerolled into 4 and 5.
+        assert result.terms == (("3d6r2", (4, 5, 3)),)
+        assert result.dropped == ((0, (1, 2)),)
+        assert rng.calls == [(3, 6), (2, 6)]
+
+    def test_explosion_depth_is_capped(self) -> None:
+        rng = _MaxRng()
+        result = roll(_plan("2d6!"), rng)
+        assert result.total == 2 * 6 * (MAX_EXPLOSION_DEPTH + 1)
+        # One draw for the pool, then one per explosion round.
+        assert rng.calls == [(2, 6)] * (MAX_EXPLOSION_DEPTH + 1)
+
+    def test_no_explosion_without_max(self) -> None:
+        rng = _CountingRng()
+        assert roll(_plan("3d6!"), rng).terms == (("3d6!", (1, 2, 3)),)
+        assert rng.calls == [(3, 6)]
+
+    def test_ops_on_aggregated_pools(self) -> None:
+        result = roll(_plan("1000d6r5"), SystemRng())
+        ((_, counts),) = result.histograms
+        assert sum(counts) == 1000
+        # Only rerolled dice can show 1-5: roughly 5/6 of them.
+        assert sum(counts[:5]) < 1000 * 5 / 6 * 5 / 6 + 100
+
+        result = roll(_plan("1000d6!"), SystemRng())
+        ((_, counts),) = result.histograms
+        assert sum(counts) > 1000
+        assert result.total == sum(face * n for face, n in enumerate(counts, start=1))
+
+    def test_explosion_on_unsampled_pool(self) -> None:
+        result = roll(_plan("60d20!"), _MaxRng())
+        ((_, counts),) = result.histograms
+        assert counts[-1] == 60 * (MAX_EXPLOSION_DEPTH + 1)
+
+
+class TestSuccessCounting:
+    def test_counts_without_rolling_dice(self) -> None:
+        rng = _CountingRng()
+        result = roll(_plan("10000d10>=7+2d6"), rng)
+        # Only the summed term draws dice.
+        assert rng.calls == [(2, 6)]
+        assert result.counted == (0,)
+        ((label, (successes,)), _) = result.terms
+        assert label == "10000d10>=7"
+        assert 0 <= successes <= 10000
+        assert result.total == successes + 3
+
+    def test_sure_and_negative_counts(self) -> None:
+        result = roll(_plan("6d6<=6-3d6>=1"), SystemRng())
+        assert result.terms == (("6d6<=6", (6,)), ("-3d6>=1", (-3,)))
+        assert result.counted == (0, 1)
+        assert result.total == 3
+
+    def test_success_rate(self) -> None:
+        result = roll(_plan("10000d10>=7"), SystemRng())
+        assert abs(result.total - 4000) < 300
+
+
+class TestRollMany:
+    def test_one_draw_per_face_count_for_the_whole_batch(self) -> None:
+        rng = _CountingRng()
+        plans = [_plan("1d20+5"), _plan("2d6+1d20"), _plan("3d6")]
+        results = roll_many(plans, rng)
+        assert sorted(rng.calls) == [(2, 20), (5, 6)]
+        assert len(results) == 3
+
+    def test_results_keep_plan_order_and_labels(self) -> None:
+        plans = [_plan("1d20+5"), _plan("-2d6"), _plan("4")]
+        results = roll_many(plans, SystemRng())
+        assert [tuple(label for label, _ in r.terms) for r in results] == [
+            ("1d20",),
+            ("-2d6",),
+            (),
+        ]
+        assert results[2].total == 4
+        assert all(v < 0 for v in results[1].terms[0][1])
+
+    def test_empty_batch(self) -> None:
+        assert roll_many([], _CountingRng()) == []
@@ -0,0 +1,98 @@
+"""Tests for initiative rolling and tracking."""
+
+from __future__ import annotations
+
+import pytest
+
+from sirrmizan.initiative import (
+    INITIATIVE_DIE,
+    MAX_COMBATANTS,
+    Combatant,
+    InitiativeEntry,
+    InitiativeError,
+    InitiativeTracker,
+    parse_combatants,
+    roll_initiative,
+)
+
+
+class _ScriptedRng:
+    """``roll`` returns the given values and records each call."""
+
+    def __init__(self, values: list[int]) -> None:
+        self.values = values
+        self.calls: list[tuple[int, int]] = []
+
+    def random(self) -> float:
+        return 0.0
+
+    def randbelow(self, n: int) -> int:
+        return 0
+
+    def randint(self, a: int, b: int) -> int:
+        return a
+
+    def roll(self, count: int, faces: int) -> list[int]:
+        self.calls.append((count, faces))
+        return self.values[:count]
+
+
+class TestParseCombatants:
+    def test_names_and_modifiers(self) -> None:
+        assert parse_combatants(" Goblin:+2  Orc:-1 Alice Bob:3 ") == [
+            Combatant("Goblin", 2),
+            Combatant("Orc", -1),
+            Combatant("Alice", 0),
+            Combatant("Bob", 3),
+        ]
+
+    @pytest.mark.parametrize(
+        "text",
+        ["", "Goblin:", "Goblin:+x", ":+2", "Goblin:+100", "A:1:2", " ".join(["x"] * 26)],
+    )
+    def test_invalid(self, text: str) -> None:
+        with pytest.raises(InitiativeError):
+            parse_combatants(text)
+
+    def test_limit(self) -> None:
+        assert len(parse_combatants(" ".join(["x"] * MAX_COMBATANTS))) == MAX_COMBATANTS
+
+
+class TestRollInitiative:
+    def test_one_draw_sorted_by_total(self) -> None:
+        rng = _ScriptedRng([10, 15, 12, 13])
+        combatants = parse_combatants("Goblin:+2 Orc:-1 Alice:+5 Bob:+4")
+        entries = roll_initiative(combatants, rng)
+        assert rng.calls == [(4, INITIATIVE_DIE)]
+        assert [(e.name, e.total) for e in entries] == [
+            ("Alice", 17),
+            ("Bob", 17),
+            ("Orc", 14),
+            ("Goblin", 12),
+        ]
+
+    def test_ties_keep_listed_order(self) -> None:
+        entries = roll_initiative(parse_combatants("A B C"), _ScriptedRng([7, 7, 7]))
+        assert [e.name for e in entries] == ["A", "B", "C"]
+
+
+class TestTracker:
+    def test_next_wraps_into_new_round(self) -> None:
+        tracker = InitiativeTracker()
+        entries = (InitiativeEntry("A", 0, 20), InitiativeEntry("B", 0, 3))
+        initiative = tracker.start(1, entries)
+        assert (initiative.current.name, initiative.round) == ("A", 1)
+        assert initiative.advance().name == "B"
+        assert initiative.advance().name == "A"
+        assert initiative.round == 2
+        assert tracker.get(1) is initiative
+        assert tracker.get(2) is None
+
+    def test_end_and_channel_bound(self) -> None:
+        tracker = InitiativeTracker(maxsize=2)
+        entries = (InitiativeEntry("A", 0, 1),)
+        for channel in (1, 2, 3):
+            tracker.start(channel, entries)
+        assert tracker.get(1) is None
+        assert tracker.end(3)
+        assert not tracker.end(3)
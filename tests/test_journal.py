@@ -0,0 +1,48 @@
+"""Tests for the append-only state journal."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from sirrmizan.journal import Journal
+
+
+def test_append_then_replay(tmp_path: Path) -> None:
+    journal = Journal(tmp_path / "j.jsonl")
+    written = journal.append([("stats", "1", {"dice_rolls_count": 2}), ("decks", "5", None)])
+    assert written == journal.size == (tmp_path / "j.jsonl").stat().st_size
+    assert journal.append([]) == 0
+
+    reopened = Journal(tmp_path / "j.jsonl")
+    assert reopened.replay() == [("stats", "1", {"dice_rolls_count": 2}), ("decks", "5", None)]
+    assert reopened.size == written
+
+
+def test_missing_file_is_empty(tmp_path: Path) -> None:
+    journal = Journal(tmp_path / "absent.jsonl")
+    assert journal.replay() == []
+    assert journal.size == 0
+
+
+def test_torn_tail_dropped(tmp_path: Path) -> None:
+    path = tmp_path / "j.jsonl"
+    journal = Journal(path)
+    good = journal.append([("stats", "1", {"dice_rolls_count": 1})])
+    with path.open("ab") as handle:
+        handle.write(b'{"s":"stats","id":"2","v":')
+    assert Journal(path).replay() == [("stats", "1", {"dice_rolls_count": 1})]
+    assert path.stat().st_size == good
+
+
+def test_corrupt_entry_drops_the_rest(tmp_path: Path) -> None:
+    path = tmp_path / "j.jsonl"
+    path.write_bytes(b'{"s":"stats","id":"1","v":1}\n[1,2]\n{"s":"stats","id":"2","v":2}\n')
+    assert Journal(path).replay() == [("stats", "1", 1)]
+
+
+def test_truncate(tmp_path: Path) -> None:
+    journal = Journal(tmp_path / "j.jsonl")
+    journal.append([("stats", "1", None)])
+    journal.truncate()
+    assert journal.size == 0
+    assert Journal(tmp_path / "j.jsonl").replay() == []
@@ -0,0 +1,85 @@
+"""Tests for user macros."""
+
+from __future__ import annotations
+
+import pytest
+
+from sirrmizan.dice_parser import MAX_EXPRESSION_LENGTH, parse
+from sirrmizan.macros import (
+    MACRO_REF_RE,
+    MacroCache,
+    MacroError,
+    compile_macro,
+    is_valid_macro_name,
+)
+from sirrmizan.roll_plan import compile_plan
+
+
+class TestCompileMacro:
+    def test_keeps_plan_and_target(self) -> None:
+        macro = compile_macro(" 1d20 + 7 Goblin ")
+        assert macro.plan == compile_plan(parse("1d20+7"))
+        assert (macro.expression_str, macro.target) == ("1d20+7", "Goblin")
+
+    @pytest.mark.parametrize(
+        "raw", ["Goblin", "", "1d20; 2d6", "0d6", "1d" + "9" * 10, "1d6+" * MAX_EXPRESSION_LENGTH]
+    )
+    def test_invalid(self, raw: str) -> None:
+        with pytest.raises(MacroError):
+            compile_macro(raw)
+
+    def test_resolves_variables_at_compile_time(self) -> None:
+        macro = compile_macro("1d20+@str Goblin", {"str": 3})
+        assert macro.plan == compile_plan(parse("1d20+3"))
+        with pytest.raises(MacroError, match="unknown variable"):
+            compile_macro("1d20+@str")
+
+    @pytest.mark.parametrize(
+        ("name", "ok"),
+        [("atk", True), ("fire-bolt_2", True), ("Atk", False), ("a b", False), ("", False)],
+    )
+    def test_names(self, name: str, ok: bool) -> None:
+        assert is_valid_macro_name(name) is ok
+
+    @pytest.mark.parametrize(
+        ("text", "groups"),
+        [
+            ("@atk", ("atk", None)),
+            ("@Atk Orc chief", ("Atk", "Orc chief")),
+            ("@", None),
+            ("@a!", None),
+        ],
+    )
+    def test_reference(self, text: str, groups: tuple[str, str | None] | None) -> None:
+        match = MACRO_REF_RE.match(text)
+        assert (match.groups() if match else None) == groups
+
+
+class TestMacroCache:
+    def test_compiles_a_user_once(self) -> None:
+        cache = MacroCache()
+        stored = {"atk": "1d20+7", "dmg": "2d6+3 Orc"}
+        atk = cache.lookup(1, "atk", stored)
+        assert atk is not None and atk.expression_str == "1d20+7"
+        dmg = cache.lookup(1, "dmg", stored)
+        assert dmg is not None and dmg.target == "Orc"
+        assert cache.lookup(1, "nope", stored) is None
+        assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+
+    def test_invalidate_picks_up_edits(self) -> None:
+        cache = MacroCache()
+        cache.lookup(1, "atk", {"atk": "1d20+7"})
+        assert cache.lookup(1, "atk", {"atk": "1d20+9"}).expression_str == "1d20+7"  # type: ignore[union-attr]
+        cache.invalidate(1)
+        assert cache.lookup(1, "atk", {"atk": "1d20+9"}).expression_str == "1d20+9"  # type: ignore[union-attr]
+
+    def test_reports_stored_input_that_no_longer_parses(self) -> None:
+        cache = MacroCache()
+        with pytest.raises(MacroError):
+            cache.lookup(1, "bad", {"bad": "Goblin", "ok": "1d4"})
+        assert cache.lookup(1, "ok", {}) is not None
+
+    def test_reports_deleted_variable(self) -> None:
+        cache = MacroCache()
+        with pytest.raises(MacroError, match="str"):
+            cache.lookup(1, "atk", {"atk": "1d20+@str"}, {})
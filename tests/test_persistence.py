@@ -19,6 +19,11 @@ def test_write_then_read(tmp_path: Path) -> None:
     assert read_json(target, default={}) == payload
 
 
+def test_write_returns_bytes_written(tmp_path: Path) -> None:
+    target = tmp_path / "data.json"
+    assert write_json_atomic(target, {"name": "é"}) == target.stat().st_size
+
+
 def test_write_overwrites_existing(tmp_path: Path) -> None:
     target = tmp_path / "data.json"
     write_json_atomic(target, {"v": 1})
@@ -0,0 +1,140 @@
+"""Tests for the RNG backends."""
+
+from __future__ import annotations
+
+import statistics
+from collections import Counter
+
+import pytest
+
+from sirrmizan.rng import BufferedRng, SystemRng, binomial, face_counts, make_rng
+
+
+class _ScriptedEntropy:
+    """Hands out pre-set bytes, recording each request size."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self.requests: list[int] = []
+
+    def __call__(self, size: int) -> bytes:
+        self.requests.append(size)
+        chunk, self._data = self._data[:size], self._data[size:]
+        return chunk.ljust(size, b"\x00")
+
+
+@pytest.mark.parametrize("factory", [SystemRng, BufferedRng])
+class TestBackends:
+    def test_roll_within_range(self, factory) -> None:
+        rng = factory()
+        for faces in (1, 2, 6, 20, 255, 256, 257, 99999):
+            values = rng.roll(50, faces)
+            assert len(values) == 50
+            assert all(1 <= v <= faces for v in values)
+
+    def test_randint_bounds(self, factory) -> None:
+        rng = factory()
+        values = {rng.randint(3, 5) for _ in range(300)}
+        assert values == {3, 4, 5}
+
+    def test_roll_is_roughly_uniform(self, factory) -> None:
+        # 60k d6: each face expects 10k with sd ~91, so ±5% is > 5 sd.
+        counts = Counter(factory().roll(60_000, 6))
+        assert set(counts) == {1, 2, 3, 4, 5, 6}
+        assert all(9_500 <= c <= 10_500 for c in counts.values())
+
+    def test_random_in_unit_interval(self, factory) -> None:
+        rng = factory()
+        values = [rng.random() for _ in range(1000)]
+        assert all(0.0 <= v < 1.0 for v in values)
+        assert 0.4 < statistics.fmean(values) < 0.6
+
+
+class TestBufferedRng:
+    def test_reads_entropy_in_blocks(self) -> None:
+        entropy = _ScriptedEntropy(bytes(range(256)) * 64)
+        rng = BufferedRng(block_size=1024, entropy=entropy)
+        for _ in range(100):
+            rng.randint(1, 20)
+        assert entropy.requests == [1024]
+
+    def test_rejection_sampling_skips_out_of_range_values(self) -> None:
+        # A bound of 5 needs 3 bits; 7, 6 and 5 are rejected. randbelow takes
+        # the high bits of each byte, roll masks the low bits.
+        entropy = _ScriptedEntropy(bytes([7 << 5, 6 << 5, 5 << 5, 2 << 5]))
+        assert BufferedRng(block_size=4, entropy=entropy).randbelow(5) == 2
+        entropy = _ScriptedEntropy(bytes([7, 6, 5, 2, 0]))
+        assert BufferedRng(block_size=2, entropy=entropy).roll(2, 5) == [3, 1]
+
+    def test_getrandbits_uses_high_bits(self) -> None:
+        rng = BufferedRng(block_size=2, entropy=_ScriptedEntropy(b"\xab\xcd"))
+        assert rng.getrandbits(12) == 0xABC
+
+    def test_discard_drops_buffered_bytes(self) -> None:
+        entropy = _ScriptedEntropy(bytes(64))
+        rng = BufferedRng(block_size=16, entropy=entropy)
+        rng.randbelow(10)
+        rng.discard()
+        rng.randbelow(10)
+        assert entropy.requests == [16, 16]
+
+    def test_large_requests_exceed_block_size(self) -> None:
+        rng = BufferedRng(block_size=8)
+        assert len(rng.roll(1000, 99999)) == 1000
+
+    @pytest.mark.parametrize("n", [0, -3])
+    def test_invalid_bound(self, n: int) -> None:
+        with pytest.raises(ValueError):
+            BufferedRng().randbelow(n)
+
+    def test_single_value_range(self) -> None:
+        assert BufferedRng().randbelow(1) == 0
+
+
+class TestBinomial:
+    @pytest.mark.parametrize(
+        ("n", "p"),
+        # Geometric method, BTRS, and the p > 0.5 mirror.
+        [(20, 0.1), (10_000, 1 / 6), (1_000, 0.5), (50, 0.97)],
+    )
+    def test_moments(self, n: int, p: float) -> None:
+        rng = BufferedRng()
+        draws = [binomial(rng, n, p) for _ in range(4000)]
+        assert all(0 <= k <= n for k in draws)
+        mean, var = n * p, n * p * (1 - p)
+        # 4000 draws: the sample mean is within 6 standard errors.
+        assert abs(statistics.fmean(draws) - mean) < 6 * (var / 4000) ** 0.5
+        assert 0.85 * var < statistics.variance(draws) < 1.15 * var
+
+    def test_degenerate_probabilities(self) -> None:
+        rng = BufferedRng()
+        assert binomial(rng, 7, 0.0) == 0
+        assert binomial(rng, 7, 1.0) == 7
+        assert binomial(rng, 0, 0.5) == 0
+
+    @pytest.mark.parametrize("p", [-0.1, 1.5])
+    def test_invalid_probability(self, p: float) -> None:
+        with pytest.raises(ValueError):
+            binomial(BufferedRng(), 5, p)
+
+
+class TestFaceCounts:
+    def test_counts_cover_every_die(self) -> None:
+        rng = BufferedRng()
+        for count, faces in [(10_000, 6), (51, 20), (1, 1), (0, 4)]:
+            counts = face_counts(rng, count, faces)
+            assert len(counts) == faces
+            assert sum(counts) == count
+            assert all(c >= 0 for c in counts)
+
+    def test_roughly_uniform(self) -> None:
+        # 60k d6 in one draw: each face expects 10k with sd ~91.
+        counts = face_counts(SystemRng(), 60_000, 6)
+        assert all(9_500 <= c <= 10_500 for c in counts)
+
+
+def test_make_rng() -> None:
+    assert isinstance(make_rng("system"), SystemRng)
+    assert isinstance(make_rng("buffered"), BufferedRng)
+    with pytest.raises(ValueError):
+        make_rng("mersenne")
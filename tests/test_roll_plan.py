@@ -0,0 +1,88 @@
+"""Tests for compiled roll plans."""
+
+from __future__ import annotations
+
+from sirrmizan.dice_parser import Count, Explode, Keep, estimate_cost, parse
+from sirrmizan.roll_plan import PlanCache, compile_plan
+
+
+class TestCompile:
+    def test_precomputes_labels_and_arrays(self) -> None:
+        plan = compile_plan(parse("2d6-3d4+5-1"))
+        assert plan.labels == ("2d6", "-3d4")
+        assert plan.rolls == (2, 3)
+        assert plan.faces == (6, 4)
+        assert plan.signs == (1, -1)
+        assert plan.modifier_total == 4
+        assert plan.modifiers == (5, -1)
+        assert plan.aggregated == (False, False)
+
+    def test_flags_large_pools_as_aggregated(self) -> None:
+        plan = compile_plan(parse("50d6+51d6"))
+        assert plan.aggregated == (False, True)
+
+    def test_dice_ops_in_labels_and_normalized(self) -> None:
+        plan = compile_plan(parse("4d6dl1+1d6!-2d6"))
+        assert plan.labels == ("4d6dl1", "1d6!", "-2d6")
+        # Drop-lowest-1 runs as keep-highest-3.
+        assert plan.ops == (Keep(3, highest=True), Explode(), None)
+
+    def test_success_counts_in_labels(self) -> None:
+        plan = compile_plan(parse("10d10>=7-6d6=6"))
+        assert plan.labels == ("10d10>=7", "-6d6=6")
+        assert plan.ops == (Count(">=", 7), Count("=", 6))
+
+    def test_modifier_only(self) -> None:
+        plan = compile_plan(parse("+7"))
+        assert plan.labels == ()
+        assert plan.modifier_total == 7
+
+
+class TestCost:
+    def test_carried_by_plan(self) -> None:
+        expr = parse("2d6+3")
+        assert compile_plan(expr).cost == estimate_cost(expr)
+
+    def test_itemized_dice_cost_one_draw_each(self) -> None:
+        assert estimate_cost(parse("50d6-3d4")).draws == 53
+
+    def test_large_pools_cost_per_face_not_per_die(self) -> None:
+        assert estimate_cost(parse("10000d6")).draws < estimate_cost(parse("50d6")).draws
+        assert estimate_cost(parse("10000d6")).draws == estimate_cost(parse("5000d6")).draws
+
+    def test_output_size_counts(self) -> None:
+        small = estimate_cost(parse("1d20"))
+        assert small.fields == 1
+        assert estimate_cost(parse("1d20+5")).fields == 2
+        # Wider dice render wider values.
+        assert estimate_cost(parse("50d99999")).chars > estimate_cost(parse("50d6")).chars
+        # Aggregated small dice add a histogram field.
+        assert estimate_cost(parse("100d6")).fields == 2
+
+    def test_ops_add_expected_dice(self) -> None:
+        assert estimate_cost(parse("6d6r3")).draws == 6 + 3
+        assert estimate_cost(parse("6d6!")).draws > estimate_cost(parse("6d6")).draws
+        assert estimate_cost(parse("4d6kh3")).draws > estimate_cost(parse("4d6")).draws
+
+    def test_success_counts_are_constant(self) -> None:
+        assert estimate_cost(parse("10000d10>=7")).draws == estimate_cost(parse("5d10>=7")).draws
+
+    def test_modifier_only_is_cheap(self) -> None:
+        cost = estimate_cost(parse("+7"))
+        assert cost.draws == 0
+        assert cost.units < estimate_cost(parse("1d20")).units + 50
+
+
+class TestPlanCache:
+    def test_same_expression_reuses_plan(self) -> None:
+        cache = PlanCache(maxsize=4)
+        first = cache.plan(parse("1d20+5"))
+        second = cache.plan(parse("1d20+5"))
+        assert first is second
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_distinct_expressions_get_distinct_plans(self) -> None:
+        cache = PlanCache(maxsize=4)
+        assert cache.plan(parse("1d20")) is not cache.plan(parse("1d20+1"))
+        assert cache.stats.size == 2
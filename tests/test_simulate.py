@@ -0,0 +1,168 @@
+"""Tests for the Monte Carlo simulator."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from sirrmizan import simulate
+from sirrmizan.dice_parser import parse
+from sirrmizan.roll_plan import compile_plan
+from sirrmizan.simulate import (
+    CHUNK_DRAWS,
+    MAX_TRIALS,
+    SimulationBusy,
+    SimulationFailed,
+    SimulationQueueFull,
+    SimulationResult,
+    SimulationTimeout,
+    SimulationTooLarge,
+    Simulator,
+    chunk_sizes,
+)
+
+
+def _plan(text: str):
+    return compile_plan(parse(text))
+
+
+def _thread_simulator(**kwargs) -> Simulator:
+    return Simulator(executor_factory=lambda: ThreadPoolExecutor(max_workers=2), **kwargs)
+
+
+class TestChunking:
+    def test_chunks_cover_all_trials(self) -> None:
+        sizes = chunk_sizes(100_001, 4)
+        assert sum(sizes) == 100_001
+        assert max(sizes) == CHUNK_DRAWS // 4
+
+    def test_expensive_trials_get_small_chunks(self) -> None:
+        assert chunk_sizes(3, CHUNK_DRAWS * 2) == [1, 1, 1]
+
+
+class TestSimulationResult:
+    def test_statistics(self) -> None:
+        result = SimulationResult(trials=4, tally={1: 1, 2: 2, 3: 1})
+        assert (result.minimum, result.maximum) == (1, 3)
+        assert result.mean == 2.0
+        assert result.stddev == pytest.approx((0.5) ** 0.5)
+        assert result.percentiles([0.0, 0.25, 0.5, 0.75, 1.0]) == [1, 1, 2, 2, 3]
+
+    def test_histogram_bins(self) -> None:
+        result = SimulationResult(trials=6, tally={1: 1, 2: 1, 5: 2, 10: 2})
+        assert result.histogram(4) == [(1, 3, 2), (4, 6, 2), (7, 9, 0), (10, 10, 2)]
+        assert SimulationResult(trials=3, tally={7: 3}).histogram(12) == [(7, 7, 3)]
+
+
+class TestSimulator:
+    async def test_tally_covers_every_trial(self) -> None:
+        sim = _thread_simulator()
+        progress: list[int] = []
+
+        async def on_progress(done: int, total: int) -> None:
+            progress.append(done)
+
+        result = await sim.run(_plan("2d6+1"), 120_000, user_id=1, on_progress=on_progress)
+        sim.shutdown()
+        assert sum(result.tally.values()) == 120_000
+        assert result.minimum >= 3 and result.maximum <= 13
+        assert result.mean == pytest.approx(8.0, abs=0.05)
+        assert progress[-1] == 120_000
+        assert progress == sorted(progress)
+
+    async def test_limits(self) -> None:
+        sim = _thread_simulator()
+        with pytest.raises(SimulationTooLarge):
+            await sim.run(_plan("1d6"), MAX_TRIALS + 1, user_id=1)
+        with pytest.raises(SimulationTooLarge):
+            await sim.run(_plan("50d6+50d6"), MAX_TRIALS, user_id=1)
+
+    async def test_one_job_per_user(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        real_chunk = simulate._run_chunk
+
+        def slow_chunk(plan, trials, deadline):
+            time.sleep(0.2)
+            return real_chunk(plan, trials, deadline)
+
+        monkeypatch.setattr(simulate, "_run_chunk", slow_chunk)
+        sim = _thread_simulator()
+        first = asyncio.create_task(sim.run(_plan("1d6"), 10, user_id=1))
+        await asyncio.sleep(0)
+        with pytest.raises(SimulationBusy):
+            await sim.run(_plan("1d6"), 10, user_id=1)
+        # Other users are unaffected, and the slot frees up afterwards.
+        await sim.run(_plan("1d6"), 10, user_id=2)
+        await first
+        await sim.run(_plan("1d6"), 10, user_id=1)
+        sim.shutdown()
+
+    async def test_timeout(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        def slow_chunk(plan, trials, deadline):
+            time.sleep(0.5)
+            return {}
+
+        monkeypatch.setattr(simulate, "_run_chunk", slow_chunk)
+        sim = _thread_simulator(timeout=0.05)
+        with pytest.raises(SimulationTimeout):
+            await sim.run(_plan("1d6"), 10, user_id=1)
+        # The user's slot is released even on timeout.
+        assert 1 not in sim._active
+        sim.shutdown()
+
+    async def test_chunk_stops_at_deadline(self) -> None:
+        assert simulate._run_chunk(_plan("1d6"), 1000, time.time() - 1) == {}
+        assert sum(simulate._run_chunk(_plan("1d6"), 1000, time.time() + 60).values()) == 1000
+
+    async def test_global_draw_cap(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        real_chunk = simulate._run_chunk
+
+        def slow_chunk(plan, trials, deadline):
+            time.sleep(0.2)
+            return real_chunk(plan, trials, deadline)
+
+        monkeypatch.setattr(simulate, "_run_chunk", slow_chunk)
+        sim = _thread_simulator(max_queued_draws=15)
+        first = asyncio.create_task(sim.run(_plan("1d6"), 10, user_id=1))
+        await asyncio.sleep(0)
+        with pytest.raises(SimulationQueueFull):
+            await sim.run(_plan("1d6"), 10, user_id=2)
+        await first
+        # The draws are released once the first job is done.
+        await sim.run(_plan("1d6"), 10, user_id=2)
+        sim.shutdown()
+
+    async def test_broken_pool_recreated(self) -> None:
+        pools: list[ThreadPoolExecutor] = []
+
+        class BrokenPool(ThreadPoolExecutor):
+            def submit(self, fn, /, *args, **kwargs):
+                raise BrokenProcessPool("worker died")
+
+        def factory() -> ThreadPoolExecutor:
+            pools.append(BrokenPool() if not pools else ThreadPoolExecutor(max_workers=2))
+            return pools[-1]
+
+        sim = Simulator(executor_factory=factory)
+        with pytest.raises(SimulationFailed):
+            await sim.run(_plan("1d6"), 10, user_id=1)
+        assert 1 not in sim._active
+        result = await sim.run(_plan("1d6"), 10, user_id=1)
+        assert sum(result.tally.values()) == 10
+        assert len(pools) == 2
+        sim.shutdown()
+
+    async def test_process_pool(self) -> None:
+        sim = Simulator()
+        try:
+            result = await sim.run(_plan("1d20"), 5000, user_id=1)
+            pool = sim._executor
+            assert isinstance(pool, ProcessPoolExecutor)
+            assert pool._mp_context.get_start_method() != "fork"
+        finally:
+            sim.shutdown()
+        assert sum(result.tally.values()) == 5000
+        assert set(result.tally) <= set(range(1, 21))
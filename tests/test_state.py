@@ -2,13 +2,23 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import threading
+from collections.abc import Mapping
 from pathlib import Path
+from typing import Any
 
 import pytest
 
 from sirrmizan.colors import CANONICAL_COLORS, DEFAULT_COLOR
+from sirrmizan.decks import Deck, DeckError
+from sirrmizan.macros import MAX_MACROS_PER_USER, MacroError
+from sirrmizan.rng import SystemRng
 from sirrmizan.state import State, is_valid_prefix
+from sirrmizan.storage import ChangeSet, JsonStorage, SaveMetrics
+from sirrmizan.tables import MAX_TABLES_PER_GUILD, TableError
+from sirrmizan.variables import MAX_VARIABLES_PER_USER, VariableError
 
 
 class TestPrefixValidation:
@@ -206,9 +216,127 @@ class TestStats:
         await state.increment_dice_rolls(7)
         assert state.get_user_dice_count(7) == 2
 
+    async def test_increment_by_batch(self, state: State) -> None:
+        await state.increment_dice_rolls(7, 6)
+        await state.increment_dice_rolls(7)
+        assert state.get_user_dice_count(7) == 7
+
     async def test_zero_for_unknown(self, state: State) -> None:
         assert state.get_user_dice_count(999) == 0
 
+    async def test_increment_does_not_wait_for_lock(self, state: State) -> None:
+        async with state.lock:
+            await asyncio.wait_for(state.increment_dice_rolls(7, 3), timeout=1)
+        assert state.get_user_dice_count(7) == 3
+        assert state.is_dirty
+
+    async def test_save_folds_pending_counts(self, state: State, tmp_path: Path) -> None:
+        await state.increment_dice_rolls(7, 2)
+        await state.save()
+        await state.increment_dice_rolls(7)
+        assert state.get_user_dice_count(7) == 3
+        await state.save()
+        assert not state.is_dirty
+        on_disk = json.loads((tmp_path / "user_stats.json").read_text(encoding="utf-8"))
+        assert on_disk == {"7": {"dice_rolls_count": 3}}
+
+
+class _GatedStorage(JsonStorage):
+    """Holds each save in the worker thread until ``release`` is set."""
+
+    def __init__(self, data_dir: Path) -> None:
+        super().__init__(data_dir)
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+        self.fail = False
+
+    def save(
+        self,
+        users: Mapping[str, Any],
+        stats: Mapping[str, Any],
+        servers: Mapping[str, Any],
+        decks: Mapping[str, Deck],
+        changes: ChangeSet,
+    ) -> SaveMetrics:
+        self.calls += 1
+        self.started.set()
+        self.release.wait(timeout=5)
+        if self.fail:
+            raise OSError("disk full")
+        return super().save(users, stats, servers, decks, changes)
+
+
+class TestConcurrentSave:
+    @pytest.fixture
+    def storage(self, tmp_path: Path) -> _GatedStorage:
+        return _GatedStorage(tmp_path)
+
+    @pytest.fixture
+    def gated(self, tmp_path: Path, storage: _GatedStorage) -> State:
+        s = State(tmp_path, storage)
+        s.load()
+        return s
+
+    async def _start_save(self, storage: _GatedStorage, state: State) -> asyncio.Task[Any]:
+        task = asyncio.create_task(state.save())
+        await asyncio.to_thread(storage.started.wait, 5)
+        return task
+
+    async def test_mutations_do_not_wait_for_write(
+        self, gated: State, storage: _GatedStorage, tmp_path: Path
+    ) -> None:
+        await gated.set_user_color(1, "red")
+        await gated.new_channel_deck(5, "standard", SystemRng())
+        saving = await self._start_save(storage, gated)
+
+        await asyncio.wait_for(gated.set_user_color(1, "blue"), timeout=1)
+        await asyncio.wait_for(gated.draw_from_channel_deck(5, 3), timeout=1)
+        await asyncio.wait_for(gated.increment_dice_rolls(1), timeout=1)
+        storage.release.set()
+        await saving
+
+        # The save wrote the state as it was when it started.
+        users = json.loads((tmp_path / "user_preferences.json").read_text(encoding="utf-8"))
+        decks = json.loads((tmp_path / "channel_decks.json").read_text(encoding="utf-8"))
+        assert users["users"]["1"]["color"] == "red"
+        assert decks["5"]["cursor"] == 0
+        assert not (tmp_path / "user_stats.json").exists()
+        assert gated.is_dirty
+
+        await gated.save()
+        reloaded = State(tmp_path)
+        reloaded.load()
+        assert reloaded.get_user_color_name(1) == "blue"
+        assert reloaded.get_channel_deck(5) == gated.get_channel_deck(5)
+        assert reloaded.get_user_dice_count(1) == 1
+
+    async def test_queued_saves_coalesce(self, gated: State, storage: _GatedStorage) -> None:
+        await gated.set_user_color(1, "red")
+        first = await self._start_save(storage, gated)
+        await gated.set_user_color(2, "blue")
+        second = asyncio.create_task(gated.save())
+        third = asyncio.create_task(gated.save())
+        await asyncio.sleep(0)
+        storage.release.set()
+        await first
+        assert await second is await third
+        assert storage.calls == 2
+        assert not gated.is_dirty
+
+    async def test_failed_write_is_retried(self, gated: State, storage: _GatedStorage) -> None:
+        await gated.set_server_prefix(42, "?")
+        storage.release.set()
+        storage.fail = True
+        with pytest.raises(OSError):
+            await gated.save()
+        assert gated.is_dirty
+
+        storage.fail = False
+        metrics = await gated.save()
+        assert metrics.records == 1
+        assert not gated.is_dirty
+
 
 class TestColorIntegrity:
     async def test_all_canonical_resolvable(self, state: State) -> None:
@@ -262,3 +390,215 @@ class TestUserCompactPreference:
         assert state.get_user_color_name(7) == "red"
         assert state.get_user_compact(7) is False
         assert state.is_dirty
+
+
+class TestServerTables:
+    async def test_set_get_and_list(self, state: State) -> None:
+        assert state.get_server_table(42, "loot") is None
+        await state.set_server_table(42, "loot", ((3, "Gold"), (1, "Gem")))
+        await state.set_server_table(42, "names", ((1, "Ada"),))
+        assert state.get_server_table(42, "loot") == ((3, "Gold"), (1, "Gem"))
+        assert state.get_server_table_names(42) == ["loot", "names"]
+        assert state.get_server_table_names(7) == []
+        assert state.is_dirty
+
+    async def test_replace_and_delete(self, state: State) -> None:
+        await state.set_server_table(42, "loot", ((1, "Gold"),))
+        await state.set_server_table(42, "loot", ((1, "Silver"),))
+        assert state.get_server_table(42, "loot") == ((1, "Silver"),)
+        assert await state.delete_server_table(42, "loot")
+        assert not await state.delete_server_table(42, "loot")
+        assert state.get_server_table_names(42) == []
+
+    async def test_invalid_rejected(self, state: State) -> None:
+        with pytest.raises(TableError):
+            await state.set_server_table(42, "Bad Name", ((1, "a"),))
+        with pytest.raises(TableError):
+            await state.set_server_table(42, "loot", ())
+
+    async def test_table_limit(self, state: State) -> None:
+        for i in range(MAX_TABLES_PER_GUILD):
+            await state.set_server_table(42, f"t{i}", ((1, "a"),))
+        with pytest.raises(TableError):
+            await state.set_server_table(42, "onemore", ((1, "a"),))
+        # Replacing an existing table is still allowed.
+        await state.set_server_table(42, "t0", ((1, "b"),))
+
+    async def test_persist_across_reload(self, tmp_path: Path) -> None:
+        s1 = State(tmp_path)
+        s1.load()
+        await s1.set_server_table(42, "loot", ((3, "Gold"), (1, "Gem")))
+        await s1.save()
+        s2 = State(tmp_path)
+        s2.load()
+        assert s2.get_server_table(42, "loot") == ((3, "Gold"), (1, "Gem"))
+        assert not s2.is_dirty
+
+    async def test_malformed_tables_dropped(self, tmp_path: Path) -> None:
+        (tmp_path / "server_preferences.json").write_text(
+            json.dumps(
+                {
+                    "42": {
+                        "language": "fr",
+                        "tables": {
+                            "ok": [[2, "Gold"]],
+                            "zero": [[0, "Gold"]],
+                            "shape": [["Gold", 2]],
+                            "Bad Name": [[1, "Gold"]],
+                        },
+                    }
+                }
+            ),
+            encoding="utf-8",
+        )
+        state = State(tmp_path)
+        state.load()
+        assert state.get_server_table_names(42) == ["ok"]
+        assert state.get_server_language(42) == "fr"
+        assert state.is_dirty
+
+
+class TestChannelDecks:
+    async def test_new_draw_shuffle(self, state: State) -> None:
+        assert state.get_channel_deck(5) is None
+        assert await state.draw_from_channel_deck(5, 1) is None
+        assert await state.shuffle_channel_deck(5, SystemRng()) is None
+        await state.new_channel_deck(5, "standard", SystemRng())
+        cards = await state.draw_from_channel_deck(5, 3)
+        assert cards is not None and len(set(cards)) == 3
+        deck = state.get_channel_deck(5)
+        assert deck is not None and deck.remaining == 49
+        with pytest.raises(DeckError):
+            await state.draw_from_channel_deck(5, 50)
+        await state.shuffle_channel_deck(5, SystemRng())
+        assert deck.remaining == 52
+
+    async def test_decks_are_per_channel(self, state: State) -> None:
+        await state.new_channel_deck(5, "standard", SystemRng())
+        await state.new_channel_deck(6, "tarot", SystemRng())
+        await state.draw_from_channel_deck(5, 2)
+        deck = state.get_channel_deck(6)
+        assert deck is not None and (deck.kind, deck.remaining) == ("tarot", 78)
+
+    async def test_persist_across_reload(self, tmp_path: Path) -> None:
+        s1 = State(tmp_path)
+        s1.load()
+        await s1.new_channel_deck(5, "tarot", SystemRng())
+        await s1.draw_from_channel_deck(5, 4)
+        await s1.save()
+        s2 = State(tmp_path)
+        s2.load()
+        assert s2.get_channel_deck(5) == s1.get_channel_deck(5)
+        assert not s2.is_dirty
+
+    async def test_draw_rewrites_only_the_deck_file(self, tmp_path: Path) -> None:
+        state = State(tmp_path)
+        state.load()
+        await state.new_channel_deck(5, "standard", SystemRng())
+        await state.set_server_language(42, "fr")
+        await state.save()
+        servers = tmp_path / "server_preferences.json"
+        servers.unlink()
+        await state.draw_from_channel_deck(5, 1)
+        assert state.is_dirty
+        await state.save()
+        assert not servers.exists()
+        assert not state.is_dirty
+
+    async def test_malformed_decks_dropped(self, tmp_path: Path) -> None:
+        (tmp_path / "channel_decks.json").write_text(
+            json.dumps(
+                {
+                    "5": {"kind": "uno"},
+                    "6": {"kind": "standard", "order": list(range(52)), "cursor": 2},
+                }
+            ),
+            encoding="utf-8",
+        )
+        state = State(tmp_path)
+        state.load()
+        assert state.get_channel_deck(5) is None
+        deck = state.get_channel_deck(6)
+        assert deck is not None and deck.remaining == 50
+        assert state.is_dirty
+
+
+class TestUserMacros:
+    async def test_set_get_delete(self, state: State) -> None:
+        assert state.get_user_macros(1) == {}
+        await state.set_user_macro(1, "atk", "1d20+7 Goblin")
+        await state.set_user_color(1, "red")
+        assert state.get_user_macros(1) == {"atk": "1d20+7 Goblin"}
+        assert state.get_user_color_name(1) == "red"
+        assert await state.delete_user_macro(1, "atk")
+        assert not await state.delete_user_macro(1, "atk")
+        assert state.get_user_macros(1) == {}
+
+    async def test_limits(self, state: State) -> None:
+        with pytest.raises(MacroError):
+            await state.set_user_macro(1, "Bad Name", "1d20")
+        for i in range(MAX_MACROS_PER_USER):
+            await state.set_user_macro(1, f"m{i}", "1d20")
+        with pytest.raises(MacroError):
+            await state.set_user_macro(1, "onemore", "1d20")
+        await state.set_user_macro(1, "m0", "1d6")
+
+    async def test_persist_and_sanitize(self, tmp_path: Path) -> None:
+        s1 = State(tmp_path)
+        s1.load()
+        await s1.set_user_macro(1, "atk", "1d20+7")
+        await s1.save()
+        s2 = State(tmp_path)
+        s2.load()
+        assert s2.get_user_macros(1) == {"atk": "1d20+7"}
+        assert not s2.is_dirty
+
+        (tmp_path / "user_preferences.json").write_text(
+            json.dumps({"users": {"1": {"macros": {"ok": "1d4", "Bad Name": "1d4", "num": 3}}}}),
+            encoding="utf-8",
+        )
+        s3 = State(tmp_path)
+        s3.load()
+        assert s3.get_user_macros(1) == {"ok": "1d4"}
+        assert s3.is_dirty
+
+
+class TestUserVariables:
+    async def test_set_get_delete(self, state: State) -> None:
+        assert state.get_user_variables(1) == {}
+        await state.set_user_variable(1, "str", 3)
+        await state.set_user_variable(1, "str", 4)
+        await state.set_user_macro(1, "atk", "1d20+@str")
+        assert state.get_user_variables(1) == {"str": 4}
+        assert state.get_user_macros(1) == {"atk": "1d20+@str"}
+        assert await state.delete_user_variable(1, "str")
+        assert not await state.delete_user_variable(1, "str")
+        assert state.get_user_variables(1) == {}
+
+    async def test_limits(self, state: State) -> None:
+        with pytest.raises(VariableError):
+            await state.set_user_variable(1, "Str", 1)
+        for i in range(MAX_VARIABLES_PER_USER):
+            await state.set_user_variable(1, f"v{i}", i)
+        with pytest.raises(VariableError):
+            await state.set_user_variable(1, "onemore", 1)
+        await state.set_user_variable(1, "v0", 9)
+
+    async def test_persist_and_sanitize(self, tmp_path: Path) -> None:
+        s1 = State(tmp_path)
+        s1.load()
+        await s1.set_user_variable(1, "str", -2)
+        await s1.save()
+        s2 = State(tmp_path)
+        s2.load()
+        assert s2.get_user_variables(1) == {"str": -2}
+        assert not s2.is_dirty
+
+        (tmp_path / "user_preferences.json").write_text(
+            json.dumps({"users": {"1": {"variables": {"ok": 1, "Bad": 1, "txt": "1"}}}}),
+            encoding="utf-8",
+        )
+        s3 = State(tmp_path)
+        s3.load()
+        assert s3.get_user_variables(1) == {"ok": 1}
+        assert s3.is_dirty
@@ -0,0 +1,281 @@
+"""Tests for the State storage backends."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+
+from sirrmizan.rng import SystemRng
+from sirrmizan.state import State
+from sirrmizan.storage import (
+    JOURNAL_FILENAME,
+    SQLITE_FILENAME,
+    ChangeSet,
+    JournalStorage,
+    JsonStorage,
+    SqliteStorage,
+    make_storage,
+)
+
+
+def _sqlite_state(tmp_path: Path) -> State:
+    state = State(tmp_path, make_storage("sqlite", tmp_path))
+    state.load()
+    return state
+
+
+def _rows(tmp_path: Path, table: str) -> dict[str, object]:
+    with closing(sqlite3.connect(tmp_path / SQLITE_FILENAME)) as conn:
+        return dict(conn.execute(f"SELECT * FROM {table}").fetchall())
+
+
+class TestChangeSet:
+    def test_marks_and_clear(self) -> None:
+        changes = ChangeSet()
+        assert not changes
+        changes.mark("stats", "1")
+        changes.mark_all("decks")
+        assert changes
+        assert changes.ids("stats") == {"1"}
+        assert changes.touches("decks") and changes.is_whole("decks")
+        assert not changes.touches("users")
+        changes.clear()
+        assert not changes and not changes.touches("decks")
+
+
+class TestMakeStorage:
+    def test_backends(self, tmp_path: Path) -> None:
+        assert isinstance(make_storage("json", tmp_path), JsonStorage)
+        assert isinstance(make_storage("journal", tmp_path), JournalStorage)
+        assert isinstance(make_storage("sqlite", tmp_path), SqliteStorage)
+        with pytest.raises(ValueError):
+            make_storage("redis", tmp_path)
+
+
+class TestJsonStorage:
+    async def test_rewrites_only_touched_files(self, state: State, tmp_path: Path) -> None:
+        await state.set_user_color(1, "red")
+        await state.increment_dice_rolls(1)
+        await state.set_server_language(42, "fr")
+        await state.save()
+        for name in ("user_preferences.json", "server_preferences.json"):
+            (tmp_path / name).unlink()
+
+        await state.increment_dice_rolls(2)
+        metrics = await state.save()
+        assert not (tmp_path / "user_preferences.json").exists()
+        assert not (tmp_path / "server_preferences.json").exists()
+        stats_file = tmp_path / "user_stats.json"
+        assert json.loads(stats_file.read_text(encoding="utf-8"))["2"] == {"dice_rolls_count": 1}
+        assert (metrics.saves, metrics.records) == (1, 2)
+        assert metrics.bytes_written == stats_file.stat().st_size
+
+    async def test_clean_save_writes_nothing(self, state: State, tmp_path: Path) -> None:
+        metrics = await state.save()
+        assert (metrics.saves, metrics.records, metrics.bytes_written) == (0, 0, 0)
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_totals_accumulate(self, state: State) -> None:
+        await state.increment_dice_rolls(1)
+        first = await state.save()
+        await state.increment_dice_rolls(1)
+        second = await state.save()
+        totals = state.save_stats
+        assert totals.saves == 2
+        assert totals.bytes_written == first.bytes_written + second.bytes_written
+
+
+def _journal_state(tmp_path: Path, compact_bytes: int = 1 << 20) -> State:
+    state = State(tmp_path, JournalStorage(tmp_path, compact_bytes=compact_bytes))
+    state.load()
+    return state
+
+
+class TestJournalStorage:
+    async def test_replayed_over_snapshots(self, tmp_path: Path) -> None:
+        s1 = _journal_state(tmp_path)
+        await s1.set_user_color(1, "red")
+        await s1.increment_dice_rolls(1, 2)
+        await s1.new_channel_deck(5, "standard", SystemRng())
+        await s1.save()
+        await s1.increment_dice_rolls(1)
+        await s1.draw_from_channel_deck(5, 3)
+        await s1.save()
+        assert not (tmp_path / "user_stats.json").exists()
+
+        s2 = _journal_state(tmp_path)
+        assert s2.get_user_color_name(1) == "red"
+        assert s2.get_user_dice_count(1) == 3
+        assert s2.get_channel_deck(5) == s1.get_channel_deck(5)
+        assert not s2.is_dirty
+
+    async def test_roll_cost_independent_of_user_count(self, tmp_path: Path) -> None:
+        state = _journal_state(tmp_path)
+        await state.increment_dice_rolls(1)
+        small = await state.save()
+        for user_id in range(2, 500):
+            await state.increment_dice_rolls(user_id)
+        await state.save()
+        await state.increment_dice_rolls(1)
+        after = await state.save()
+        assert (after.records, after.bytes_written) == (1, small.bytes_written)
+
+    async def test_compacts_past_threshold(self, tmp_path: Path) -> None:
+        state = _journal_state(tmp_path, compact_bytes=200)
+        for user_id in range(10):
+            await state.increment_dice_rolls(user_id)
+        await state.save()
+        assert (tmp_path / JOURNAL_FILENAME).stat().st_size == 0
+        stats = json.loads((tmp_path / "user_stats.json").read_text(encoding="utf-8"))
+        assert len(stats) == 10
+
+    async def test_close_folds_journal_into_snapshots(self, tmp_path: Path) -> None:
+        state = _journal_state(tmp_path)
+        await state.set_server_language(42, "de")
+        await state.save()
+        state.close()
+        assert (tmp_path / JOURNAL_FILENAME).stat().st_size == 0
+        plain = State(tmp_path)
+        plain.load()
+        assert plain.get_server_language(42) == "de"
+
+    async def test_load_repairs_compact(self, tmp_path: Path) -> None:
+        (tmp_path / "user_stats.json").write_text(
+            json.dumps({"1": {"dice_rolls_count": -4}}), encoding="utf-8"
+        )
+        state = _journal_state(tmp_path)
+        await state.save()
+        stats = json.loads((tmp_path / "user_stats.json").read_text(encoding="utf-8"))
+        assert stats == {"1": {"dice_rolls_count": 0}}
+
+
+class TestSqliteStorage:
+    async def test_round_trip(self, tmp_path: Path) -> None:
+        s1 = _sqlite_state(tmp_path)
+        await s1.set_user_color(1, "red")
+        await s1.set_user_macro(1, "atk", "1d20+5")
+        await s1.increment_dice_rolls(1, 3)
+        await s1.set_server_prefix(42, "?")
+        await s1.new_channel_deck(5, "tarot", SystemRng())
+        await s1.draw_from_channel_deck(5, 2)
+        await s1.save()
+        s1.close()
+
+        s2 = _sqlite_state(tmp_path)
+        assert s2.get_user_color_name(1) == "red"
+        assert s2.get_user_macros(1) == {"atk": "1d20+5"}
+        assert s2.get_user_dice_count(1) == 3
+        assert s2.get_server_prefix(42, "!") == "?"
+        assert s2.get_channel_deck(5) == s1.get_channel_deck(5)
+        assert not s2.is_dirty
+        assert not (tmp_path / "user_preferences.json").exists()
+        s2.close()
+
+    async def test_wal_mode(self, tmp_path: Path) -> None:
+        _sqlite_state(tmp_path).close()
+        with closing(sqlite3.connect(tmp_path / SQLITE_FILENAME)) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+    async def test_writes_only_changed_rows(self, tmp_path: Path) -> None:
+        state = _sqlite_state(tmp_path)
+        for user_id in range(1, 4):
+            await state.increment_dice_rolls(user_id)
+        await state.save()
+
+        # Edit rows behind the backend's back: a save must not rewrite them.
+        with closing(sqlite3.connect(tmp_path / SQLITE_FILENAME)) as conn, conn:
+            conn.execute("UPDATE user_stats SET dice_rolls_count = 99 WHERE id != '2'")
+        await state.increment_dice_rolls(2)
+        metrics = await state.save()
+        assert (metrics.records, metrics.bytes_written) == (1, 8)
+        assert _rows(tmp_path, "user_stats") == {"1": 99, "2": 2, "3": 99}
+        assert _rows(tmp_path, "users") == {}
+        state.close()
+
+    async def test_imports_json_once(self, tmp_path: Path) -> None:
+        (tmp_path / "user_preferences.json").write_text(
+            json.dumps({"users": {"1": {"color": "red"}}}), encoding="utf-8"
+        )
+        (tmp_path / "user_stats.json").write_text(
+            json.dumps({"1": {"dice_rolls_count": 7}}), encoding="utf-8"
+        )
+        state = _sqlite_state(tmp_path)
+        assert state.get_user_color_name(1) == "red"
+        assert state.get_user_dice_count(1) == 7
+        state.close()
+        assert _rows(tmp_path, "user_stats") == {"1": 7}
+
+        # Later JSON edits are not imported again.
+        (tmp_path / "user_stats.json").write_text(
+            json.dumps({"1": {"dice_rolls_count": 50}}), encoding="utf-8"
+        )
+        state = _sqlite_state(tmp_path)
+        assert state.get_user_dice_count(1) == 7
+        state.close()
+
+    async def test_interrupted_import_retried(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        (tmp_path / "user_preferences.json").write_text(
+            json.dumps({"users": {"1": {"color": "red"}}}), encoding="utf-8"
+        )
+        (tmp_path / "user_stats.json").write_text(
+            json.dumps({"1": {"dice_rolls_count": 7}}), encoding="utf-8"
+        )
+
+        def crash(*args: object) -> None:
+            raise OSError("disk full")
+
+        # The import fails after the database file and schema exist.
+        with monkeypatch.context() as patch:
+            patch.setattr(SqliteStorage, "_write", crash)
+            storage = SqliteStorage(tmp_path / SQLITE_FILENAME, import_from=JsonStorage(tmp_path))
+            with pytest.raises(OSError):
+                storage.load()
+            storage.close()
+        assert (tmp_path / SQLITE_FILENAME).exists()
+
+        state = _sqlite_state(tmp_path)
+        assert state.get_user_color_name(1) == "red"
+        assert state.get_user_dice_count(1) == 7
+        state.close()
+
+    async def test_empty_database_file_imports(self, tmp_path: Path) -> None:
+        # A crash right after the file was created: no tables, no marker.
+        sqlite3.connect(tmp_path / SQLITE_FILENAME).close()
+        (tmp_path / "user_stats.json").write_text(
+            json.dumps({"1": {"dice_rolls_count": 7}}), encoding="utf-8"
+        )
+        state = _sqlite_state(tmp_path)
+        assert state.get_user_dice_count(1) == 7
+        state.close()
+
+    async def test_database_without_marker_not_overwritten(self, tmp_path: Path) -> None:
+        state = _sqlite_state(tmp_path)
+        await state.increment_dice_rolls(1, 3)
+        await state.save()
+        state.close()
+        with closing(sqlite3.connect(tmp_path / SQLITE_FILENAME)) as conn, conn:
+            conn.execute("DELETE FROM meta")
+        (tmp_path / "user_stats.json").write_text(
+            json.dumps({"1": {"dice_rolls_count": 50}}), encoding="utf-8"
+        )
+        state = _sqlite_state(tmp_path)
+        assert state.get_user_dice_count(1) == 3
+        state.close()
+
+    async def test_load_repairs_are_written(self, tmp_path: Path) -> None:
+        (tmp_path / "server_preferences.json").write_text(
+            json.dumps({"42": {"prefix": 5, "language": "fr"}, "bad": []}), encoding="utf-8"
+        )
+        state = _sqlite_state(tmp_path)
+        assert state.is_dirty
+        await state.save()
+        state.close()
+        assert {gid: json.loads(data) for gid, data in _rows(tmp_path, "servers").items()} == {
+            "42": {"language": "fr"}
+        }
@@ -0,0 +1,135 @@
+"""Tests for weighted random tables."""
+
+from __future__ import annotations
+
+from collections import Counter
+from fractions import Fraction
+
+import pytest
+
+from sirrmizan.rng import SystemRng
+from sirrmizan.tables import (
+    MAX_ENTRY_WEIGHT,
+    MAX_TABLE_ENTRIES,
+    AliasTable,
+    TableCache,
+    TableError,
+    compile_table,
+    is_valid_table_name,
+    parse_entries,
+)
+
+
+class _SequenceRng:
+    """``randbelow`` returns scripted values and records each bound."""
+
+    def __init__(self, values: list[int]) -> None:
+        self._values = iter(values)
+        self.bounds: list[int] = []
+
+    def random(self) -> float:
+        return 0.5
+
+    def randbelow(self, n: int) -> int:
+        self.bounds.append(n)
+        return next(self._values)
+
+    def randint(self, a: int, b: int) -> int:
+        return a
+
+    def roll(self, count: int, faces: int) -> list[int]:
+        return [1] * count
+
+
+def _exact_probabilities(table: AliasTable) -> list[Fraction]:
+    """Each entry's probability, summed over every (slot, threshold) outcome."""
+    n = len(table.thresholds)
+    probs = [Fraction(0)] * n
+    for slot, (threshold, alias) in enumerate(zip(table.thresholds, table.aliases, strict=True)):
+        probs[slot] += Fraction(threshold, n * table.total)
+        probs[alias] += Fraction(table.total - threshold, n * table.total)
+    return probs
+
+
+class TestParseEntries:
+    def test_weights_default_to_one(self) -> None:
+        assert parse_entries("3 Gold coins | Sword |2 Potion") == (
+            (3, "Gold coins"),
+            (1, "Sword"),
+            (2, "Potion"),
+        )
+
+    def test_number_alone_is_text(self) -> None:
+        assert parse_entries("42") == ((1, "42"),)
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "",
+            "Gold | | Sword",
+            "0 Gold",
+            f"{MAX_ENTRY_WEIGHT + 1} Gold",
+            "x" * 101,
+            " | ".join(["a"] * (MAX_TABLE_ENTRIES + 1)),
+        ],
+    )
+    def test_invalid(self, text: str) -> None:
+        with pytest.raises(TableError):
+            parse_entries(text)
+
+    @pytest.mark.parametrize(
+        ("name", "ok"),
+        [
+            ("loot", True),
+            ("npc-names_2", True),
+            ("Loot", False),
+            ("", False),
+            ("a b", False),
+            ("x" * 33, False),
+        ],
+    )
+    def test_names(self, name: str, ok: bool) -> None:
+        assert is_valid_table_name(name) is ok
+
+
+class TestAliasTable:
+    @pytest.mark.parametrize(
+        "weights",
+        [[1], [1, 1], [3, 1], [50, 10, 1], [1, 999_999, 1, 2], list(range(1, 40)), [7] * 13],
+    )
+    def test_probabilities_are_exact(self, weights: list[int]) -> None:
+        table = compile_table([(w, str(i)) for i, w in enumerate(weights)])
+        total = sum(weights)
+        assert _exact_probabilities(table) == [Fraction(w, total) for w in weights]
+        assert all(0 <= t <= table.total for t in table.thresholds)
+
+    def test_two_bounded_draws_per_pick(self) -> None:
+        table = compile_table([(3, "a"), (1, "b")])
+        rng = _SequenceRng([0, 0, 1, 3])
+        assert table.draw(rng, 2) == [table.texts[0], table.texts[table.aliases[1]]]
+        assert rng.bounds == [2, 4, 2, 4]
+
+    def test_draws_follow_weights(self) -> None:
+        table = compile_table([(1, "rare"), (9, "common")])
+        counts = Counter(table.draw(SystemRng(), 20_000))
+        assert 1_600 <= counts["rare"] <= 2_400
+
+    def test_probability(self) -> None:
+        table = compile_table([(1, "a"), (3, "b")])
+        assert table.probability(1) == 0.75
+
+
+class TestTableCache:
+    def test_compiled_once_until_invalidated(self) -> None:
+        cache = TableCache()
+        first = cache.table(1, "loot", ((1, "a"),))
+        assert cache.table(1, "loot", ((1, "a"),)) is first
+        cache.invalidate(1, "loot")
+        edited = cache.table(1, "loot", ((1, "b"),))
+        assert edited.texts == ("b",)
+        assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+    def test_keyed_by_guild(self) -> None:
+        cache = TableCache()
+        cache.table(1, "loot", ((1, "a"),))
+        assert cache.table(2, "loot", ((1, "b"),)).texts == ("b",)
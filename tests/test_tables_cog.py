@@ -0,0 +1,33 @@
+"""Tests for the tables cog's embeds."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+from sirrmizan.cogs.tables import TablesCog
+from sirrmizan.tables import MAX_ENTRY_LENGTH, MAX_TABLE_ENTRIES
+
+
+def _cog(entries: tuple[tuple[int, str], ...]) -> TablesCog:
+    state = SimpleNamespace(get_server_table=lambda guild_id, name: entries)
+    bot: Any = SimpleNamespace(state=state)
+    return TablesCog(bot)
+
+
+class TestTableShow:
+    def test_short_table_listed_in_full(self) -> None:
+        embed, error = _cog(((1, "Sword"), (3, "Shield")))._table_show(1, "loot", lang="en")
+        assert error is None and embed is not None
+        assert embed.description == "` 25.0%` Sword\n` 75.0%` Shield"
+
+    def test_long_table_truncated(self) -> None:
+        entries = tuple(
+            (1, f"{i:03d}" + "x" * (MAX_ENTRY_LENGTH - 3)) for i in range(MAX_TABLE_ENTRIES)
+        )
+        embed, error = _cog(entries)._table_show(1, "loot", lang="en")
+        assert error is None and embed is not None
+        assert embed.description is not None
+        assert len(embed.description) <= 4096
+        shown = embed.description.count("\n")
+        assert embed.description.endswith(f"…and {MAX_TABLE_ENTRIES - shown} more")
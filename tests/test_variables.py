@@ -0,0 +1,67 @@
+"""Tests for user variables."""
+
+from __future__ import annotations
+
+import pytest
+
+from sirrmizan.dice_parser import parse
+from sirrmizan.roll_plan import compile_plan
+from sirrmizan.variables import (
+    MAX_VARIABLE_VALUE,
+    UserPlanCache,
+    VariableError,
+    clean_variables,
+    is_valid_variable_name,
+    validate_variable,
+)
+
+
+class TestValidation:
+    @pytest.mark.parametrize(
+        ("name", "ok"),
+        [("str", True), ("dex_mod2", True), ("Str", False), ("2h", False), ("a-b", False)],
+    )
+    def test_names(self, name: str, ok: bool) -> None:
+        assert is_valid_variable_name(name) is ok
+
+    @pytest.mark.parametrize("value", [MAX_VARIABLE_VALUE + 1, -MAX_VARIABLE_VALUE - 1])
+    def test_value_bounds(self, value: int) -> None:
+        validate_variable("str", MAX_VARIABLE_VALUE)
+        with pytest.raises(VariableError):
+            validate_variable("str", value)
+
+    def test_clean_keeps_valid_pairs(self) -> None:
+        raw = {"str": 3, "dex": -1, "Bad": 2, "flag": True, "big": 10**6, "txt": "3"}
+        assert clean_variables(raw) == {"str": 3, "dex": -1}
+        assert clean_variables([1, 2]) == {}
+
+
+class TestUserPlanCache:
+    def test_invalidate_is_per_user(self) -> None:
+        cache = UserPlanCache()
+        resolved = (compile_plan(parse("1d20+3")), "1d20+@str", None)
+        cache.put(1, "1d20+@str", resolved)
+        cache.put(2, "1d20+@str", resolved)
+        assert cache.get(1, "1d20+@str") is resolved
+        cache.invalidate(1)
+        assert cache.get(1, "1d20+@str") is None
+        assert cache.get(2, "1d20+@str") is resolved
+        cache.put(1, "1d20+@str", resolved)
+        assert cache.get(1, "1d20+@str") is resolved
+
+    def test_versions_bounded(self) -> None:
+        cache = UserPlanCache(maxsize=2)
+        resolved = (compile_plan(parse("1d20+3")), "1d20+@str", None)
+        cache.invalidate(1)
+        cache.invalidate(2)
+        cache.put(1, "1d20+@str", resolved)
+        cache.invalidate(3)
+        assert len(cache._versions) == 1
+        # Dropping user 1's version also dropped their plans.
+        assert cache.get(1, "1d20+@str") is None
+
+    def test_clear_resets_versions(self) -> None:
+        cache = UserPlanCache()
+        cache.invalidate(1)
+        cache.clear()
+        assert cache._versions == {}